@@ -17,7 +17,7 @@ def discover_commands() -> None:
 
     # Skip special files
     skip_files = {"__init__.py", "base.py",
-                  "registry.py", "dynamic_commands.py"}
+                  "registry.py", "dynamic_commands.py", "cooldowns.py"}
 
     for entry in commands_dir.iterdir():
         if entry.is_file() and entry.suffix == ".py" and entry.name not in skip_files:
@@ -82,7 +82,17 @@ def load_dynamic_commands():
         logger.error(f"Error loading dynamic commands: {e}")
 
 
-# Discover static commands
-discover_commands()
-# Load dynamic commands
-load_dynamic_commands()
+_commands_loaded = False
+
+
+def load_commands() -> None:
+    """Discovers static commands and loads dynamic ones, once."""
+    global _commands_loaded
+    if _commands_loaded:
+        return
+    _commands_loaded = True
+
+    # Discover static commands
+    discover_commands()
+    # Load dynamic commands
+    load_dynamic_commands()
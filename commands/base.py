@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional, Tuple, List
 from utils.user_permissions import has_permission
+from commands.cooldowns import cooldowns
 from event_bus.bus import event_bus
 from core.logging import get_logger
 from core.errors import handle_error
@@ -12,6 +13,10 @@ class BaseCommand:
     description = ""
     permission = "viewer"
     aliases: List[str] = []
+    # Seconds; 0 disables. Moderators and the broadcaster bypass them
+    cooldown = 0
+    channel_cooldown = 0
+    user_cooldown = 0
 
     def __init__(self):
         self.event_bus = event_bus
@@ -27,6 +32,16 @@ class BaseCommand:
                     channel, f"@{user.get('name', 'User')}, pfft! You can't do THAT!")
                 return
 
+            # Redemptions already paid and sit behind the reward's own Twitch
+            # cooldown, so only chat invocations are rate limited here
+            remaining = 0 if data.get("source") == "channel_point" else cooldowns.acquire(
+                self, user, channel)
+            if remaining:
+                # Stay quiet; replying would be the spam we're preventing
+                self.logger.debug(
+                    f"!{self.name} on cooldown for {user.get('name', 'User')} ({remaining:.0f}s left)")
+                return
+
             self.handle(data)
         except Exception as e:
             handle_error(e, {"command": self.name, "data": data})
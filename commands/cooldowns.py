@@ -0,0 +1,97 @@
+import threading
+import time
+
+from typing import Dict, Any, Optional, Tuple
+
+from core.config import config
+from core.logging import get_logger
+from utils.user_permissions import get_user_permissions
+
+logger = get_logger("cooldowns")
+
+GLOBAL = "global"
+CHANNEL = "channel"
+USER = "user"
+
+
+class CooldownEngine:
+    """
+    Command cooldowns as (command, scope, subject) -> monotonic expiry in one
+    dict, so a check is a lookup per configured scope. Expired entries are
+    swept at most once per sweep interval, from whichever check runs next.
+    """
+
+    def __init__(self):
+        self.bypass = {level.strip() for level in config.get(
+            'COMMAND_COOLDOWN_BYPASS', 'moderator,broadcaster').split(",") if level.strip()}
+        self.sweep_interval = config.get_int('COMMAND_COOLDOWN_SWEEP_SECONDS', 60)
+        self._expires: Dict[Tuple[str, str, str], float] = {}
+        self._next_sweep = time.monotonic() + self.sweep_interval
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scopes(command, user: Dict[str, Any], channel: Optional[str]):
+        name = command.name
+        if command.cooldown:
+            yield (name, GLOBAL, ""), command.cooldown
+        if command.channel_cooldown:
+            yield (name, CHANNEL, channel or ""), command.channel_cooldown
+        if command.user_cooldown:
+            yield (name, USER, str(user.get("id") or user.get("name", ""))), command.user_cooldown
+
+    def can_bypass(self, user: Dict[str, Any]) -> bool:
+        return bool(self.bypass & get_user_permissions(user))
+
+    def acquire(self, command, user: Dict[str, Any], channel: Optional[str]) -> float:
+        """
+        Starts the command's cooldowns and returns 0 if it may run now,
+        otherwise the seconds left on the longest active cooldown.
+        """
+        if not (command.cooldown or command.channel_cooldown or command.user_cooldown):
+            return 0.0
+        if self.can_bypass(user):
+            return 0.0
+
+        now = time.monotonic()
+        scopes = list(self._scopes(command, user, channel))
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            remaining = max((self._expires.get(key, 0.0) - now for key, _ in scopes), default=0.0)
+            if remaining > 0:
+                return remaining
+
+            for key, seconds in scopes:
+                self._expires[key] = now + seconds
+        return 0.0
+
+    def remaining(self, command, user: Dict[str, Any], channel: Optional[str]) -> float:
+        now = time.monotonic()
+        with self._lock:
+            return max(0.0, max((self._expires.get(key, 0.0) - now
+                                 for key, _ in self._scopes(command, user, channel)), default=0.0))
+
+    def reset(self, command_name: Optional[str] = None) -> None:
+        with self._lock:
+            if command_name is None:
+                self._expires.clear()
+            else:
+                for key in [key for key in self._expires if key[0] == command_name]:
+                    del self._expires[key]
+
+    def _sweep(self, now: float) -> None:
+        """Caller holds the lock."""
+        expired = [key for key, expires in self._expires.items() if expires <= now]
+        for key in expired:
+            del self._expires[key]
+        self._next_sweep = now + self.sweep_interval
+        if expired:
+            logger.debug(f"Evicted {len(expired)} expired cooldowns")
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+# Singleton instance
+cooldowns = CooldownEngine()
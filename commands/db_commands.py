@@ -0,0 +1,61 @@
+from typing import Dict, Any
+
+from commands.base import BaseCommand
+from db.backup import backup_manager
+from utils.counter_service import counter_service
+from utils.reward_catalog import reward_catalog
+
+
+class BackupCommand(BaseCommand):
+    name = "db-backup"
+    description = "Take an online backup of the database"
+    permission = "broadcaster"
+
+    def handle(self, data: Dict[str, Any]) -> None:
+        user, channel, args = self.extract_common_data(data)
+
+        def on_done(backup_path):
+            if backup_path:
+                self.send_message(
+                    channel, f"@{user.get('name')}, database backed up to {backup_path}")
+            else:
+                self.send_message(
+                    channel, f"@{user.get('name')}, database backup failed.")
+
+        # Runs on a background thread so chat isn't held up by the copy
+        if not backup_manager.create_backup_async(on_done):
+            self.send_message(
+                channel, f"@{user.get('name')}, a backup is already running.")
+
+
+class RestoreCommand(BaseCommand):
+    name = "db-restore"
+    description = "Restore the database from a backup"
+    permission = "broadcaster"
+
+    def handle(self, data: Dict[str, Any]) -> None:
+        user, channel, args = self.extract_common_data(data)
+
+        backup_path = backup_manager.resolve_backup(args or "latest")
+        if not backup_path:
+            self.send_message(
+                channel, f"@{user.get('name')}, no backup found matching: {args or 'latest'}")
+            return
+
+        def on_done(safety_path, error):
+            if error:
+                self.send_error_response(
+                    channel, user, f"restore failed: {error}")
+                return
+
+            # Counts taken against the replaced rows would be applied on top
+            # of the restored ones, and cached rewards may no longer match
+            counter_service.discard()
+            reward_catalog.load()
+            self.send_message(
+                channel, f"@{user.get('name')}, restored {backup_path.name} (previous state saved to {safety_path})")
+
+        # Safety backup plus restore copy: keep both off the chat thread
+        if not backup_manager.restore_backup_async(backup_path, on_done):
+            self.send_message(
+                channel, f"@{user.get('name')}, a backup is already running.")
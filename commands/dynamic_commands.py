@@ -1,8 +1,23 @@
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 
 from commands.base import BaseCommand
 from db.database import db
+from utils.counter_service import counter_service
+from utils.stream_state import stream_state
+from utils.templates import compile_template
+
+# Variables read from the database; whichever a template uses are fetched
+# together in one query. {count} is read through the counter service instead,
+# which adds uses not yet flushed
+DB_VARIABLES = {
+    "points": "(SELECT points FROM users WHERE twitch_user_id = :user_id)",
+}
+
+
+def format_uptime(seconds: float) -> str:
+    minutes = int(seconds // 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m" if hours else f"{minutes}m"
 
 
 class DynamicCommand(BaseCommand):
@@ -14,6 +29,10 @@ class DynamicCommand(BaseCommand):
         self.permission = permission
         self.aliases = aliases or []
         self.response_template = response
+        self.template = compile_template(response)
+        referenced = [name for name in DB_VARIABLES if name in self.template.variables]
+        self._db_query = ("SELECT " + ", ".join(
+            f"{DB_VARIABLES[name]} AS {name}" for name in referenced)) if referenced else None
         self.cooldown = 3
         self.action_sequence_id = None
         self.restricted_to_user_id = None
@@ -30,19 +49,46 @@ class DynamicCommand(BaseCommand):
         channel = data.get("channel")
         args = data.get("args", "")
 
-        response = self.response_template
-        response = response.replace("{user}", user.get("name", "User"))
-        # TODO for !hug, this needs to check if the user is in chatters
-        response = response.replace("{args}", args)
-
-        self.send_message(channel, response)
+        self.send_message(channel, self.template.render(self.template_values(user, args)))
 
         if self.action_sequence_id:
             self._trigger_action_sequence(self.action_sequence_id, data)
 
-        try:
-            db.execute(
-                "UPDATE commands SET total_uses = total_uses + 1 WHERE name = ?", (self.name,))
-        except Exception as e:
-            self.logger.error(
-                f"Error updating usage count for {self.name}: {e}")
+        counter_service.increment("commands", "total_uses", "name", self.name)
+
+    def template_values(self, user: Dict[str, Any], args: str) -> Dict[str, Any]:
+        """Resolves only the variables the template uses."""
+        username = user.get("name", "User")
+        variables = self.template.variables
+        values = {"user": username, "args": args}
+
+        if self._db_query:
+            try:
+                row = db.fetchone(self._db_query, {"user_id": user.get("id")})
+            except Exception as e:
+                self.logger.error(f"Error reading template values for {self.name}: {e}")
+                row = None
+            if row and "points" in row:
+                values["points"] = row["points"] or 0
+
+        if "count" in variables:
+            try:
+                # Stored and pending read together, plus this use
+                values["count"] = counter_service.get("commands", "total_uses", "name", self.name) + 1
+            except Exception as e:
+                self.logger.error(f"Error reading use count for {self.name}: {e}")
+
+        if "target" in variables:
+            target = args.split()[0].lstrip("@") if args.strip() else ""
+            values["target"] = target or username
+
+        if "random_chatter" in variables:
+            from utils.chatters import chatters
+            values["random_chatter"] = chatters.random(exclude=[username]) or username
+
+        if "uptime" in variables:
+            # Cached by the stream_state job; no Helix call on the chat thread
+            uptime = stream_state.uptime()
+            values["uptime"] = "offline" if uptime is None else format_uptime(uptime)
+
+        return values
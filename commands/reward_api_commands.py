@@ -1,6 +1,8 @@
 import json
+import threading
 
-from typing import Dict, Any
+from datetime import date, timedelta
+from typing import Dict, Any, Optional
 
 from commands.base import BaseCommand
 from utils.reward_service import reward_service
@@ -8,6 +10,13 @@ from utils.twitch_api_client import twitch_api
 from core.config import config
 
 
+def _find_reward(name_or_id: str) -> Optional[Dict[str, Any]]:
+    for reward in reward_service.get_all_rewards():
+        if reward['name'].lower() == name_or_id.lower() or reward['reward_id'] == name_or_id:
+            return reward
+    return None
+
+
 class RewardCreateCommand(BaseCommand):
     name = "reward-create"
     description = "Create a new channel point reward"
@@ -192,3 +201,89 @@ class RewardExportCommand(BaseCommand):
         else:
             self.send_message(
                 channel, f"@{user.get('name')}, failed to export rewards configuration.")
+
+
+class RewardQueueCommand(BaseCommand):
+    name = "reward-queue"
+    description = "Fulfil or refund every queued redemption of a reward"
+    permission = "broadcaster"
+
+    ACTIONS = {"fulfil": "FULFILLED", "fulfill": "FULFILLED",
+               "refund": "CANCELED", "cancel": "CANCELED"}
+
+    def handle(self, data: Dict[str, Any]) -> None:
+        user, channel, args = self.extract_common_data(data)
+
+        parts = args.split(" ", 1)
+        status = self.ACTIONS.get(parts[0].lower())
+        if len(parts) < 2 or not status:
+            self.send_message(
+                channel, f"@{user.get('name')}, usage: !reward-queue <fulfil|refund> <reward name or ID>")
+            return
+
+        reward = _find_reward(parts[1].strip())
+        if not reward:
+            self.send_message(
+                channel, f"@{user.get('name')}, no reward found with name or ID: {parts[1]}")
+            return
+
+        from utils.redemption_status_queue import redemption_status_queue
+
+        def run():
+            try:
+                count = redemption_status_queue.queue_unfulfilled(reward['reward_id'], status)
+            except Exception as e:
+                self.send_error_response(channel, user, f"could not read the redemption queue: {e}")
+                return
+            action = "fulfilled" if status == "FULFILLED" else "refunded"
+            self.send_message(
+                channel, f"@{user.get('name')}, {count} queued redemptions of {reward['name']} will be {action}.")
+
+        # Paging the queue is Helix work; keep it off the chat thread
+        threading.Thread(target=run, daemon=True, name="RewardQueueClear").start()
+
+
+class RewardStatsCommand(BaseCommand):
+    name = "reward-stats"
+    description = "Show how often a reward was redeemed recently"
+    permission = "moderator"
+
+    def handle(self, data: Dict[str, Any]) -> None:
+        user, channel, args = self.extract_common_data(data)
+
+        name_or_id, days = args.strip(), 7
+        head, _, tail = name_or_id.rpartition(" ")
+        # A trailing number is the period unless it is part of the reward name
+        if head and tail.isdigit() and int(tail) > 0 and not _find_reward(name_or_id):
+            name_or_id, days = head, int(tail)
+        if not name_or_id:
+            self.send_message(
+                channel, f"@{user.get('name')}, usage: !reward-stats <reward name or ID> [days]")
+            return
+
+        reward = _find_reward(name_or_id)
+        if not reward:
+            self.send_message(
+                channel, f"@{user.get('name')}, no reward found with name or ID: {name_or_id}")
+            return
+
+        from db.archive import redemption_archive
+        since_day = (date.today() - timedelta(days=days - 1)).isoformat()
+
+        def run():
+            try:
+                # Reporting read: served from the analytics snapshot
+                counts = redemption_archive.get_daily_counts(
+                    reward_id=reward['reward_id'], since_day=since_day)
+            except Exception as e:
+                self.send_error_response(channel, user, f"could not read reward stats: {e}")
+                return
+            uses = sum(row['uses'] for row in counts)
+            busiest = max(counts, key=lambda row: row['uses'], default=None)
+            summary = f"{reward['name']} was redeemed {uses} times in the last {days} days"
+            if busiest:
+                summary += f" (busiest day {busiest['day']}: {busiest['uses']})"
+            self.send_message(channel, f"@{user.get('name')}, {summary}.")
+
+        # A first read may have to take the snapshot; keep it off the chat thread
+        threading.Thread(target=run, daemon=True, name="RewardStats").start()
@@ -1,90 +1,198 @@
+import hashlib
 import json
 import os
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, NamedTuple
 from datetime import datetime
 
 from core.logging import get_logger
-from core.errors import handle_error, ConfigError
+from core.errors import handle_error, ConfigError, ValidationError
 from core.config import config
-from db.database import db
-from utils.reward_service import reward_service
+from db.database import db, select_query
+from reward_handlers.registry import handler_type_registry
+from utils.reward_catalog import reward_catalog
 
 logger = get_logger("reward_config")
 
-
-def load_reward_config():
+HANDLER_EXPORT_COLUMNS = ("handler_name", "handler_description", "enabled", "config_schema")
+REWARD_EXPORT_COLUMNS = ("name", "description", "cost", "is_enabled", "handler_type",
+                         "auto_fulfill", "handler_config", "action_sequence_id")
+
+# Config file key -> (twitch_rewards column, RewardRecord attribute)
+REWARD_FIELDS = {
+    "description": ("description", "description"),
+    "cost": ("cost", "cost"),
+    "enabled": ("is_enabled", "is_enabled"),
+    "handler_type": ("handler_type", "handler_type"),
+    "auto_fulfill": ("auto_fulfill", "auto_fulfill"),
+    "handler_config": ("handler_config", "handler_config"),
+    "action_sequence_id": ("action_sequence_id", "action_sequence_id"),
+}
+
+
+class ConfigReport(NamedTuple):
+    handlers: List[str]
+    rewards: List[str]
+    unknown: List[str]
+    invalid: List[str]
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.handlers or self.rewards)
+
+    def summary(self) -> str:
+        return (f"{len(self.handlers)} handlers and {len(self.rewards)} rewards changed, "
+                f"{len(self.unknown)} unknown, {len(self.invalid)} invalid")
+
+
+def get_config_path():
+    return config.get_path('REWARD_CONFIG_PATH', 'config/rewards.json')
+
+
+def _normalise(field: str, value: Any) -> Any:
+    if field in ("enabled", "auto_fulfill"):
+        return bool(value)
+    if field == "handler_type":
+        return value or "default"
+    if field == "handler_config":
+        return dict(value or {})
+    return value
+
+
+def diff_reward(reward_config: Dict[str, Any], record) -> Dict[str, Any]:
+    """Column -> new value for the fields this config entry changes."""
+    changes = {}
+    for field, (column, attribute) in REWARD_FIELDS.items():
+        if field not in reward_config:
+            continue
+        wanted = _normalise(field, reward_config[field])
+        if wanted != _normalise(field, getattr(record, attribute)):
+            changes[column] = json.dumps(wanted) if field == "handler_config" else wanted
+    return changes
+
+
+def apply_reward_config(config_data: Dict[str, Any]) -> ConfigReport:
+    """
+    Diffs parsed config against the database (handlers) and the in-memory
+    catalog (rewards) and writes only what changed, in one transaction.
+    """
+    if not isinstance(config_data, dict):
+        raise ConfigError("Reward configuration must be a JSON object")
+    current_time = datetime.now().isoformat()
+
+    # Handlers: one read of the table
+    known_handlers = {row["handler_name"]: row for row in db.iterate(
+        select_query("reward_handlers", HANDLER_EXPORT_COLUMNS))}
+    handler_rows = []
+    changed_handlers = []
+    invalid = []
+    for handler in config_data.get("handlers", []):
+        if not isinstance(handler, dict):
+            invalid.append("?")
+            logger.warning(f"Handler config is not an object: {handler!r}")
+            continue
+        if "name" not in handler or "description" not in handler:
+            invalid.append(handler.get("name", "?"))
+            logger.warning(f"Handler config missing name or description: {handler}")
+            continue
+        values = (handler["description"], int(bool(handler.get("enabled", True))),
+                  json.dumps(handler.get("config_schema", {})))
+        existing = known_handlers.get(handler["name"])
+        if existing and (existing["handler_description"], existing["enabled"],
+                         existing["config_schema"]) == values:
+            continue
+        handler_rows.append((handler["name"], *values, current_time))
+        changed_handlers.append(handler["name"])
+
+    # Rewards: compared against the catalog, matched by name
+    by_name = {record.name: record for record in reward_catalog.all().values()}
+    reward_updates: Dict[Tuple[str, ...], List[List[Any]]] = {}
+    changed_rewards = []
+    unknown = []
+    for reward in config_data.get("rewards", []):
+        if not isinstance(reward, dict):
+            invalid.append("?")
+            logger.warning(f"Reward config is not an object: {reward!r}")
+            continue
+        name = reward.get("name")
+        record = by_name.get(name)
+        if record is None:
+            # Rewards are created on Twitch first; sync brings them in
+            unknown.append(name or "?")
+            continue
+
+        changes = diff_reward(reward, record)
+        if not changes:
+            continue
+
+        if "handler_type" in changes or "handler_config" in changes:
+            try:
+                handler_type_registry.compile(
+                    record.reward_id,
+                    changes.get("handler_type", record.handler_type),
+                    reward.get("handler_config", record.handler_config))
+            except ValidationError as e:
+                invalid.append(name)
+                logger.warning(f"Skipping reward {name}: {e.message}")
+                continue
+
+        columns = tuple(sorted(changes))
+        reward_updates.setdefault(columns, []).append(
+            [changes[column] for column in columns] + [current_time, record.reward_id])
+        changed_rewards.append(record.reward_id)
+
+    report = ConfigReport(changed_handlers, changed_rewards, unknown, invalid)
+    if not report.changed:
+        return report
+
+    with db.transaction():
+        if handler_rows:
+            db.execute_many("""
+                INSERT INTO reward_handlers (handler_name, handler_description, enabled, config_schema, date_added)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(handler_name) DO UPDATE SET
+                    handler_description = excluded.handler_description,
+                    enabled = excluded.enabled,
+                    config_schema = excluded.config_schema
+                """, handler_rows)
+        for columns, rows in reward_updates.items():
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            db.execute_many(
+                f"UPDATE twitch_rewards SET {assignments}, last_updated = ? WHERE reward_id = ?", rows)
+
+    from utils.channel_points_service import channel_points_service
+    for reward_id in changed_rewards:
+        # A configured handler replaces one registered in code
+        channel_points_service._registered_handlers.pop(reward_id, None)
+        reward_catalog.refresh(reward_id)
+
+    logger.info(f"Applied reward configuration: {report.summary()}")
+    return report
+
+
+def load_reward_config() -> Optional[ConfigReport]:
     try:
-        config_path = config.get_path(
-            'REWARD_CONFIG_PATH', 'config/rewards.json')
+        config_path = get_config_path()
 
         if not os.path.exists(config_path):
             logger.info(f"Reward configuration file not found: {config_path}")
-            return
+            return None
 
         with open(config_path, 'r') as f:
             config_data = json.load(f)
 
-        # Process handlers first
-        if "handlers" in config_data:
-            for handler in config_data["handlers"]:
-                register_handler_from_config(handler)
-
-        # Then process rewards
-        if "rewards" in config_data:
-            for reward in config_data["rewards"]:
-                register_reward_from_config(reward)
-
+        report = apply_reward_config(config_data)
         logger.info(f"Loaded reward configuration from {config_path}")
+        return report
     except Exception as e:
         handle_error(ConfigError(
             f"Failed to load reward configuration: {str(e)}"))
+        return None
 
 
 def register_handler_from_config(handler_config: Dict[str, Any]):
     try:
-        required_fields = ["name", "description"]
-        for field in required_fields:
-            if field not in handler_config:
-                logger.warning(
-                    f"Handler config missing required field: {field}")
-                return
-
-        handler_name = handler_config["name"]
-
-        # Check if handler already exists
-        existing = db.fetchone(
-            "SELECT * FROM reward_handlers WHERE handler_name = ?",
-            (handler_name,)
-        )
-
-        current_time = datetime.now().isoformat()
-
-        if existing:
-            # Update existing handler
-            db.execute(
-                "UPDATE reward_handlers SET handler_description = ?, enabled = ?, config_schema = ? WHERE handler_name = ?",
-                (
-                    handler_config["description"],
-                    handler_config.get("enabled", True),
-                    json.dumps(handler_config.get("config_schema", {})),
-                    handler_name
-                )
-            )
-            logger.info(f"Updated handler: {handler_name}")
-        else:
-            # Create new handler
-            db.execute(
-                "INSERT INTO reward_handlers (handler_name, handler_description, enabled, config_schema, date_added) VALUES (?, ?, ?, ?, ?)",
-                (
-                    handler_name,
-                    handler_config["description"],
-                    handler_config.get("enabled", True),
-                    json.dumps(handler_config.get("config_schema", {})),
-                    current_time
-                )
-            )
-            logger.info(f"Registered new handler: {handler_name}")
+        apply_reward_config({"handlers": [handler_config]})
     except Exception as e:
         handle_error(e, {"context": "register_handler_from_config",
                      "handler_config": handler_config})
@@ -92,110 +200,195 @@ def register_handler_from_config(handler_config: Dict[str, Any]):
 
 def register_reward_from_config(reward_config: Dict[str, Any]):
     try:
-        # We don't have reward_id in config since this is assigned by Twitch
-        # Instead, we'll use the name to check for existing rewards
-        name = reward_config.get("name")
-        if not name:
-            logger.warning("Reward config missing name")
-            return
-
-        # Check if a reward with this name exists
-        existing = db.fetchone(
-            "SELECT * FROM twitch_rewards WHERE name = ?",
-            (name,)
-        )
-
-        if existing:
-            # Update the existing reward with data from config
-            update_data = {
-                "description": reward_config.get("description", existing.get("description", "")),
-                "cost": reward_config.get("cost", existing.get("cost", 0)),
-                "is_enabled": reward_config.get("enabled", existing.get("is_enabled", True)),
-                "handler_type": reward_config.get("handler_type", existing.get("handler_type", "default")),
-                "auto_fulfill": reward_config.get("auto_fulfill", existing.get("auto_fulfill", True)),
-            }
-
-            if "handler_config" in reward_config:
-                update_data["handler_config"] = json.dumps(
-                    reward_config["handler_config"])
-
-            if "action_sequence_id" in reward_config:
-                update_data["action_sequence_id"] = reward_config["action_sequence_id"]
-
-            reward_service.update_reward(existing["reward_id"], update_data)
-            logger.info(f"Updated reward from config: {name}")
-        else:
-            # This is a new reward, but we can't create it without Twitch API integration
-            # We could store it as a "template" to create via the API later
+        report = apply_reward_config({"rewards": [reward_config]})
+        if report.unknown:
             logger.info(
-                f"New reward in config: {name} (would need to be created via Twitch API)")
+                f"New reward in config: {reward_config.get('name')} (would need to be created via Twitch API)")
     except Exception as e:
         handle_error(
             e, {"context": "register_reward_from_config", "reward_config": reward_config})
 
 
+def _merge_entries(existing: List[Dict[str, Any]], exported: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Updates file entries in place by name and appends new ones, keeping the
+    file's order and any entries or keys only the file knows about.
+    """
+    merged = [dict(entry) for entry in existing if isinstance(entry, dict)]
+    index = {entry.get("name"): entry for entry in merged}
+    for entry in exported:
+        if entry["name"] in index:
+            index[entry["name"]].update(entry)
+        else:
+            merged.append(entry)
+    return merged
+
+
 def save_reward_config():
     try:
-        config_path = config.get_path(
-            'REWARD_CONFIG_PATH', 'config/rewards.json')
+        config_path = get_config_path()
 
-        # Get all rewards and handlers
-        rewards = reward_service.get_all_rewards()
-        handlers = db.fetchall("SELECT * FROM reward_handlers")
+        # Stream only the exported columns rather than materialising SELECT *
+        handlers = db.iterate(select_query(
+            "reward_handlers", HANDLER_EXPORT_COLUMNS), row_format="namedtuple")
+        rewards = db.iterate(select_query(
+            "twitch_rewards", REWARD_EXPORT_COLUMNS, where="removed_at IS NULL",
+            order_by="cost ASC"), row_format="namedtuple")
 
-        # Create config structure
-        config_data = {
-            "handlers": [],
-            "rewards": []
-        }
+        exported_handlers = []
+        exported_rewards = []
 
         # Add handlers
         for handler in handlers:
             handler_data = {
-                "name": handler["handler_name"],
-                "description": handler["handler_description"],
-                "enabled": bool(handler["enabled"])
+                "name": handler.handler_name,
+                "description": handler.handler_description,
+                "enabled": bool(handler.enabled)
             }
 
-            if handler["config_schema"]:
+            if handler.config_schema:
                 try:
                     handler_data["config_schema"] = json.loads(
-                        handler["config_schema"])
+                        handler.config_schema)
                 except json.JSONDecodeError:
                     pass
 
-            config_data["handlers"].append(handler_data)
+            exported_handlers.append(handler_data)
 
         # Add rewards
         for reward in rewards:
             reward_data = {
-                "name": reward["name"],
-                "description": reward.get("description", ""),
-                "cost": reward["cost"],
-                "enabled": bool(reward.get("is_enabled", True)),
-                "handler_type": reward.get("handler_type", "default"),
-                "auto_fulfill": bool(reward.get("auto_fulfill", True))
+                "name": reward.name,
+                "description": reward.description or "",
+                "cost": reward.cost,
+                "enabled": bool(reward.is_enabled if reward.is_enabled is not None else True),
+                "handler_type": reward.handler_type or "default",
+                "auto_fulfill": bool(reward.auto_fulfill if reward.auto_fulfill is not None else True)
             }
 
-            if reward.get("handler_config"):
+            if reward.handler_config:
                 try:
                     reward_data["handler_config"] = json.loads(
-                        reward["handler_config"])
+                        reward.handler_config)
                 except json.JSONDecodeError:
                     pass
 
-            if reward.get("action_sequence_id"):
-                reward_data["action_sequence_id"] = reward["action_sequence_id"]
-
-            config_data["rewards"].append(reward_data)
-
-        # Save to file
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f, indent=2)
+            if reward.action_sequence_id:
+                reward_data["action_sequence_id"] = reward.action_sequence_id
+
+            exported_rewards.append(reward_data)
+
+        # Merge into what's on disk rather than replacing it
+        existing = {}
+        current_text = None
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                current_text = f.read()
+            try:
+                existing = json.loads(current_text)
+            except json.JSONDecodeError:
+                logger.warning(f"Overwriting unreadable reward configuration: {config_path}")
+
+        config_data = dict(existing) if isinstance(existing, dict) else {}
+        config_data["handlers"] = _merge_entries(config_data.get("handlers", []), exported_handlers)
+        config_data["rewards"] = _merge_entries(config_data.get("rewards", []), exported_rewards)
+
+        text = json.dumps(config_data, indent=2)
+        if text == current_text:
+            logger.info(f"Reward configuration already up to date: {config_path}")
+            return True
+
+        # Write beside the file and swap it in, so the watcher never reads
+        # half a file
+        os.makedirs(os.path.dirname(config_path) or ".", exist_ok=True)
+        temp_path = f"{config_path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(text)
+        os.replace(temp_path, config_path)
+        reward_config_watcher.mark_applied(config_path, text.encode("utf-8"))
 
         logger.info(f"Saved reward configuration to {config_path}")
         return True
     except Exception as e:
         handle_error(e, {"context": "save_reward_config"})
         return False
+
+
+class RewardConfigWatcher:
+    """
+    Polls REWARD_CONFIG_PATH (stat only, stdlib) and applies the file when
+    its content changes. A file that fails to parse is reported and the last
+    applied state stays in place until it is fixed.
+    """
+
+    def __init__(self):
+        self.interval = config.get_float('REWARD_CONFIG_POLL_SECONDS', 2.0)
+        self._stat: Optional[Tuple[int, int]] = None
+        self._content_hash: Optional[str] = None
+
+    @staticmethod
+    def _signature(path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def mark_applied(self, path, content: bytes) -> None:
+        """Records content we wrote ourselves so it isn't applied back."""
+        self._stat = self._signature(path)
+        self._content_hash = hashlib.sha1(content).hexdigest()
+
+    def check(self) -> Optional[ConfigReport]:
+        path = get_config_path()
+        signature = self._signature(path)
+        if signature is None or signature == self._stat:
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            logger.warning(f"Could not read reward configuration: {e}")
+            return None
+
+        content_hash = hashlib.sha1(content).hexdigest()
+        if content_hash == self._content_hash:
+            self._stat = signature
+            return None
+
+        try:
+            config_data = json.loads(content)
+            if not isinstance(config_data, dict):
+                raise ValueError("top level must be an object")
+        except ValueError as e:
+            # Stays broken until the file is edited again; report it once
+            self._stat = signature
+            handle_error(ConfigError(
+                f"Reward configuration {path} is not valid, keeping current rewards: {e}"))
+            return None
+
+        try:
+            report = apply_reward_config(config_data)
+        except Exception as e:
+            # Left unrecorded so the next poll retries, e.g. after a locked database
+            handle_error(e, {"context": "reward_config_watch", "path": str(path)})
+            return None
+
+        # Only a successful apply counts as seen
+        self._stat = signature
+        self._content_hash = content_hash
+        return report
+
+    def start(self) -> None:
+        from utils.scheduler import scheduler
+        scheduler.add_interval_job(
+            "reward_config_watch", self.check, self.interval, run_immediately=True)
+
+    def stop(self) -> None:
+        from utils.scheduler import scheduler
+        scheduler.remove_job("reward_config_watch")
+
+
+# Singleton instance
+reward_config_watcher = RewardConfigWatcher()
@@ -0,0 +1,187 @@
+import re
+
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from core.config import config
+from core.logging import get_logger
+from core.errors import DatabaseError, handle_error
+from db.database import db
+
+logger = get_logger("db_archive")
+
+ARCHIVE_PREFIX = "reward_redemptions_archive_"
+ARCHIVE_TABLE = re.compile(r"^reward_redemptions_archive_\d{4}_\d{2}$")
+REDEMPTION_COLUMNS = "id, reward_id, user_id, redeemed_at, status, user_input, twitch_redemption_id"
+
+
+def user_redemptions_query(table: str) -> str:
+    # One column list and join for the hot table and every archive table, so
+    # a page mixing both has the same shape throughout
+    columns = ", ".join(f"r.{column}" for column in REDEMPTION_COLUMNS.split(", "))
+    return f"""
+    SELECT {columns}, t.name AS reward_name, t.cost
+    FROM {table} r
+    LEFT JOIN twitch_rewards t ON r.reward_id = t.reward_id
+    WHERE r.user_id = ?
+    ORDER BY r.redeemed_at DESC
+    LIMIT ?
+    """
+
+
+def archive_table_name(month: str) -> str:
+    # month is YYYY-MM, as sliced from redeemed_at
+    name = f"{ARCHIVE_PREFIX}{month.replace('-', '_')}"
+    if not ARCHIVE_TABLE.match(name):
+        raise DatabaseError(f"Invalid archive month: {month}")
+    return name
+
+
+def _next_month(month: str) -> str:
+    year, mon = (int(part) for part in month.split("-"))
+    year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return f"{year:04d}-{mon:02d}"
+
+
+class RedemptionArchive:
+    def __init__(self, database=db):
+        self.db = database
+        self.retention_days = config.get_int('REDEMPTION_RETENTION_DAYS', 90)
+
+    def archive_tables(self) -> List[str]:
+        rows = self.db.fetchall(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
+            (f"{ARCHIVE_PREFIX}%",)
+        )
+        # Newest month first
+        return sorted((row["name"] for row in rows if ARCHIVE_TABLE.match(row["name"])), reverse=True)
+
+    def _ensure_archive_table(self, table: str) -> None:
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                reward_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                redeemed_at TEXT NOT NULL,
+                status TEXT,
+                user_input TEXT,
+                twitch_redemption_id TEXT
+            )""")
+        self.db.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_user ON {table}(user_id, redeemed_at)")
+
+    def run(self, now: Optional[datetime] = None) -> int:
+        if self.retention_days <= 0:
+            return 0
+
+        cutoff = ((now or datetime.now()) - timedelta(days=self.retention_days)).isoformat()
+
+        try:
+            months = [row["month"] for row in self.db.fetchall(
+                "SELECT DISTINCT substr(redeemed_at, 1, 7) AS month FROM reward_redemptions WHERE redeemed_at < ?",
+                (cutoff,)
+            )]
+
+            moved = 0
+            for month in months:
+                moved += self._archive_month(month, cutoff)
+
+            if moved:
+                logger.info(
+                    f"Archived {moved} redemptions older than {self.retention_days} days")
+            return moved
+        except Exception as e:
+            handle_error(DatabaseError(f"Redemption archiving failed: {e}"))
+            return 0
+
+    def _archive_month(self, month: str, cutoff: str) -> int:
+        table = archive_table_name(month)
+        # Range on redeemed_at keeps this on idx_reward_redemptions_redeemed
+        params = (month, _next_month(month), cutoff)
+        where = "redeemed_at >= ? AND redeemed_at < ? AND redeemed_at < ?"
+
+        # Copy, roll up and delete as one unit so nothing is counted twice
+        with self.db.transaction():
+            self._ensure_archive_table(table)
+            self.db.execute(
+                f"INSERT OR IGNORE INTO {table} ({REDEMPTION_COLUMNS}) "
+                f"SELECT {REDEMPTION_COLUMNS} FROM reward_redemptions WHERE {where}",
+                params
+            )
+            self.db.execute(f"""
+                INSERT INTO reward_redemption_daily (day, reward_id, uses)
+                SELECT substr(redeemed_at, 1, 10), reward_id, COUNT(*)
+                FROM reward_redemptions WHERE {where}
+                GROUP BY substr(redeemed_at, 1, 10), reward_id
+                ON CONFLICT (day, reward_id) DO UPDATE SET uses = uses + excluded.uses
+                """, params)
+            self.db.execute(f"""
+                INSERT INTO user_redemption_daily (day, user_id, reward_id, uses)
+                SELECT substr(redeemed_at, 1, 10), user_id, reward_id, COUNT(*)
+                FROM reward_redemptions WHERE {where}
+                GROUP BY substr(redeemed_at, 1, 10), user_id, reward_id
+                ON CONFLICT (day, user_id, reward_id) DO UPDATE SET uses = uses + excluded.uses
+                """, params)
+            cursor = self.db.execute(
+                f"DELETE FROM reward_redemptions WHERE {where}", params)
+
+        logger.debug(f"Archived {cursor.rowcount} redemptions into {table}")
+        return cursor.rowcount
+
+    def get_user_redemptions(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        from utils.reward_service import USER_REDEMPTIONS_QUERY
+
+        results = self.db.fetchall(USER_REDEMPTIONS_QUERY, (user_id, limit))
+
+        # Only reach into the archive when the hot table can't fill the page
+        for table in self.archive_tables():
+            if len(results) >= limit:
+                break
+            results.extend(self.db.fetchall(
+                user_redemptions_query(table), (user_id, limit - len(results))))
+
+        return results
+
+    def get_daily_counts(self, reward_id: Optional[str] = None, user_id: Optional[str] = None,
+                         since_day: Optional[str] = None, analytical: bool = True) -> List[Dict[str, Any]]:
+        """
+        Uses per day from the rollups plus the hot table. A reporting read, so
+        by default it is served from the analytics snapshot and may lag the
+        live database by up to DB_SNAPSHOT_MAX_AGE_SECONDS.
+        """
+        filters = []
+        params: List[Any] = []
+        if reward_id:
+            filters.append("reward_id = ?")
+            params.append(reward_id)
+        if user_id:
+            filters.append("user_id = ?")
+            params.append(user_id)
+
+        rollup_table = "user_redemption_daily" if user_id else "reward_redemption_daily"
+        rollup_filters = list(filters)
+        rollup_params = list(params)
+        hot_filters = list(filters)
+        hot_params = list(params)
+        if since_day:
+            rollup_filters.append("day >= ?")
+            rollup_params.append(since_day)
+            hot_filters.append("redeemed_at >= ?")
+            hot_params.append(since_day)
+
+        rollup_where = f"WHERE {' AND '.join(rollup_filters)}" if rollup_filters else ""
+        hot_where = f"WHERE {' AND '.join(hot_filters)}" if hot_filters else ""
+
+        return self.db.fetchall(f"""
+            SELECT day, SUM(uses) AS uses FROM (
+                SELECT day, uses FROM {rollup_table} {rollup_where}
+                UNION ALL
+                SELECT substr(redeemed_at, 1, 10) AS day, 1 AS uses FROM reward_redemptions {hot_where}
+            )
+            GROUP BY day
+            ORDER BY day
+            """, rollup_params + hot_params, analytical=analytical)
+
+
+# Singleton instance
+redemption_archive = RedemptionArchive()
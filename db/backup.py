@@ -0,0 +1,205 @@
+import os
+import sqlite3
+import threading
+import time
+
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Callable
+
+from core.config import config
+from core.logging import get_logger
+from core.errors import DatabaseError, handle_error
+from db.database import db
+
+logger = get_logger("db_backup")
+
+BACKUP_PREFIX = "db_backup_"
+BACKUP_SUFFIX = ".db"
+
+
+class BackupManager:
+    def __init__(self, database=db):
+        self.db = database
+        self.backup_dir = config.get_path('DB_BACKUP_DIR', 'db/backups')
+        self.keep = config.get_int('DB_BACKUP_KEEP', 10)
+        self.pages_per_step = config.get_int('DB_BACKUP_PAGES_PER_STEP', 256)
+        self.step_sleep = config.get_float('DB_BACKUP_STEP_SLEEP', 0.005)
+        self._backup_lock = threading.Lock()
+
+    def create_backup(self, backup_path: Optional[str] = None, rotate: bool = True) -> str:
+        if not backup_path:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            backup_path = os.path.join(
+                self.backup_dir, f"{BACKUP_PREFIX}{timestamp}{BACKUP_SUFFIX}")
+
+        with self._backup_lock:
+            started = time.perf_counter()
+            temp_path = f"{backup_path}.part"
+            try:
+                # Copy in page steps into a temp file so a half-written backup
+                # never shows up in the rotation
+                self.db.copy_to(temp_path, pages=self.pages_per_step,
+                                sleep=self.step_sleep)
+                os.replace(temp_path, backup_path)
+            except Exception as e:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                error_msg = f"Error backing up database: {e}"
+                logger.error(error_msg)
+                raise DatabaseError(error_msg)
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                f"Database backed up to {backup_path} in {elapsed_ms:.0f}ms")
+
+        if rotate:
+            self.rotate_backups()
+        return str(backup_path)
+
+    def create_backup_async(self, callback: Optional[Callable[[Optional[str]], None]] = None) -> Optional[threading.Thread]:
+        if self._backup_lock.locked():
+            logger.info("Backup already in progress, skipping")
+            return None
+
+        def run():
+            backup_path = None
+            try:
+                backup_path = self.create_backup()
+            except Exception as e:
+                handle_error(e, {"context": "create_backup_async"})
+            if callback:
+                callback(backup_path)
+
+        thread = threading.Thread(
+            target=run, daemon=True, name="DatabaseBackupThread")
+        thread.start()
+        return thread
+
+    def list_backups(self) -> List[Path]:
+        if not os.path.isdir(self.backup_dir):
+            return []
+
+        # Timestamped names sort chronologically
+        return sorted(
+            Path(self.backup_dir) / name
+            for name in os.listdir(self.backup_dir)
+            if name.startswith(BACKUP_PREFIX) and name.endswith(BACKUP_SUFFIX)
+        )
+
+    def rotate_backups(self) -> int:
+        if self.keep <= 0:
+            return 0
+
+        removed = 0
+        for path in self.list_backups()[:-self.keep]:
+            try:
+                os.remove(path)
+                removed += 1
+                logger.debug(f"Removed old backup {path}")
+            except OSError as e:
+                logger.warning(f"Failed to remove old backup {path}: {e}")
+        return removed
+
+    def resolve_backup(self, name: Optional[str] = None) -> Optional[Path]:
+        backups = self.list_backups()
+        if not backups:
+            return None
+        if not name or name == "latest":
+            return backups[-1]
+
+        # Only allow files from the backup directory
+        name = os.path.basename(name)
+        for path in backups:
+            if path.name == name or path.stem == name:
+                return path
+        return None
+
+    @staticmethod
+    def _open_backup(backup_path: Path) -> sqlite3.Connection:
+        # Read-only so a backup that vanished raises instead of being
+        # recreated as an empty database
+        try:
+            return sqlite3.connect(f"file:{backup_path}?mode=ro", uri=True)
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Cannot open backup {backup_path}: {e}")
+
+    def restore_backup(self, backup_path: Path) -> str:
+        if not os.path.exists(backup_path):
+            raise DatabaseError(f"Backup file not found: {backup_path}")
+
+        with self._backup_lock:
+            source = self._open_backup(backup_path)
+            try:
+                result = source.execute("PRAGMA quick_check").fetchone()
+                if not result or result[0] != "ok":
+                    raise DatabaseError(
+                        f"Backup failed integrity check: {backup_path}")
+            finally:
+                source.close()
+
+        # Keep what we're about to overwrite; rotating now could delete the
+        # backup being restored, so that waits until the restore is done
+        safety_path = self.create_backup(rotate=False)
+
+        with self._backup_lock:
+            source = self._open_backup(backup_path)
+            target = sqlite3.connect(self.db.db_path, timeout=30.0)
+            try:
+                # Single step so the live file flips over in one locked copy;
+                # pooled connections see the restored data on their next query
+                source.backup(target)
+            except sqlite3.Error as e:
+                error_msg = f"Error restoring database from {backup_path}: {e}"
+                logger.error(error_msg)
+                raise DatabaseError(error_msg)
+            finally:
+                target.close()
+                source.close()
+
+        # The backup may predate migrations the running code expects
+        self.db.migrate()
+
+        self.rotate_backups()
+        logger.info(
+            f"Database restored from {backup_path} (previous state saved to {safety_path})")
+        return safety_path
+
+    def restore_backup_async(self, backup_path: Path,
+                             callback: Optional[Callable[[Optional[str], Optional[Exception]], None]] = None
+                             ) -> Optional[threading.Thread]:
+        if self._backup_lock.locked():
+            logger.info("Backup already in progress, skipping restore")
+            return None
+
+        def run():
+            safety_path, error = None, None
+            try:
+                safety_path = self.restore_backup(backup_path)
+            except Exception as e:
+                error = e
+                handle_error(e, {"context": "restore_backup_async", "backup": str(backup_path)})
+            if callback:
+                callback(safety_path, error)
+
+        thread = threading.Thread(
+            target=run, daemon=True, name="DatabaseRestoreThread")
+        thread.start()
+        return thread
+
+    def start_schedule(self, interval_minutes: int) -> None:
+        if interval_minutes <= 0:
+            return
+
+        from utils.scheduler import scheduler
+        scheduler.add_interval_job(
+            "db_backup", self.create_backup, interval_minutes * 60, jitter=30)
+
+    def stop_schedule(self) -> None:
+        from utils.scheduler import scheduler
+        scheduler.remove_job("db_backup")
+
+
+# Singleton instance
+backup_manager = BackupManager()
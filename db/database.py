@@ -1,26 +1,91 @@
+import asyncio
 import os
+import re
 import sqlite3
+import sys
 import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, asynccontextmanager
+from collections import namedtuple
+from functools import partial, lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple, Union
+from typing import Optional, Dict, Any, List, Tuple, Union, Iterator, Sequence, Callable
 
 from utils.platform_connections import SafeSingleton
 from core.config import config
 from core.logging import get_logger
 from core.errors import DatabaseError, handle_error
+from db.instrumentation import query_stats
 
 logger = get_logger("database")
 
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+@lru_cache(maxsize=256)
+def _namedtuple_type(columns: Tuple[str, ...]):
+    return namedtuple("Record", columns, rename=True)
+
+
+def _row_converter(cursor: sqlite3.Cursor, row_format: str) -> Callable[[sqlite3.Row], Any]:
+    if row_format == "dict":
+        return dict
+    if row_format == "tuple":
+        return tuple
+    if row_format == "namedtuple":
+        record_type = _namedtuple_type(
+            tuple(column[0] for column in cursor.description or ()))
+        return lambda row: record_type(*row)
+    if row_format == "row":
+        return lambda row: row
+    raise DatabaseError(f"Unknown row format: {row_format}")
+
+
+def select_query(table: str, columns: Sequence[str], where: str = "", order_by: str = "") -> str:
+    """
+    Builds a SELECT for an explicit column list so callers only read what
+    they use. Table and column names must be plain identifiers.
+    """
+    for name in (table, *columns):
+        if not _IDENTIFIER.match(name):
+            raise DatabaseError(f"Invalid identifier in projection: {name}")
+
+    query = f"SELECT {', '.join(columns)} FROM {table}"
+    if where:
+        query += f" WHERE {where}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    return query
+
 
 class Database(SafeSingleton):
+    def __init__(self, db_path: Optional[str] = None):
+        # Allows throwaway databases (tests, tooling) next to the shared singleton
+        self._db_path_override = db_path
+        super().__init__()
+
     def _safe_init(self):
-        self.db_path = config.get_path('DB_PATH', 'db/bot.db')
+        if self._db_path_override:
+            self.db_path = Path(self._db_path_override)
+        else:
+            self.db_path = config.get_path('DB_PATH', 'db/bot.db')
         self.schema_path = config.get_path(
             'SCHEMA_PATH', 'db/migrations/schema.sql')
         self.seed_path = config.get_path('SEED_PATH', 'db/migrations/seed.sql')
+        self.migrations_dir = config.get_path(
+            'MIGRATIONS_DIR', 'db/migrations')
         self.enabled = config.get_boolean('DB_ENABLED', True)
         self.connection_pool = {}
         self.connection_pool_lock = threading.Lock()
+        self.async_readers = config.get_int('DB_ASYNC_READERS', 2)
+        self._read_executor = None
+        self._write_executor = None
+        self._executor_lock = threading.Lock()
+        self._async_write_locks = weakref.WeakKeyDictionary()
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
 
         if self.enabled:
             try:
@@ -42,6 +107,15 @@ class Database(SafeSingleton):
         else:
             logger.info(f"Database already exists at {self.db_path}")
 
+        # Throwaway databases are ready to use once constructed. The shared
+        # one is migrated by startup, so importing db never rewrites the file
+        if self._db_path_override:
+            self.migrate()
+
+    def migrate(self) -> int:
+        from db.migrator import Migrator
+        return Migrator(self, self.migrations_dir).migrate()
+
     def _create_database(self):
         if not os.path.exists(self.schema_path):
             error_msg = f"Schema file not found: {self.schema_path}"
@@ -51,29 +125,29 @@ class Database(SafeSingleton):
         try:
             conn = self._get_connection()
 
-            # Create schema
             with open(self.schema_path, 'r') as f:
                 schema_sql = f.read()
 
-            conn.executescript(schema_sql)
-            logger.info("Database schema created successfully")
-
-            # Apply seed data if available
+            seed_sql = ""
             if os.path.exists(self.seed_path):
                 with open(self.seed_path, 'r') as f:
                     seed_sql = f.read()
 
-                try:
-                    conn.executescript(seed_sql)
+            # Schema and seed go in as a single transaction: one fsync
+            # instead of one per statement
+            try:
+                conn.executescript(f"BEGIN;\n{schema_sql}\n{seed_sql}\nCOMMIT;")
+                logger.info("Database schema created successfully")
+                if seed_sql:
                     logger.info("Seed data applied successfully")
-                except sqlite3.IntegrityError as e:
-                    conn.rollback()
-                    logger.warning(
-                        f"Some seed data already exists, skipping: {e}")
-                except Exception as e:
-                    conn.rollback()
-                    logger.error(f"Error applying seed data: {e}")
+            except sqlite3.Error as e:
+                self._rollback_connection(conn)
+                if not seed_sql:
                     raise
+                logger.warning(
+                    f"Error applying seed data, creating schema only: {e}")
+                conn.executescript(f"BEGIN;\n{schema_sql}\nCOMMIT;")
+                logger.info("Database schema created successfully")
 
         except sqlite3.Error as e:
             error_msg = f"Error creating database: {e}"
@@ -81,6 +155,9 @@ class Database(SafeSingleton):
             raise DatabaseError(error_msg)
 
     def _get_connection(self) -> sqlite3.Connection:
+        return self._get_connection_info()["connection"]
+
+    def _get_connection_info(self) -> Dict[str, Any]:
         thread_id = threading.get_ident()
 
         with self.connection_pool_lock:
@@ -97,10 +174,12 @@ class Database(SafeSingleton):
                     # Enable foreign keys
                     conn.execute("PRAGMA foreign_keys = ON")
 
+                    # Re-entrant so a transaction can keep the lock while the
+                    # statements inside it go through execute()
                     self.connection_pool[thread_id] = {
                         "connection": conn,
-                        "lock": threading.Lock(),
-                        "in_transaction": False
+                        "lock": threading.RLock(),
+                        "transaction_depth": 0
                     }
                     logger.debug(
                         f"Created new database connection for thread {thread_id}")
@@ -109,52 +188,93 @@ class Database(SafeSingleton):
                     logger.error(error_msg)
                     raise DatabaseError(error_msg)
 
-        return self.connection_pool[thread_id]["connection"]
+            return self.connection_pool[thread_id]
+
+    @staticmethod
+    def _rollback_connection(conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
 
     def safe_seed(self, table_name, unique_column, records):
         if not self.enabled:
             raise DatabaseError("Database operations are disabled")
 
+        return self.bulk_insert(table_name, records, unique_column)
+
+    def bulk_insert(self, table_name: str, records: List[Dict[str, Any]], unique_column: Optional[str] = None) -> int:
+        """
+        Inserts records with executemany inside one transaction, skipping
+        rows that already exist (by unique_column when given, otherwise by
+        any UNIQUE constraint). Returns the number of rows inserted.
+        """
+        if not self.enabled:
+            raise DatabaseError("Database operations are disabled")
+
+        # One statement per distinct column layout
+        batches: Dict[Tuple[str, ...], List[List[Any]]] = {}
         for record in records:
-            # Skip if record with this unique value already exists
-            if unique_column in record:
-                existing = self.fetchone(
-                    f"SELECT 1 FROM {table_name} WHERE {unique_column} = ?",
-                    (record[unique_column],)
-                )
-                if existing:
-                    continue
-
-            # Build dynamic INSERT statement based on record keys
-            columns = ", ".join(record.keys())
-            placeholders = ", ".join(["?" for _ in record])
-            query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+            batches.setdefault(tuple(record.keys()), []).append(
+                list(record.values()))
 
-            try:
-                self.execute(query, list(record.values()))
-            except Exception as e:
-                # Log the error but continue with other records
-                logger.warning(f"Failed to insert record in {table_name}: {e}")
+        with self.transaction():
+            conn = self._get_connection()
+            changes_before = conn.total_changes
+
+            for columns, rows in batches.items():
+                column_list = ", ".join(columns)
+                placeholders = ", ".join(["?" for _ in columns])
+
+                if unique_column and unique_column in columns:
+                    unique_index = columns.index(unique_column)
+                    query = (f"INSERT INTO {table_name} ({column_list}) SELECT {placeholders} "
+                             f"WHERE NOT EXISTS (SELECT 1 FROM {table_name} WHERE {unique_column} = ?) "
+                             f"ON CONFLICT DO NOTHING")
+                    params_list = [row + [row[unique_index]] for row in rows]
+                else:
+                    query = f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders}) ON CONFLICT DO NOTHING"
+                    params_list = rows
 
-    def execute(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None) -> sqlite3.Cursor:
+                try:
+                    with self.transaction():
+                        self.execute_many(query, params_list)
+                except DatabaseError:
+                    # Retry row by row so one bad record doesn't sink the batch
+                    for params in params_list:
+                        try:
+                            with self.transaction():
+                                self.execute(query, params)
+                        except DatabaseError as e:
+                            logger.warning(
+                                f"Failed to insert record in {table_name}: {e}")
+
+            return conn.total_changes - changes_before
+
+    def execute(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None,
+                record_stats: bool = True) -> sqlite3.Cursor:
+        """
+        record_stats=False leaves timing to the caller, for reads whose rows
+        are fetched after the statement starts.
+        """
         if not self.enabled:
             raise DatabaseError("Database operations are disabled")
 
         try:
-            thread_id = threading.get_ident()
-            conn_info = self.connection_pool.get(thread_id)
-
-            if not conn_info:
-                conn_info = self.connection_pool[thread_id] = {
-                    "connection": self._get_connection(),
-                    "lock": threading.Lock(),
-                    "in_transaction": False
-                }
+            conn_info = self._get_connection_info()
 
             with conn_info["lock"]:
-                if params is None:
-                    return conn_info["connection"].execute(query)
-                return conn_info["connection"].execute(query, params)
+                if not (record_stats and query_stats.active):
+                    if params is None:
+                        return conn_info["connection"].execute(query)
+                    return conn_info["connection"].execute(query, params)
+
+                started = time.perf_counter()
+                try:
+                    if params is None:
+                        return conn_info["connection"].execute(query)
+                    return conn_info["connection"].execute(query, params)
+                finally:
+                    query_stats.record(
+                        query, params, time.perf_counter() - started)
         except sqlite3.IntegrityError as e:
             # For integrity errors, log and reraise but with more context
             error_msg = f"Integrity constraint failed: {e}"
@@ -170,50 +290,179 @@ class Database(SafeSingleton):
             raise DatabaseError("Database operations are disabled")
 
         try:
-            thread_id = threading.get_ident()
-            conn_info = self.connection_pool.get(thread_id)
-
-            if not conn_info:
-                conn_info = self.connection_pool[thread_id] = {
-                    "connection": self._get_connection(),
-                    "lock": threading.Lock(),
-                    "in_transaction": False
-                }
+            conn_info = self._get_connection_info()
 
             with conn_info["lock"]:
-                return conn_info["connection"].executemany(query, params_list)
+                if not query_stats.active:
+                    return conn_info["connection"].executemany(query, params_list)
+
+                if not isinstance(params_list, (list, tuple)):
+                    params_list = list(params_list)
+                started = time.perf_counter()
+                try:
+                    return conn_info["connection"].executemany(query, params_list)
+                finally:
+                    query_stats.record(
+                        query, params_list[0] if params_list else None,
+                        time.perf_counter() - started, len(params_list))
         except sqlite3.Error as e:
             error_msg = f"Error executing batch query: {e}"
             logger.error(error_msg)
             raise DatabaseError(error_msg)
 
-    def fetchone(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None) -> Optional[Dict[str, Any]]:
-        cursor = self.execute(query, params)
-        row = cursor.fetchone()
-        return dict(row) if row else None
+    @property
+    def snapshot(self):
+        """Read-only copy of this database used for analytical queries."""
+        if self._snapshot is None:
+            with self._snapshot_lock:
+                if self._snapshot is None:
+                    from db.snapshot import SnapshotManager
+                    self._snapshot = SnapshotManager(self)
+        return self._snapshot
+
+    def _read_cursor(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]], analytical: bool) -> sqlite3.Cursor:
+        # Not timed here: SQLite does most of a SELECT's work as rows are
+        # stepped, so callers time the statement together with the fetch
+        if analytical and self.enabled and self.snapshot.enabled:
+            return self.snapshot.execute(query, params, record_stats=False)
+        return self.execute(query, params, record_stats=False)
+
+    @staticmethod
+    def _record_read(query: str, params: Any, elapsed: float) -> None:
+        if query_stats.active:
+            query_stats.record(query, params, elapsed)
+
+    def fetchone(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None, row_format: str = "dict",
+                 analytical: bool = False) -> Optional[Any]:
+        started = time.perf_counter()
+        try:
+            cursor = self._read_cursor(query, params, analytical)
+            row = cursor.fetchone()
+        finally:
+            self._record_read(query, params, time.perf_counter() - started)
+        if row is None:
+            return None
+        return row if row_format == "row" else _row_converter(cursor, row_format)(row)
+
+    def fetchall(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None, row_format: str = "dict",
+                 analytical: bool = False) -> List[Any]:
+        started = time.perf_counter()
+        try:
+            cursor = self._read_cursor(query, params, analytical)
+            rows = cursor.fetchall()
+        finally:
+            self._record_read(query, params, time.perf_counter() - started)
+        convert = _row_converter(cursor, row_format)
+        return [convert(row) for row in rows]
+
+    def iterate_batches(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None,
+                        batch_size: int = 500, row_format: str = "dict",
+                        analytical: bool = False) -> Iterator[List[Any]]:
+        """
+        Streams a result set in lists of at most batch_size rows, so large
+        reads use constant memory.
+        """
+        # Time spent in SQLite across all batches, not in the consumer
+        started = time.perf_counter()
+        elapsed = 0.0
+        cursor = None
+        try:
+            cursor = self._read_cursor(query, params, analytical)
+            convert = _row_converter(cursor, row_format)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                elapsed += time.perf_counter() - started
+                if not rows:
+                    break
+                yield [convert(row) for row in rows]
+                started = time.perf_counter()
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self._record_read(query, params, elapsed)
+
+    def iterate(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None,
+                batch_size: int = 500, row_format: str = "dict",
+                analytical: bool = False) -> Iterator[Any]:
+        for batch in self.iterate_batches(query, params, batch_size, row_format, analytical):
+            yield from batch
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work for the calling thread: the outermost block runs in a
+        BEGIN IMMEDIATE/COMMIT pair, nested blocks become savepoints. Any exception
+        rolls back the innermost block and is re-raised.
+        """
+        if not self.enabled:
+            raise DatabaseError("Database operations are disabled")
+
+        conn_info = self._get_connection_info()
+        conn = conn_info["connection"]
 
-    def fetchall(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None) -> List[Dict[str, Any]]:
-        cursor = self.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        with conn_info["lock"]:
+            depth = conn_info["transaction_depth"]
+            savepoint = f"sp_{depth}"
+
+            try:
+                if depth == 0:
+                    # Take the write lock up front: two deferred transactions
+                    # that read then write deadlock on the lock upgrade, and
+                    # SQLite fails one at once instead of waiting out the timeout
+                    conn.execute("BEGIN IMMEDIATE")
+                else:
+                    conn.execute(f"SAVEPOINT {savepoint}")
+            except sqlite3.Error as e:
+                error_msg = f"Error starting transaction: {e}"
+                logger.error(error_msg)
+                raise DatabaseError(error_msg)
+
+            conn_info["transaction_depth"] = depth + 1
+            try:
+                yield self
+            except BaseException:
+                conn_info["transaction_depth"] = depth
+                try:
+                    if depth == 0:
+                        self._rollback_connection(conn)
+                    else:
+                        conn.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                        conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+                except sqlite3.Error as e:
+                    logger.error(f"Error rolling back transaction: {e}")
+                raise
+
+            conn_info["transaction_depth"] = depth
+            try:
+                if depth == 0:
+                    conn.execute("COMMIT")
+                else:
+                    conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+            except sqlite3.Error as e:
+                self._rollback_connection(conn)
+                error_msg = f"Error committing transaction: {e}"
+                logger.error(error_msg)
+                raise DatabaseError(error_msg)
+
+    def in_transaction(self) -> bool:
+        conn_info = self.connection_pool.get(threading.get_ident())
+        return bool(conn_info and conn_info["transaction_depth"])
 
     def begin_transaction(self) -> None:
         if not self.enabled:
             raise DatabaseError("Database operations are disabled")
 
-        thread_id = threading.get_ident()
-        conn_info = self.connection_pool.get(thread_id)
-
-        if not conn_info:
-            conn_info = self.connection_pool[thread_id] = {
-                "connection": self._get_connection(),
-                "lock": threading.Lock(),
-                "in_transaction": False
-            }
+        conn_info = self._get_connection_info()
 
         with conn_info["lock"]:
-            if not conn_info["in_transaction"]:
-                self.execute("BEGIN TRANSACTION")
-                conn_info["in_transaction"] = True
+            if not conn_info["transaction_depth"]:
+                try:
+                    conn_info["connection"].execute("BEGIN IMMEDIATE")
+                except sqlite3.Error as e:
+                    error_msg = f"Error starting transaction: {e}"
+                    logger.error(error_msg)
+                    raise DatabaseError(error_msg)
+                conn_info["transaction_depth"] = 1
 
     def commit(self) -> None:
         if not self.enabled:
@@ -222,11 +471,11 @@ class Database(SafeSingleton):
         thread_id = threading.get_ident()
         conn_info = self.connection_pool.get(thread_id)
 
-        if conn_info and conn_info["in_transaction"]:
+        if conn_info and conn_info["transaction_depth"]:
             with conn_info["lock"]:
                 try:
                     conn_info["connection"].execute("COMMIT")
-                    conn_info["in_transaction"] = False
+                    conn_info["transaction_depth"] = 0
                 except sqlite3.Error as e:
                     error_msg = f"Error committing transaction: {e}"
                     logger.error(error_msg)
@@ -239,15 +488,82 @@ class Database(SafeSingleton):
         thread_id = threading.get_ident()
         conn_info = self.connection_pool.get(thread_id)
 
-        if conn_info and conn_info["in_transaction"]:
+        if conn_info and conn_info["transaction_depth"]:
             with conn_info["lock"]:
                 try:
                     conn_info["connection"].execute("ROLLBACK")
-                    conn_info["in_transaction"] = False
+                    conn_info["transaction_depth"] = 0
                 except sqlite3.Error as e:
                     error_msg = f"Error rolling back transaction: {e}"
                     logger.error(error_msg)
 
+    def _executors(self) -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        # Executor threads get their own pooled connections like any other thread
+        with self._executor_lock:
+            if self._read_executor is None:
+                self._read_executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.async_readers), thread_name_prefix="db-read")
+                # SQLite has a single writer anyway; one thread keeps writes ordered
+                self._write_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="db-write")
+            return self._read_executor, self._write_executor
+
+    def _write_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._async_write_locks.get(loop)
+        if lock is None:
+            lock = self._async_write_locks[loop] = asyncio.Lock()
+        return lock
+
+    async def _run_read(self, func, *args):
+        executor = self._executors()[0]
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args))
+
+    async def _run_write(self, func, *args):
+        executor = self._executors()[1]
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args))
+
+    async def aexecute(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None) -> sqlite3.Cursor:
+        async with self._write_lock():
+            return await self._run_write(self.execute, query, params)
+
+    async def aexecute_many(self, query: str, params_list: List[Union[Dict[str, Any], List[Any], Tuple[Any, ...]]]) -> sqlite3.Cursor:
+        async with self._write_lock():
+            return await self._run_write(self.execute_many, query, params_list)
+
+    async def afetchone(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None,
+                        analytical: bool = False) -> Optional[Dict[str, Any]]:
+        return await self._run_read(self.fetchone, query, params, "dict", analytical)
+
+    async def afetchall(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None,
+                        analytical: bool = False) -> List[Dict[str, Any]]:
+        return await self._run_read(self.fetchall, query, params, "dict", analytical)
+
+    @asynccontextmanager
+    async def atransaction(self):
+        """
+        Awaitable unit of work. Every statement issued through the yielded
+        object runs on the writer thread inside one transaction; other async
+        writers wait until it commits or rolls back.
+        """
+        async with self._write_lock():
+            unit = self.transaction()
+            await self._run_write(unit.__enter__)
+            try:
+                yield _AsyncUnitOfWork(self)
+            except BaseException:
+                await self._run_write(unit.__exit__, *sys.exc_info())
+                raise
+            await self._run_write(unit.__exit__, None, None, None)
+
+    def close_async(self) -> None:
+        with self._executor_lock:
+            for executor in (self._read_executor, self._write_executor):
+                if executor:
+                    executor.shutdown(wait=True)
+            self._read_executor = None
+            self._write_executor = None
+
     def close(self) -> None:
         if not self.enabled:
             return
@@ -257,8 +573,7 @@ class Database(SafeSingleton):
             if thread_id in self.connection_pool:
                 try:
                     conn_info = self.connection_pool[thread_id]
-                    if conn_info["in_transaction"]:
-                        conn_info["connection"].execute("ROLLBACK")
+                    self._rollback_connection(conn_info["connection"])
                     conn_info["connection"].close()
                     del self.connection_pool[thread_id]
                     logger.debug(
@@ -270,11 +585,13 @@ class Database(SafeSingleton):
         if not self.enabled:
             return
 
+        if self._snapshot:
+            self._snapshot.close_all()
+
         with self.connection_pool_lock:
             for thread_id, conn_info in list(self.connection_pool.items()):
                 try:
-                    if conn_info["in_transaction"]:
-                        conn_info["connection"].execute("ROLLBACK")
+                    self._rollback_connection(conn_info["connection"])
                     conn_info["connection"].close()
                     logger.debug(
                         f"Closed database connection for thread {thread_id}")
@@ -299,32 +616,55 @@ class Database(SafeSingleton):
         )
         return bool(result)
 
+    def copy_to(self, dest_path: Union[str, Path], pages: int = -1, sleep: float = 0.0) -> None:
+        """
+        Online copy of the live database using the SQLite backup API. With
+        pages > 0 the copy is done in steps so writers are only blocked for
+        one step at a time.
+        """
+        if not self.enabled:
+            raise DatabaseError("Database operations are disabled")
+
+        # A private connection keeps the copy off the request threads' locks
+        source = sqlite3.connect(self.db_path, timeout=30.0)
+        target = sqlite3.connect(dest_path)
+        try:
+            source.backup(target, pages=pages, sleep=sleep)
+        except sqlite3.Error as e:
+            error_msg = f"Error copying database to {dest_path}: {e}"
+            logger.error(error_msg)
+            raise DatabaseError(error_msg)
+        finally:
+            target.close()
+            source.close()
+
+    def optimize(self) -> None:
+        """Refreshes query planner statistics for tables that need it."""
+        self.execute("PRAGMA optimize")
+
     def backup_database(self, backup_path: Optional[str] = None) -> str:
         if not self.enabled:
             raise DatabaseError("Database operations are disabled")
 
-        import shutil
-        from datetime import datetime
+        from db.backup import backup_manager
+        return backup_manager.create_backup(backup_path)
 
-        if not backup_path:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_dir = config.get_path('DB_BACKUP_DIR', 'db/backups')
-            os.makedirs(backup_dir, exist_ok=True)
-            backup_path = os.path.join(backup_dir, f"db_backup_{timestamp}.db")
 
-        try:
-            # Close all connections first to ensure a clean backup
-            self.close_all()
+class _AsyncUnitOfWork:
+    def __init__(self, database: Database):
+        self._db = database
 
-            # Copy the database file
-            shutil.copy2(self.db_path, backup_path)
-            logger.info(f"Database backed up to {backup_path}")
+    async def execute(self, query: str, params=None) -> sqlite3.Cursor:
+        return await self._db._run_write(self._db.execute, query, params)
 
-            return backup_path
-        except Exception as e:
-            error_msg = f"Error backing up database: {e}"
-            logger.error(error_msg)
-            raise DatabaseError(error_msg)
+    async def execute_many(self, query: str, params_list) -> sqlite3.Cursor:
+        return await self._db._run_write(self._db.execute_many, query, params_list)
+
+    async def fetchone(self, query: str, params=None) -> Optional[Dict[str, Any]]:
+        return await self._db._run_write(self._db.fetchone, query, params)
+
+    async def fetchall(self, query: str, params=None) -> List[Dict[str, Any]]:
+        return await self._db._run_write(self._db.fetchall, query, params)
 
 
 # Singleton instance
@@ -0,0 +1,112 @@
+import re
+import threading
+
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.config import config
+from core.logging import get_logger
+
+logger = get_logger("db_queries")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalise_query(query: str) -> str:
+    normalised = _STRING_LITERAL.sub("?", query)
+    normalised = _NUMBER_LITERAL.sub("?", normalised)
+    normalised = _PLACEHOLDER_LIST.sub("(?)", normalised)
+    return _WHITESPACE.sub(" ", normalised).strip()
+
+
+def redact_params(params: Any) -> str:
+    # Parameter values can be chat messages or user ids, only log their shape
+    if params is None:
+        return "none"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: <{type(value).__name__}>" for key, value in params.items()) + "}"
+    if isinstance(params, (list, tuple)):
+        return "[" + ", ".join(f"<{type(value).__name__}>" for value in params) + "]"
+    return f"<{type(params).__name__}>"
+
+
+class QueryStats:
+    def __init__(self):
+        self.enabled = config.get_boolean('DB_QUERY_STATS', False)
+        self.slow_query_ms = config.get_float('DB_SLOW_QUERY_MS', 250.0)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        # Raw query text -> normalised form, call sites reuse the same strings
+        self._normalised: Dict[str, str] = {}
+
+    @property
+    def active(self) -> bool:
+        return self.enabled or self.slow_query_ms > 0
+
+    def _normalise(self, query: str) -> str:
+        normalised = self._normalised.get(query)
+        if normalised is None:
+            normalised = normalise_query(query)
+            if len(self._normalised) < 10000:
+                self._normalised[query] = normalised
+        return normalised
+
+    def record(self, query: str, params: Any, elapsed: float, batch_size: int = 1) -> None:
+        elapsed_ms = elapsed * 1000
+        statement = self._normalise(query)
+
+        if self.slow_query_ms > 0 and elapsed_ms >= self.slow_query_ms:
+            logger.warning(
+                f"Slow query ({elapsed_ms:.1f}ms, {batch_size} row(s)): {statement} params={redact_params(params)}")
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            entry = self._stats.get(statement)
+            if entry is None:
+                entry = self._stats[statement] = {
+                    "count": 0,
+                    "rows": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1)
+                }
+            entry["count"] += 1
+            entry["rows"] += batch_size
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["histogram"][bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [
+                dict(entry, statement=statement,
+                     histogram=list(entry["histogram"]),
+                     avg_ms=entry["total_ms"] / entry["count"])
+                for statement, entry in self._stats.items()
+            ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def log_summary(self, limit: int = 10) -> None:
+        if not self.enabled:
+            return
+
+        for row in self.snapshot()[:limit]:
+            logger.info(
+                f"{row['count']}x total={row['total_ms']:.1f}ms avg={row['avg_ms']:.2f}ms "
+                f"max={row['max_ms']:.1f}ms: {row['statement']}")
+
+
+# Singleton instance
+query_stats = QueryStats()
@@ -0,0 +1,3 @@
+-- Per-user redemption history (get_user_redemptions) and per-reward lookups
+CREATE INDEX IF NOT EXISTS idx_reward_redemptions_user_redeemed ON reward_redemptions(user_id, redeemed_at);
+CREATE INDEX IF NOT EXISTS idx_reward_redemptions_reward ON reward_redemptions(reward_id);
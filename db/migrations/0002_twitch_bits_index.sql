@@ -0,0 +1,2 @@
+-- Bits action lookup on every cheer
+CREATE INDEX IF NOT EXISTS idx_twitch_bits_bits ON twitch_bits(bits);
@@ -0,0 +1,21 @@
+-- Daily rollups of archived redemptions (hot rows are aggregated on read)
+CREATE TABLE IF NOT EXISTS reward_redemption_daily (
+    day TEXT NOT NULL, -- YYYY-MM-DD
+    reward_id TEXT NOT NULL,
+    uses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, reward_id)
+);
+
+CREATE TABLE IF NOT EXISTS user_redemption_daily (
+    day TEXT NOT NULL, -- YYYY-MM-DD
+    user_id TEXT NOT NULL,
+    reward_id TEXT NOT NULL,
+    uses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, user_id, reward_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_reward_redemption_daily_reward ON reward_redemption_daily(reward_id, day);
+CREATE INDEX IF NOT EXISTS idx_user_redemption_daily_user ON user_redemption_daily(user_id, day);
+
+-- Lets the retention job find old rows without scanning the hot table
+CREATE INDEX IF NOT EXISTS idx_reward_redemptions_redeemed ON reward_redemptions(redeemed_at);
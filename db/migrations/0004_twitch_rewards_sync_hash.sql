@@ -0,0 +1,3 @@
+-- Content hash of the Helix fields last written by reward sync, so unchanged
+-- rewards are skipped without comparing every column
+ALTER TABLE twitch_rewards ADD COLUMN sync_hash TEXT;
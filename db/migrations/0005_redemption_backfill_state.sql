@@ -0,0 +1,7 @@
+-- Newest redemption seen per reward (epoch seconds), so the backfill after
+-- downtime only pages through what was missed
+CREATE TABLE IF NOT EXISTS redemption_backfill_state (
+    reward_id TEXT PRIMARY KEY,
+    last_redeemed_at REAL NOT NULL,
+    updated_at TEXT NOT NULL
+);
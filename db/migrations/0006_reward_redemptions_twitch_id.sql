@@ -0,0 +1,4 @@
+-- Twitch redemption id of each recorded redemption, so the backfill can tell
+-- which redemptions from Helix were already handled live
+ALTER TABLE reward_redemptions ADD COLUMN twitch_redemption_id TEXT;
+CREATE INDEX IF NOT EXISTS idx_reward_redemptions_twitch_id ON reward_redemptions(twitch_redemption_id);
@@ -0,0 +1,3 @@
+-- Set when reward sync no longer sees a reward on Twitch. Rows are kept so
+-- their redemption history and local handler settings survive
+ALTER TABLE twitch_rewards ADD COLUMN removed_at TEXT;
@@ -0,0 +1,17 @@
+"""
+Monthly archive tables carry twitch_redemption_id like reward_redemptions
+(0006). They are created on demand, so each existing one is altered here.
+"""
+
+from db.archive import ARCHIVE_PREFIX, ARCHIVE_TABLE
+
+
+def migrate(db) -> None:
+    rows = db.fetchall(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
+        (f"{ARCHIVE_PREFIX}%",)
+    )
+    for table in (row["name"] for row in rows if ARCHIVE_TABLE.match(row["name"])):
+        columns = {column["name"] for column in db.fetchall(f"PRAGMA table_info({table})")}
+        if "twitch_redemption_id" not in columns:
+            db.execute(f"ALTER TABLE {table} ADD COLUMN twitch_redemption_id TEXT")
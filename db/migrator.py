@@ -0,0 +1,107 @@
+import importlib.util
+import os
+import re
+import sqlite3
+
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from core.logging import get_logger
+from core.errors import DatabaseError
+
+logger = get_logger("db_migrator")
+
+# e.g. 0001_reward_redemption_indexes.sql, or .py for migrations that have
+# to inspect the schema (a module defining migrate(db))
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.(?:sql|py)$")
+
+
+def split_statements(script: str) -> List[str]:
+    # Statements run one at a time: executescript() would commit the
+    # surrounding transaction
+    statements = []
+    buffer = ""
+    for piece in script.split(";"):
+        buffer += piece + ";"
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip()
+            if _has_sql(statement):
+                statements.append(statement)
+            buffer = ""
+
+    if _has_sql(buffer.rstrip(";")):
+        raise DatabaseError(f"Incomplete SQL statement: {buffer.strip()[:80]}")
+    return statements
+
+
+def _has_sql(text: str) -> bool:
+    lines = [line.split("--", 1)[0].strip() for line in text.splitlines()]
+    return any(line and line != ";" for line in lines)
+
+
+def _load_python_migration(path: Path) -> Callable:
+    spec = importlib.util.spec_from_file_location(f"db_migration_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not callable(getattr(module, "migrate", None)):
+        raise DatabaseError(f"Migration {path.name} does not define migrate(db)")
+    return module.migrate
+
+
+class Migrator:
+    def __init__(self, database, migrations_dir: Path):
+        self.db = database
+        self.migrations_dir = Path(migrations_dir)
+
+    def discover(self) -> List[Tuple[int, str, Path]]:
+        if not self.migrations_dir.is_dir():
+            return []
+
+        migrations = []
+        for name in os.listdir(self.migrations_dir):
+            match = MIGRATION_FILE.match(name)
+            if match:
+                migrations.append(
+                    (int(match.group(1)), match.group(2), self.migrations_dir / name))
+
+        migrations.sort()
+        versions = [version for version, _, _ in migrations]
+        if len(versions) != len(set(versions)):
+            raise DatabaseError(
+                f"Duplicate migration versions in {self.migrations_dir}")
+        return migrations
+
+    def current_version(self) -> int:
+        return self.db.fetchone("PRAGMA user_version")["user_version"]
+
+    def migrate(self) -> int:
+        current = self.current_version()
+        pending = [m for m in self.discover() if m[0] > current]
+
+        for version, name, path in pending:
+            try:
+                if path.suffix == ".py":
+                    run = _load_python_migration(path)
+                else:
+                    with open(path, 'r') as f:
+                        statements = split_statements(f.read())
+
+                    def run(database, statements=statements):
+                        for statement in statements:
+                            database.execute(statement)
+
+                # Each migration and its version bump commit together
+                with self.db.transaction():
+                    run(self.db)
+                    self.db.execute(f"PRAGMA user_version = {version}")
+            except Exception as e:
+                error_msg = f"Migration {version:04d}_{name} failed: {e}"
+                logger.error(error_msg)
+                raise DatabaseError(error_msg)
+
+            logger.info(f"Applied migration {version:04d}_{name}")
+
+        if pending:
+            logger.info(
+                f"Database schema migrated from version {current} to {pending[-1][0]}")
+        return len(pending)
@@ -0,0 +1,66 @@
+"""
+Registry of hot-path queries and an EXPLAIN QUERY PLAN check that flags
+full scans of tables expected to grow. Used by the test suite as a guard
+against queries losing their index as the schema evolves.
+"""
+
+import re
+
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+
+# Tables that grow with viewers / stream history
+DEFAULT_LARGE_TABLES = frozenset({
+    "users",
+    "reward_redemptions",
+    "twitch_bits",
+    "duels",
+    "user_toys",
+    "user_cards",
+})
+
+_hot_queries: Dict[str, Tuple[str, Tuple[Any, ...]]] = {}
+
+_TABLE_REFERENCE = re.compile(
+    r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|JOIN\b|LEFT\b|INNER\b|ORDER\b|GROUP\b|LIMIT\b)(\w+))?",
+    re.IGNORECASE)
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def register_hot_query(name: str, query: str, params: Iterable[Any] = ()) -> str:
+    _hot_queries[name] = (query, tuple(params))
+    return query
+
+
+def get_hot_queries() -> Dict[str, Tuple[str, Tuple[Any, ...]]]:
+    return dict(_hot_queries)
+
+
+def _table_aliases(query: str) -> Dict[str, str]:
+    aliases = {}
+    for table, alias in _TABLE_REFERENCE.findall(query):
+        aliases[table.lower()] = table.lower()
+        if alias:
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+
+def find_full_scans(database, queries: Optional[Dict[str, Tuple[str, Tuple[Any, ...]]]] = None,
+                    large_tables: Iterable[str] = DEFAULT_LARGE_TABLES) -> List[Dict[str, str]]:
+    large_tables = {table.lower() for table in large_tables}
+    queries = queries if queries is not None else _hot_queries
+
+    offenders = []
+    for name, (query, params) in queries.items():
+        aliases = _table_aliases(query)
+        for row in database.fetchall(f"EXPLAIN QUERY PLAN {query}", params):
+            match = _SCAN.match(row["detail"])
+            if not match:
+                continue
+            table = aliases.get(match.group(1).lower(), match.group(1).lower())
+            if table in large_tables:
+                offenders.append({
+                    "name": name,
+                    "table": table,
+                    "detail": row["detail"]
+                })
+    return offenders
@@ -0,0 +1,192 @@
+import os
+import sqlite3
+import threading
+import time
+
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+from core.config import config
+from core.logging import get_logger
+from core.errors import DatabaseError, handle_error
+from db.instrumentation import query_stats
+
+logger = get_logger("db_snapshot")
+
+
+class SnapshotManager:
+    """
+    Read-only copy of the live database for dashboards and reporting.
+    Analytical queries run against the copy so they never hold locks on
+    the file the bot writes to.
+    """
+
+    def __init__(self, database):
+        self.db = database
+        self.enabled = config.get_boolean('DB_SNAPSHOT_ENABLED', True)
+        self.max_age = config.get_int('DB_SNAPSHOT_MAX_AGE_SECONDS', 300)
+        self.pages_per_step = config.get_int('DB_BACKUP_PAGES_PER_STEP', 256)
+        self.step_sleep = config.get_float('DB_BACKUP_STEP_SLEEP', 0.005)
+        db_path = Path(database.db_path)
+        self.path = db_path.with_name(f"{db_path.stem}.snapshot{db_path.suffix}")
+        self._refreshed_at = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._connections = {}
+        self._connections_lock = threading.Lock()
+
+    def age(self) -> Optional[float]:
+        if self._refreshed_at is None:
+            if not self.path.exists():
+                return None
+            # Snapshot left by a previous run
+            self._refreshed_at = self.path.stat().st_mtime
+        return time.time() - self._refreshed_at
+
+    def is_stale(self) -> bool:
+        age = self.age()
+        return age is None or age > self.max_age
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            self._refresh_locked()
+
+    def _refresh_locked(self) -> None:
+        started = time.perf_counter()
+        temp_path = f"{self.path}.part"
+        try:
+            # Stepped copy off the live file first, so writers are only
+            # blocked one step at a time
+            self.db.copy_to(temp_path, pages=self.pages_per_step,
+                            sleep=self.step_sleep)
+
+            # Then a local copy over the snapshot; open read-only connections
+            # see the new pages on their next query without reconnecting
+            source = sqlite3.connect(temp_path)
+            target = sqlite3.connect(self.path, timeout=30.0)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+        except (sqlite3.Error, OSError) as e:
+            error_msg = f"Error refreshing database snapshot: {e}"
+            logger.error(error_msg)
+            raise DatabaseError(error_msg)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self._refreshed_at = time.time()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.debug(f"Database snapshot refreshed in {elapsed_ms:.0f}ms")
+
+    def ensure_fresh(self) -> None:
+        if not self.is_stale():
+            return
+
+        if self.path.exists():
+            # Serve the stale copy while a new one is taken behind it, so no
+            # reader waits for the full copy
+            self._refresh_in_background()
+            return
+
+        with self._refresh_lock:
+            # Nothing to read yet; another thread may have made it meanwhile
+            if not self.is_stale():
+                return
+            self._refresh_locked()
+
+    def _refresh_in_background(self) -> None:
+        # Held by the worker until it finishes; a refresh already running
+        # covers this request too
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                if self.is_stale():
+                    self._refresh_locked()
+            except DatabaseError as e:
+                # A stale snapshot is still better than reading the live file
+                handle_error(e, {"context": "snapshot_refresh"})
+            finally:
+                self._refresh_lock.release()
+
+        try:
+            thread = threading.Thread(
+                target=run, daemon=True, name="DatabaseSnapshotRefresh")
+            thread.start()
+        except Exception:
+            self._refresh_lock.release()
+            raise
+        self._refresh_thread = thread
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        thread = self._refresh_thread
+        if thread:
+            thread.join(timeout)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        thread_id = threading.get_ident()
+
+        with self._connections_lock:
+            conn = self._connections.get(thread_id)
+            if conn is None:
+                try:
+                    conn = sqlite3.connect(
+                        f"{self.path.resolve().as_uri()}?mode=ro",
+                        uri=True,
+                        check_same_thread=False,
+                        isolation_level=None,
+                        timeout=30.0
+                    )
+                    conn.row_factory = sqlite3.Row
+                    self._connections[thread_id] = conn
+                except sqlite3.Error as e:
+                    error_msg = f"Error opening database snapshot: {e}"
+                    logger.error(error_msg)
+                    raise DatabaseError(error_msg)
+            return conn
+
+    def execute(self, query: str, params: Union[Dict[str, Any], List[Any], Tuple[Any, ...]] = None,
+                record_stats: bool = True) -> sqlite3.Cursor:
+        self.ensure_fresh()
+        conn = self._get_connection()
+
+        started = time.perf_counter()
+        try:
+            if params is None:
+                return conn.execute(query)
+            return conn.execute(query, params)
+        except sqlite3.Error as e:
+            error_msg = f"Error executing snapshot query: {e}"
+            logger.error(error_msg)
+            raise DatabaseError(error_msg)
+        finally:
+            if record_stats and query_stats.active:
+                query_stats.record(
+                    query, params, time.perf_counter() - started)
+
+    def start_schedule(self, interval_seconds: int) -> None:
+        if interval_seconds <= 0:
+            return
+
+        from utils.scheduler import scheduler
+        scheduler.add_interval_job(
+            "db_snapshot", self.refresh, interval_seconds)
+
+    def stop_schedule(self) -> None:
+        from utils.scheduler import scheduler
+        scheduler.remove_job("db_snapshot")
+
+    def close_all(self) -> None:
+        # Don't pull the file out from under a refresh still copying
+        self.wait_for_refresh(timeout=30)
+        with self._connections_lock:
+            for conn in self._connections.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
@@ -184,6 +184,8 @@ class TwitchChannelPointRedemptionEvent(TwitchEvent):
     def _handle(self):
         return {
             "type": "twitch_channel_point_redemption",
+            "id": self.data.get("id"),
+            "message_id": self.data.get("message_id"),
             "user": self.data["user"],
             "channel": self.data["channel"],
             "reward": self.data["reward"],
@@ -4,7 +4,6 @@ import sys
 import threading
 import time
 import asyncio
-import json
 
 
 from core.config import config
@@ -15,10 +14,10 @@ from event_bus.registry import event_registry
 from publishers.twitch_pub import twitch_pub
 from subscribers.twitch_sub import twitch_sub
 from utils.channel_points_service import channel_points_service
-from utils.reward_service import reward_service
 from processors.command_parser import command_parser
-# Import command registry (which auto-loads commands)
+from commands import load_commands
 from commands.registry import command_registry
+from utils.startup import StartupGraph
 
 # Import twitch event types
 from events.twitch import (
@@ -83,65 +82,11 @@ class BetsyBot:
             logger.info("Starting Betsy...")
             self.running = True
 
-            # Set up command parser
-            command_parser.set_prefix(config.get('BOT_PREFIX', '!'))
+            from db.database import db
+            db.migrate()
 
-            # Set up channel point handlers
-            self.setup_channel_point_handlers()
-
-            # Set up rewards
-            self.setup_rewards()
-            from utils.reward_sync import reward_sync
-            # Get all channel rewards when bot starts
-            if config.get_boolean('TWITCH_ENABLED', True):
-                logger.info("Initial sync of Twitch rewards...")
-                added, updated, failed = reward_sync.sync_all_rewards()
-                logger.info(
-                    f"Rewards sync complete: {added} added, {updated} updated, {failed} failed")
-
-            # Subscribe to events
-            logger.info("Setting up event subscriptions...")
-            twitch_sub.subscribe()
-
-            # Subscribe to shutdown event
-            event_bus.subscribe("bot_shutdown", lambda _: self.shutdown())
-
-            # Set up asyncio exception handling
-            try:
-                asyncio.get_running_loop().set_exception_handler(self._handle_async_exception)
-            except RuntimeError:
-                # Fallback for when no loop is running
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.set_exception_handler(self._handle_async_exception)
-
-            # Start Twitch connection
-            if config.get_boolean('TWITCH_ENABLED', True):
-                logger.info("Registering Twitch event callbacks...")
-                twitch_pub.register_event_callback("ready",
-                                                   lambda data: event_registry.create_and_publish_event("twitch_ready", data))
-                twitch_pub.register_message_callback(
-                    self._handle_twitch_message)
-                twitch_pub.register_event_callback("join",
-                                                   lambda data: event_registry.create_and_publish_event("twitch_join", data))
-                twitch_pub.register_event_callback("part",
-                                                   lambda data: event_registry.create_and_publish_event("twitch_part", data))
-                twitch_pub.register_event_callback("subscription",
-                                                   lambda data: event_registry.create_and_publish_event("twitch_subscription", data))
-                twitch_pub.register_event_callback("subscription_gift",
-                                                   lambda data: event_registry.create_and_publish_event("twitch_subscription_gift", data))
-                twitch_pub.register_event_callback("bits",
-                                                   lambda data: event_registry.create_and_publish_event("twitch_bits", data))
-                twitch_pub.register_event_callback("follow",
-                                                   lambda data: event_registry.create_and_publish_event("twitch_follow", data))
-                twitch_pub.register_event_callback("raid",
-                                                   lambda data: event_registry.create_and_publish_event("twitch_raid", data))
-                twitch_pub.register_event_callback("channel_point_redemption",
-                                                   lambda data: event_registry.create_and_publish_event("twitch_channel_point_redemption", data))
-
-                logger.info("Connecting to Twitch...")
-                twitch_pub._connect()
-                logger.info("Twitch connection initiated")
+            self.startup = self.build_startup_graph()
+            self.startup.run()
 
             # Keep the main thread alive
             while self.running:
@@ -159,6 +104,164 @@ class BetsyBot:
             handle_error(BetsyError(f"Error starting bot: {str(e)}"))
             self.shutdown()
 
+    def build_startup_graph(self) -> StartupGraph:
+        """
+        Chat comes up first: event wiring and the Twitch connection are the
+        only phases ahead of it. Everything that talks to Helix or only
+        matters later runs in the background.
+        """
+        twitch_enabled = config.get_boolean('TWITCH_ENABLED', True)
+        graph = StartupGraph()
+
+        graph.add_phase("event_wiring", self._start_event_wiring, critical=True)
+        if twitch_enabled:
+            graph.add_phase("twitch_connect", self._start_twitch_connection,
+                            depends_on=["event_wiring"], critical=True)
+        # Runs while the IRC handshake is in flight
+        graph.add_phase("commands", load_commands, depends_on=["event_wiring"])
+        graph.add_phase("rewards", self._start_rewards)
+
+        if twitch_enabled:
+            graph.add_phase("chat_ready", self._wait_for_chat,
+                            depends_on=["twitch_connect"], background=True)
+            graph.add_phase("twitch_auth", self._start_token_maintenance, background=True)
+            graph.add_phase("reward_sync", self._start_reward_sync,
+                            depends_on=["rewards", "twitch_auth"], background=True)
+            graph.add_phase("redemption_backfill", self._start_redemption_backfill,
+                            depends_on=["rewards", "twitch_auth"], background=True)
+            graph.add_phase("stream_state", self._start_stream_state,
+                            depends_on=["twitch_auth"], background=True)
+        graph.add_phase("reward_config", self._start_reward_config,
+                        depends_on=["rewards"], background=True)
+        graph.add_phase("maintenance", self._start_maintenance, background=True)
+        graph.add_phase("cache_warmup", self._warm_caches, background=True)
+        return graph
+
+    def _start_event_wiring(self):
+        # Set up command parser
+        command_parser.set_prefix(config.get('BOT_PREFIX', '!'))
+
+        # Subscribe to events
+        logger.info("Setting up event subscriptions...")
+        twitch_sub.subscribe()
+
+        # Subscribe to shutdown event
+        event_bus.subscribe("bot_shutdown", lambda _: self.shutdown())
+
+        # Set up asyncio exception handling
+        try:
+            asyncio.get_running_loop().set_exception_handler(self._handle_async_exception)
+        except RuntimeError:
+            # Fallback for when no loop is running
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.set_exception_handler(self._handle_async_exception)
+
+    def _start_twitch_connection(self):
+        logger.info("Registering Twitch event callbacks...")
+        twitch_pub.register_event_callback("ready",
+                                           lambda data: event_registry.create_and_publish_event("twitch_ready", data))
+        twitch_pub.register_message_callback(
+            self._handle_twitch_message)
+        twitch_pub.register_event_callback("join",
+                                           lambda data: event_registry.create_and_publish_event("twitch_join", data))
+        twitch_pub.register_event_callback("part",
+                                           lambda data: event_registry.create_and_publish_event("twitch_part", data))
+        twitch_pub.register_event_callback("subscription",
+                                           lambda data: event_registry.create_and_publish_event("twitch_subscription", data))
+        twitch_pub.register_event_callback("subscription_gift",
+                                           lambda data: event_registry.create_and_publish_event("twitch_subscription_gift", data))
+        twitch_pub.register_event_callback("bits",
+                                           lambda data: event_registry.create_and_publish_event("twitch_bits", data))
+        twitch_pub.register_event_callback("follow",
+                                           lambda data: event_registry.create_and_publish_event("twitch_follow", data))
+        twitch_pub.register_event_callback("raid",
+                                           lambda data: event_registry.create_and_publish_event("twitch_raid", data))
+        twitch_pub.register_event_callback("channel_point_redemption",
+                                           lambda data: event_registry.create_and_publish_event("twitch_channel_point_redemption", data))
+
+        logger.info("Connecting to Twitch...")
+        twitch_pub._connect()
+        logger.info("Twitch connection initiated")
+
+    def _wait_for_chat(self):
+        if not twitch_pub.wait_until_ready(config.get_float('STARTUP_CHAT_TIMEOUT_SECONDS', 30.0)):
+            raise BetsyError("Twitch chat not ready before startup timeout")
+
+    def _start_rewards(self):
+        # Set up channel point handlers
+        self.setup_channel_point_handlers()
+
+        # Redemptions read rewards, with their compiled handlers, from memory
+        # from here on
+        self.setup_rewards()
+
+    def _start_reward_config(self):
+        # Applies REWARD_CONFIG_PATH now and again whenever the file changes
+        from config.reward_config import reward_config_watcher, load_reward_config
+        if config.get_boolean('REWARD_CONFIG_WATCH', True):
+            reward_config_watcher.start()
+        else:
+            load_reward_config()
+
+    def _start_token_maintenance(self):
+        from utils.twitch_auth import token_manager
+        token_manager.start()
+        # Validate up front so the first API call doesn't pay for it
+        token_manager.get_token("broadcaster")
+
+    def _start_reward_sync(self):
+        from utils.reward_sync import reward_sync
+        logger.info("Initial sync of Twitch rewards...")
+        report = reward_sync.sync_all_rewards()
+        logger.info(f"Rewards sync complete: {report.summary()}")
+        reward_sync.setup_auto_sync(
+            config.get_int('REWARD_SYNC_INTERVAL_MINUTES', 60))
+
+    def _start_redemption_backfill(self):
+        # Picks up redemptions made while we were offline, then again after
+        # every chat reconnect
+        from utils.redemption_backfill import redemption_backfill
+        redemption_backfill.start(
+            config.get_int('REDEMPTION_BACKFILL_INTERVAL_MINUTES', 15))
+
+    def _start_stream_state(self):
+        # Live/offline and start time for {uptime}, kept off the chat thread
+        from utils.stream_state import stream_state
+        stream_state.start()
+
+    def _start_maintenance(self):
+        # Periodic maintenance runs on the shared scheduler, off the hot path
+        from utils.scheduler import scheduler
+        from db.archive import redemption_archive
+        from db.database import db
+        from utils.counter_service import counter_service
+        counter_service.start()
+        scheduler.add_interval_job(
+            "redemption_archive", redemption_archive.run, 24 * 60 * 60, run_immediately=True)
+        scheduler.add_cron_job(
+            "db_optimize", db.optimize, config.get('DB_OPTIMIZE_CRON', '0 5 * * *'))
+
+        # Scheduled online backups (0 disables)
+        from db.backup import backup_manager
+        backup_manager.start_schedule(
+            config.get_int('DB_BACKUP_INTERVAL_MINUTES', 0))
+
+        # Keep the analytics snapshot warm (0 refreshes lazily on read)
+        db.snapshot.start_schedule(
+            config.get_int('DB_SNAPSHOT_REFRESH_SECONDS', 0))
+
+    def _warm_caches(self):
+        # Pull the pages and statements behind the hot queries into cache
+        # before the first chat message needs them
+        from db.database import db
+        from db.query_plan import get_hot_queries
+        for name, (query, params) in get_hot_queries().items():
+            try:
+                db.fetchone(query, params)
+            except Exception as e:
+                logger.debug(f"Cache warm-up of {name} failed: {e}")
+
     def _handle_async_exception(self, loop, context):
         exception = context.get('exception')
         if isinstance(exception, asyncio.CancelledError):
@@ -180,6 +283,10 @@ class BetsyBot:
         logger.info("Shutting down Betsy...")
         self.running = False
 
+        # Cancel pending maintenance; a job already running finishes first
+        from utils.scheduler import scheduler
+        scheduler.shutdown()
+
         # Disconnect from Twitch
         if twitch_pub.is_connected():
             logger.info("Disconnecting from Twitch...")
@@ -188,6 +295,26 @@ class BetsyBot:
             except Exception as e:
                 logger.error(f"Error during Twitch disconnection: {str(e)}")
 
+        # Let background reward handlers finish
+        channel_points_service.shutdown()
+
+        # Send queued redemption status changes before the session closes
+        from utils.redemption_status_queue import redemption_status_queue
+        redemption_status_queue.stop()
+
+        from utils.helix_client import helix_client
+        helix_client.close()
+
+        # Write usage counts still held in memory
+        from utils.counter_service import counter_service
+        counter_service.stop()
+
+        # Let queued async database work finish
+        from db.database import db
+        from db.instrumentation import query_stats
+        db.close_async()
+        query_stats.log_summary()
+
         logger.info("Shutdown complete")
 
     def handle_shutdown(self, signum, frame):
@@ -241,30 +368,13 @@ class BetsyBot:
 
     def setup_rewards(self):
         try:
-            # Load rewards from the service
-            rewards = reward_service.get_all_rewards()
-
-            for reward in rewards:
-                reward_id = reward["reward_id"]
-                handler_type = reward.get("handler_type", "default")
-
-                if handler_type != "default":
-                    handler_config = None
-                    if reward.get("handler_config"):
-                        try:
-                            handler_config = json.loads(
-                                reward["handler_config"])
-                        except json.JSONDecodeError:
-                            logger.warning(
-                                f"Invalid JSON in handler_config for reward {reward_id}")
-                            pass
-
-                    reward_service.register_handler(
-                        reward_id, handler_type, handler_config)
-
-            logger.info(f"Initialized {len(rewards)} channel point rewards")
-        except ImportError as e:
-            logger.error(f"Failed to import reward modules: {e}")
+            from utils.reward_catalog import reward_catalog
+            reward_catalog.load()
+
+            rewards = reward_catalog.all()
+            handled = sum(1 for reward in rewards.values() if reward.handler is not None)
+            logger.info(
+                f"Initialized {len(rewards)} channel point rewards ({handled} with handlers)")
         except Exception as e:
             logger.error(f"Failed to setup rewards: {e}")
             handle_error(BetsyError(f"Error setting up rewards: {str(e)}"))
@@ -8,7 +8,8 @@ from typing import Dict, Any, Callable, List, Optional
 
 from utils.platform_connections import PlatformConnection, SingletonMeta
 from utils.string_utils import sanitise_for_logging
-from utils.user_service import enrich_user_data
+from utils.user_service import aenrich_user_data
+from utils.twitch_auth import token_manager
 from core.config import config, ConfigurationError
 from core.logging import get_logger
 from core.errors import NetworkError, TwitchError, handle_error
@@ -19,7 +20,6 @@ logger = get_logger("twitch_pub")
 class TwitchConnector(PlatformConnection, metaclass=SingletonMeta):
     def __init__(self):
         super().__init__()
-        self.token = config.get('TMI_TOKEN')
         self.client_id = config.get('CLIENT_ID')
         self.nick = config.get('BOT_NICK')
         self.channel = config.get('CHANNEL')
@@ -30,8 +30,25 @@ class TwitchConnector(PlatformConnection, metaclass=SingletonMeta):
         self.enabled = config.get_boolean('TWITCH_ENABLED', True)
         self.event_callbacks: Dict[str, List[Callable]] = {}
         self.message_callbacks: List[Callable] = []
-        self._lock = threading.Lock()
+        # Re-entrant: _reconnect holds it across _connect
+        self._lock = threading.RLock()
         self._ready = threading.Event()
+        token_manager.on_refresh(self._on_token_refresh)
+
+    @property
+    def token(self) -> Optional[str]:
+        # Shared with the API client and read when a Bot is created. Not
+        # validated here so chat isn't held up by it
+        return token_manager.peek_token("chat")
+
+    def _on_token_refresh(self, name: str, access_token: str) -> None:
+        # twitchio keeps the token it connected with, for its own reconnects
+        # too, so move the live connection over before the old one expires
+        if name != "chat" or not self.enabled or not self.bot:
+            return
+        logger.info("Chat token refreshed, reconnecting with the new token")
+        threading.Thread(target=self._reconnect, daemon=True,
+                         name="TwitchTokenReconnect").start()
 
     def _connect(self):
         if not self.enabled:
@@ -96,7 +113,7 @@ class TwitchConnector(PlatformConnection, metaclass=SingletonMeta):
                         }
 
                         # Enrich with database information (for things like bot_admin)
-                        message_data["author"] = enrich_user_data(
+                        message_data["author"] = await aenrich_user_data(
                             message_data["author"])
 
                         # Check if this is a channel point redemption
@@ -106,6 +123,7 @@ class TwitchConnector(PlatformConnection, metaclass=SingletonMeta):
 
                             # Create the channel point redemption event data
                             redemption_data = {
+                                "message_id": message_data["id"],
                                 "user": message_data["author"],
                                 "channel": message_data["channel"],
                                 "reward": {
@@ -227,6 +245,7 @@ class TwitchConnector(PlatformConnection, metaclass=SingletonMeta):
 
                             # Create the channel point redemption event data
                             redemption_data = {
+                                "id": data.id if hasattr(data, 'id') else None,
                                 "user": user_data,
                                 "channel": data.broadcaster.name if hasattr(data, 'broadcaster') and hasattr(data.broadcaster, 'name') else "unknown",
                                 "reward": reward_data,
@@ -318,6 +337,9 @@ class TwitchConnector(PlatformConnection, metaclass=SingletonMeta):
     def is_connected(self):
         return self.bot is not None and self._ready.is_set()
 
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
     def register_event_callback(self, event_type: str, callback: Callable):
         with self._lock:
             if event_type not in self.event_callbacks:
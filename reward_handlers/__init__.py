@@ -0,0 +1,29 @@
+import importlib
+import inspect
+from pathlib import Path
+
+from core.logging import get_logger
+from reward_handlers.base import BaseRewardHandler
+from reward_handlers.registry import handler_type_registry
+
+logger = get_logger("reward_handlers")
+
+
+def discover_handler_types() -> None:
+    handlers_dir = Path(__file__).parent
+
+    # Skip special files
+    skip_files = {"__init__.py", "base.py", "registry.py"}
+
+    for entry in handlers_dir.iterdir():
+        if entry.is_file() and entry.suffix == ".py" and entry.name not in skip_files:
+            try:
+                module = importlib.import_module(f"reward_handlers.{entry.stem}")
+
+                # Find handler classes defined in the module
+                for name, obj in inspect.getmembers(module, inspect.isclass):
+                    if (issubclass(obj, BaseRewardHandler) and obj is not BaseRewardHandler
+                            and obj.__module__ == module.__name__):
+                        handler_type_registry.register_type(obj)
+            except Exception as e:
+                logger.error(f"Error loading reward handlers from {entry.name}: {e}")
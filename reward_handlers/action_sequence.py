@@ -0,0 +1,26 @@
+from typing import Dict, Any, Mapping
+
+from reward_handlers.base import BaseRewardHandler, INLINE
+
+
+class ActionSequenceHandler(BaseRewardHandler):
+    handler_type = "action_sequence"
+    description = "Triggers an action sequence"
+    latency = INLINE
+
+    def compile(self, config: Mapping[str, Any]) -> None:
+        self.action_sequence_id = self.require(config, "action_sequence_id", int)
+
+    def handle(self, redemption_data: Dict[str, Any]) -> bool:
+        values = self.template_values(redemption_data)
+        self.event_bus.publish("trigger_action_sequence", {
+            "action_sequence_id": self.action_sequence_id,
+            "source": "channel_point",
+            "user": values["username"],
+            "data": {
+                "reward_title": values["reward"],
+                "reward_id": self.reward_id,
+                "user_input": values["input"]
+            }
+        })
+        return True
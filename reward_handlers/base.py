@@ -0,0 +1,68 @@
+from typing import Dict, Any, Mapping
+
+from core.errors import ValidationError
+from core.logging import get_logger
+from event_bus.bus import event_bus
+
+logger = get_logger("reward_handlers")
+
+INLINE = "inline"
+BACKGROUND = "background"
+
+
+class BaseRewardHandler:
+    """
+    A handler type compiles a reward's handler_config once, when the reward
+    is loaded into the catalog. Calling the compiled handler with the
+    redemption data runs it; latency says whether that is cheap enough to
+    run on the event thread (inline) or should go to a worker (background).
+    """
+
+    handler_type = ""
+    description = ""
+    latency = INLINE
+
+    def __init__(self, reward_id: str, config: Mapping[str, Any]):
+        self.reward_id = reward_id
+        self.event_bus = event_bus
+        self.compile(config)
+
+    def compile(self, config: Mapping[str, Any]) -> None:
+        """Validates config and precomputes everything handle() needs."""
+
+    def handle(self, redemption_data: Dict[str, Any]) -> bool:
+        raise NotImplementedError("Reward handler must implement handle method")
+
+    def __call__(self, redemption_data: Dict[str, Any]) -> bool:
+        return self.handle(redemption_data)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.handler_type} for {self.reward_id}>"
+
+    @staticmethod
+    def require(config: Mapping[str, Any], key: str, kind: type = str) -> Any:
+        value = config.get(key)
+        if value is None or value == "":
+            raise ValidationError(f"Missing required handler_config field: {key}")
+        if kind is int:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                raise ValidationError(f"handler_config field {key} must be a number")
+        if not isinstance(value, kind):
+            raise ValidationError(f"handler_config field {key} must be a {kind.__name__}")
+        return value
+
+    @staticmethod
+    def template_values(redemption_data: Dict[str, Any]) -> Dict[str, Any]:
+        user = redemption_data.get("user", {})
+        reward = redemption_data.get("reward", {})
+        username = user.get("name", "unknown")
+        return {
+            "username": username,
+            "user": username,
+            "display_name": user.get("display_name") or username,
+            "input": redemption_data.get("input", ""),
+            "reward": reward.get("title", "Unknown Reward"),
+            "cost": reward.get("cost", 0)
+        }
@@ -0,0 +1,33 @@
+from typing import Dict, Any, Mapping
+
+from reward_handlers.base import BaseRewardHandler, BACKGROUND, logger
+from utils.templates import compile_template
+
+
+class CommandHandler(BaseRewardHandler):
+    """Runs a chat command as the redeeming viewer, e.g. a !so on redeem."""
+
+    handler_type = "command"
+    description = "Runs a chat command as the redeeming user"
+    latency = BACKGROUND
+
+    def compile(self, config: Mapping[str, Any]) -> None:
+        self.command = self.require(config, "command").lstrip("!").lower()
+        # Defaults to passing the viewer's input through as the arguments
+        self.args = compile_template(config.get("args", "{input}"))
+
+    def handle(self, redemption_data: Dict[str, Any]) -> bool:
+        from commands.registry import command_registry
+
+        if not command_registry.has_command(self.command):
+            logger.warning(f"Reward {self.reward_id} runs unknown command !{self.command}")
+            return False
+
+        command_registry.handle_command({
+            "command": self.command,
+            "args": self.args.render(self.template_values(redemption_data)),
+            "user": redemption_data.get("user", {}),
+            "channel": redemption_data.get("channel"),
+            "source": "channel_point"
+        })
+        return True
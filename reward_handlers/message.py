@@ -0,0 +1,66 @@
+from typing import Dict, Any, Mapping, Optional
+
+from core.errors import ValidationError
+from reward_handlers.base import BaseRewardHandler, INLINE
+from utils.templates import compile_template
+
+
+class MessageHandler(BaseRewardHandler):
+    handler_type = "message"
+    description = "Sends a chat message rendered from a template"
+    latency = INLINE
+
+    def compile(self, config: Mapping[str, Any]) -> None:
+        source = config.get("template", config.get("message_template"))
+        if not isinstance(source, str) or not source:
+            raise ValidationError("Missing required handler_config field: template")
+        self.template = compile_template(source)
+        self.channel: Optional[str] = config.get("channel")
+
+    def handle(self, redemption_data: Dict[str, Any]) -> bool:
+        channel = self.channel or redemption_data.get("channel", "")
+        if not channel:
+            return False
+        self.event_bus.publish("send_twitch_message", {
+            "channel": channel,
+            "content": self.template.render(self.template_values(redemption_data))
+        })
+        return True
+
+
+class CustomHandler(BaseRewardHandler):
+    """The original combined type: an optional message and/or action sequence."""
+
+    handler_type = "custom"
+    description = "Optional chat message plus optional action sequence"
+    latency = INLINE
+
+    def compile(self, config: Mapping[str, Any]) -> None:
+        source = config.get("message_template")
+        self.template = compile_template(source) if source else None
+        self.action_sequence_id = config.get("action_sequence_id")
+        if self.template is None and self.action_sequence_id is None:
+            raise ValidationError(
+                "custom handler needs message_template or action_sequence_id")
+
+    def handle(self, redemption_data: Dict[str, Any]) -> bool:
+        values = self.template_values(redemption_data)
+        channel = redemption_data.get("channel", "")
+        if self.template and channel:
+            self.event_bus.publish("send_twitch_message", {
+                "channel": channel,
+                "content": self.template.render(values)
+            })
+
+        if self.action_sequence_id is not None:
+            self.event_bus.publish("trigger_action_sequence", {
+                "action_sequence_id": self.action_sequence_id,
+                "source": "channel_point",
+                "user": values["username"],
+                "data": {
+                    "reward_title": values["reward"],
+                    "reward_id": self.reward_id,
+                    "user_input": values["input"]
+                }
+            })
+        return True
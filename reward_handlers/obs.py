@@ -0,0 +1,42 @@
+from typing import Dict, Any, Mapping
+
+from core.errors import ValidationError
+from reward_handlers.base import BaseRewardHandler, BACKGROUND
+from utils.templates import compile_template
+
+
+class OBSHandler(BaseRewardHandler):
+    """
+    Publishes an obs_request event (an OBS WebSocket request type plus its
+    data) for the OBS subscriber to send. String values in data may use the
+    redemption template variables.
+    """
+
+    handler_type = "obs"
+    description = "Sends an OBS WebSocket request"
+    latency = BACKGROUND
+
+    def compile(self, config: Mapping[str, Any]) -> None:
+        self.request = self.require(config, "request")
+        data = config.get("data", {})
+        if not isinstance(data, Mapping):
+            raise ValidationError("handler_config field data must be an object")
+        self.static_data = {key: value for key, value in data.items()
+                            if not (isinstance(value, str) and "{" in value)}
+        self.templated_data = {key: compile_template(value) for key, value in data.items()
+                               if isinstance(value, str) and "{" in value}
+
+    def handle(self, redemption_data: Dict[str, Any]) -> bool:
+        data = dict(self.static_data)
+        if self.templated_data:
+            values = self.template_values(redemption_data)
+            for key, template in self.templated_data.items():
+                data[key] = template.render(values)
+
+        self.event_bus.publish("obs_request", {
+            "request": self.request,
+            "data": data,
+            "source": "channel_point",
+            "reward_id": self.reward_id
+        })
+        return True
@@ -0,0 +1,42 @@
+from typing import Dict, Any, Mapping
+
+from reward_handlers.base import BaseRewardHandler, BACKGROUND, logger
+from utils.templates import compile_template
+
+
+class PointsHandler(BaseRewardHandler):
+    """Converts channel points into bot points for the redeeming viewer."""
+
+    handler_type = "points"
+    description = "Adds bot points to the redeeming user"
+    latency = BACKGROUND
+
+    def compile(self, config: Mapping[str, Any]) -> None:
+        self.amount = self.require(config, "amount", int)
+        source = config.get("message_template")
+        self.template = compile_template(source) if source else None
+
+    def handle(self, redemption_data: Dict[str, Any]) -> bool:
+        from db.database import db
+
+        user_id = redemption_data.get("user", {}).get("id")
+        if not user_id:
+            return False
+
+        # record_redemption has already created the user row
+        cursor = db.execute(
+            "UPDATE users SET points = points + ? WHERE twitch_user_id = ?",
+            (self.amount, user_id))
+        if not cursor.rowcount:
+            logger.warning(f"No user {user_id} to give {self.amount} points to")
+            return False
+
+        channel = redemption_data.get("channel", "")
+        if self.template and channel:
+            values = self.template_values(redemption_data)
+            values["amount"] = self.amount
+            self.event_bus.publish("send_twitch_message", {
+                "channel": channel,
+                "content": self.template.render(values)
+            })
+        return True
@@ -0,0 +1,63 @@
+import threading
+
+from typing import Dict, Any, Mapping, Optional, Type
+
+from core.errors import ValidationError
+from core.logging import get_logger
+from reward_handlers.base import BaseRewardHandler
+
+logger = get_logger("reward_handler_registry")
+
+# Rewards with these types just trigger their action sequence
+PASSTHROUGH_TYPES = ("", "default")
+
+
+class HandlerTypeRegistry:
+    def __init__(self):
+        self.types: Dict[str, Type[BaseRewardHandler]] = {}
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def register_type(self, handler_class: Type[BaseRewardHandler]) -> None:
+        handler_type = handler_class.handler_type.lower()
+        if not handler_type:
+            logger.warning(
+                f"Reward handler {handler_class.__name__} has no handler_type, skipping")
+            return
+        self.types[handler_type] = handler_class
+        logger.debug(f"Registered reward handler type: {handler_type}")
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        # Other threads wait here until every handler module is imported
+        with self._load_lock:
+            if not self._loaded:
+                from reward_handlers import discover_handler_types
+                discover_handler_types()
+                self._loaded = True
+
+    def has_type(self, handler_type: str) -> bool:
+        self._ensure_loaded()
+        return (handler_type or "").lower() in self.types
+
+    def compile(self, reward_id: str, handler_type: Optional[str],
+                config: Mapping[str, Any]) -> Optional[BaseRewardHandler]:
+        """
+        Builds the executable handler for a reward. Returns None for
+        passthrough types; raises ValidationError for unknown types or bad
+        config.
+        """
+        handler_type = (handler_type or "").lower()
+        if handler_type in PASSTHROUGH_TYPES:
+            return None
+
+        self._ensure_loaded()
+        handler_class = self.types.get(handler_type)
+        if handler_class is None:
+            raise ValidationError(f"Unsupported handler type: {handler_type}")
+        return handler_class(reward_id, config or {})
+
+
+# Singleton instance
+handler_type_registry = HandlerTypeRegistry()
@@ -46,6 +46,10 @@ class TwitchEventHandler:
             content = data.get("content", "")
             logger.info(f"[{username}]: {content}")
 
+            # Feeds {random_chatter}
+            from utils.chatters import chatters
+            chatters.seen(username)
+
             # Additional message processing logic can be added here
         except Exception as e:
             handle_error(e, {"event": "twitch_message", "data": data})
@@ -132,6 +136,9 @@ class TwitchEventHandler:
             count = data.get("count", 1)
             sub_plan = data.get("sub_plan", "")
             recipients = data.get("recipients", [])
+            if recipients:
+                from utils.user_service import complete_users
+                complete_users(recipients)
 
             sub_plan_name = "Tier 1"
             if sub_plan == "2000":
@@ -153,7 +160,7 @@ class TwitchEventHandler:
                 if count == 1 and recipients:
                     self._send_message({
                         "channel": self.channel,
-                        "content": f"Thanks for gifting a {tier_text}sub to {recipients[0].get('name', 'someone')}, @{gifter_name}!"
+                        "content": f"Thanks for gifting a {tier_text}sub to {recipients[0].get('display_name') or recipients[0].get('name', 'someone')}, @{gifter_name}!"
                     })
                 else:
                     self._send_message({
@@ -186,21 +193,16 @@ class TwitchEventHandler:
                 })
 
             # Check if we need to trigger any actions based on bits amount
-            from db.database import db
+            from utils.bits_service import get_bits_action
+            from utils.counter_service import counter_service
             try:
-                bits_action = db.fetchone(
-                    "SELECT action_sequence_id FROM twitch_bits WHERE bits = ?",
-                    (bits_used,)
-                )
+                bits_action = get_bits_action(bits_used)
 
                 if bits_action and bits_action.get('action_sequence_id'):
                     logger.info(
                         f"Found action sequence {bits_action['action_sequence_id']} for {bits_used} bits")
                     # Update the bits usage counter
-                    db.execute(
-                        "UPDATE twitch_bits SET uses = uses + 1 WHERE bits = ?",
-                        (bits_used,)
-                    )
+                    counter_service.increment("twitch_bits", "uses", "bits", bits_used)
 
                     # TODO: Trigger the action sequence
                     # This would be handled by the OBS connector/subscriber
@@ -232,6 +234,8 @@ class TwitchEventHandler:
     def _handle_raid(self, data: Dict[str, Any]):
         try:
             raider = data.get("raider", {})
+            from utils.user_service import complete_users
+            complete_users([raider])
             raider_name = raider.get("name", "unknown")
             channel = data.get("channel", "unknown")
             viewer_count = data.get("viewer_count", 0)
@@ -0,0 +1,10 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Keep the suite off the tracked db/bot.db: anything that imports the shared
+# db singleton gets a scratch database instead
+_scratch_dir = tempfile.mkdtemp(prefix="betsy-tests-")
+os.environ["DB_PATH"] = os.path.join(_scratch_dir, "bot.db")
+atexit.register(shutil.rmtree, _scratch_dir, ignore_errors=True)
@@ -0,0 +1,58 @@
+# tests/bench_db_create.py
+# Times cold creation of the bot database from schema.sql + seed.sql and the
+# bulk seeding path. Run directly: python tests/bench_db_create.py
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from db.database import Database
+
+RUNS = int(os.environ.get("BENCH_RUNS", "10"))
+SEED_ROWS = int(os.environ.get("BENCH_SEED_ROWS", "5000"))
+
+
+def time_cold_create():
+    timings = []
+    for _ in range(RUNS):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            started = time.perf_counter()
+            database = Database(os.path.join(temp_dir, "bot.db"))
+            timings.append((time.perf_counter() - started) * 1000)
+            database.close_all()
+    return timings
+
+
+def time_bulk_seed():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database = Database(os.path.join(temp_dir, "bot.db"))
+        records = [{"name": f"bench_toy_{i}", "cost": i, "date_added": "now"}
+                   for i in range(SEED_ROWS)]
+
+        started = time.perf_counter()
+        inserted = database.safe_seed("toys", "name", records)
+        first = (time.perf_counter() - started) * 1000
+
+        # Second pass is all duplicates
+        started = time.perf_counter()
+        database.safe_seed("toys", "name", records)
+        second = (time.perf_counter() - started) * 1000
+
+        database.close_all()
+        return inserted, first, second
+
+
+if __name__ == "__main__":
+    timings = time_cold_create()
+    print(f"Cold create ({RUNS} runs): median {statistics.median(timings):.1f}ms, "
+          f"min {min(timings):.1f}ms, max {max(timings):.1f}ms")
+
+    inserted, first, second = time_bulk_seed()
+    print(f"safe_seed {SEED_ROWS} rows: inserted {inserted} in {first:.1f}ms, "
+          f"re-seed (all existing) in {second:.1f}ms")
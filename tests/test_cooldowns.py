@@ -0,0 +1,93 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from commands import cooldowns as cooldowns_module
+from commands.base import BaseCommand
+from commands.cooldowns import CooldownEngine
+
+VIEWER = {"id": "1", "name": "viewer"}
+OTHER = {"id": "2", "name": "other"}
+MOD = {"id": "3", "name": "mod", "badges": {"moderator": "1"}}
+
+
+class EchoCommand(BaseCommand):
+    name = "echo"
+    user_cooldown = 30
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def handle(self, data):
+        self.calls += 1
+
+
+class TestCooldownEngine(unittest.TestCase):
+    def setUp(self):
+        self.clock = 1000.0
+        patcher = mock.patch.object(cooldowns_module.time, "monotonic", lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.engine = CooldownEngine()
+
+    def command(self, cooldown=0, channel_cooldown=0, user_cooldown=0):
+        return mock.Mock(spec=["name", "cooldown", "channel_cooldown", "user_cooldown"],
+                         cooldown=cooldown, channel_cooldown=channel_cooldown,
+                         user_cooldown=user_cooldown, **{"name": "hug"})
+
+    def test_user_cooldown_is_per_user(self):
+        command = self.command(user_cooldown=10)
+        self.assertEqual(self.engine.acquire(command, VIEWER, "chan"), 0)
+        self.assertAlmostEqual(self.engine.acquire(command, VIEWER, "chan"), 10)
+        self.assertEqual(self.engine.acquire(command, OTHER, "chan"), 0)
+
+        self.clock += 10
+        self.assertEqual(self.engine.acquire(command, VIEWER, "chan"), 0)
+
+    def test_longest_scope_wins_and_mods_bypass(self):
+        command = self.command(cooldown=5, channel_cooldown=20)
+        self.engine.acquire(command, VIEWER, "chan")
+        self.clock += 6
+        self.assertAlmostEqual(self.engine.acquire(command, OTHER, "chan"), 14)
+        self.assertEqual(self.engine.acquire(command, OTHER, "elsewhere"), 0)
+        self.assertEqual(self.engine.acquire(command, MOD, "chan"), 0)
+
+    def test_expired_entries_are_swept(self):
+        command = self.command(user_cooldown=5)
+        for i in range(50):
+            self.engine.acquire(command, {"id": str(i)}, "chan")
+        self.assertEqual(len(self.engine), 50)
+
+        self.clock += self.engine.sweep_interval
+        self.engine.acquire(command, VIEWER, "chan")
+        self.assertEqual(len(self.engine), 1)
+
+
+class TestCommandCooldown(unittest.TestCase):
+    def test_execute_skips_command_on_cooldown(self):
+        command = EchoCommand()
+        engine = CooldownEngine()
+        with mock.patch("commands.base.cooldowns", engine):
+            for _ in range(3):
+                command.execute({"user": VIEWER, "channel": "chan"})
+            command.execute({"user": OTHER, "channel": "chan"})
+        self.assertEqual(command.calls, 2)
+
+    def test_channel_point_redemptions_ignore_cooldown(self):
+        command = EchoCommand()
+        engine = CooldownEngine()
+        with mock.patch("commands.base.cooldowns", engine):
+            command.execute({"user": VIEWER, "channel": "chan"})
+            for _ in range(2):
+                command.execute({"user": VIEWER, "channel": "chan", "source": "channel_point"})
+            command.execute({"user": VIEWER, "channel": "chan"})
+        self.assertEqual(command.calls, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.errors import DatabaseError
+from db.database import Database
+from utils.counter_service import CounterService
+
+
+class TestCounterService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        self.db.execute_many(
+            "INSERT INTO commands (name, response, total_uses, date_added) VALUES (?, 'x', ?, datetime('now'))",
+            [("testhug", 4), ("testwave", 0)])
+        self.counters = CounterService(self.db)
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def stored(self, name):
+        return self.db.fetchone("SELECT total_uses FROM commands WHERE name = ?", (name,))["total_uses"]
+
+    def test_increments_are_aggregated_into_one_flush(self):
+        for _ in range(300):
+            self.counters.increment("commands", "total_uses", "name", "testhug")
+        self.counters.increment("commands", "total_uses", "name", "testwave", 2)
+
+        self.assertEqual(self.stored("testhug"), 4)
+        self.assertEqual(self.counters.get("commands", "total_uses", "name", "testhug"), 304)
+
+        with mock.patch.object(self.db, "execute_many", wraps=self.db.execute_many) as execute_many:
+            self.assertEqual(self.counters.flush(), 2)
+        self.assertEqual(execute_many.call_count, 1)
+        self.assertEqual(self.stored("testhug"), 304)
+        self.assertEqual(self.stored("testwave"), 2)
+        self.assertEqual(self.counters.pending("commands", "total_uses", "name", "testhug"), 0)
+        self.assertEqual(self.counters.flush(), 0)
+
+    def test_failed_flush_keeps_increments(self):
+        self.counters.increment("commands", "total_uses", "name", "testhug", 3)
+        with mock.patch.object(self.db, "execute_many", side_effect=DatabaseError("locked")), \
+                mock.patch("utils.counter_service.handle_error"):
+            self.assertEqual(self.counters.flush(), 0)
+
+        self.assertEqual(self.counters.get("commands", "total_uses", "name", "testhug"), 7)
+        self.counters.flush()
+        self.assertEqual(self.stored("testhug"), 7)
+
+    def test_discard_drops_pending_increments(self):
+        self.counters.increment("commands", "total_uses", "name", "testhug", 3)
+        self.assertEqual(self.counters.discard(), 1)
+        self.assertEqual(self.counters.flush(), 0)
+        self.assertEqual(self.counters.get("commands", "total_uses", "name", "testhug"), 4)
+
+    def test_rejects_unsafe_identifiers(self):
+        with self.assertRaises(DatabaseError):
+            self.counters.increment("commands; DROP TABLE users", "total_uses", "name", "x")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,22 @@
+import asyncio
 import os
+import sys
 import unittest
 import tempfile
 import sqlite3
+import threading
+import time
+from datetime import datetime
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.errors import DatabaseError
+from db.database import Database, select_query
+from db.backup import BackupManager
+from db.migrator import Migrator, split_statements
+from db.archive import RedemptionArchive
 
 class TestSimpleDb(unittest.TestCase):
     def setUp(self):
@@ -60,5 +75,391 @@ class TestSimpleDb(unittest.TestCase):
         user = cursor.fetchone()
         self.assertIsNone(user)
 
+class TestDatabaseTransactions(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def _count(self, name):
+        return self.db.fetchone(
+            "SELECT COUNT(*) AS n FROM toys WHERE name = ?", (name,))["n"]
+
+    def _insert_toy(self, name):
+        self.db.execute(
+            "INSERT INTO toys (name, cost, date_added) VALUES (?, 1, datetime('now'))",
+            (name,))
+
+    def test_commit(self):
+        with self.db.transaction():
+            self._insert_toy("test_commit_a")
+            self._insert_toy("test_commit_b")
+            self.assertTrue(self.db.in_transaction())
+        self.assertFalse(self.db.in_transaction())
+        self.assertEqual(self._count("test_commit_a"), 1)
+        self.assertEqual(self._count("test_commit_b"), 1)
+
+    def test_rollback_on_exception(self):
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self._insert_toy("test_rollback")
+                raise RuntimeError("boom")
+        self.assertEqual(self._count("test_rollback"), 0)
+
+    def test_nested_savepoint_rollback(self):
+        with self.db.transaction():
+            self._insert_toy("test_outer")
+            with self.assertRaises(DatabaseError):
+                with self.db.transaction():
+                    self._insert_toy("test_inner")
+                    self._insert_toy("test_outer")  # UNIQUE violation
+        self.assertEqual(self._count("test_outer"), 1)
+        self.assertEqual(self._count("test_inner"), 0)
+
+    def test_legacy_begin_commit(self):
+        done = threading.Event()
+
+        def run():
+            self.db.begin_transaction()
+            self._insert_toy("test_legacy")
+            self.db.commit()
+            done.set()
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        worker.join(timeout=5)
+        self.assertTrue(done.is_set(), "begin_transaction deadlocked")
+        self.assertEqual(self._count("test_legacy"), 1)
+
+    def test_concurrent_read_then_write_transactions(self):
+        start = threading.Barrier(2)
+        errors = []
+
+        def run(name):
+            start.wait()
+            try:
+                with self.db.transaction():
+                    self.db.fetchone("SELECT COUNT(*) AS n FROM toys")
+                    # Both readers would hold SHARED here under a deferred BEGIN
+                    time.sleep(0.05)
+                    self._insert_toy(name)
+            except DatabaseError as e:
+                errors.append(e)
+
+        workers = [threading.Thread(target=run, args=(f"test_concurrent_{i}",)) for i in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=10)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self._count("test_concurrent_0") + self._count("test_concurrent_1"), 2)
+
+    def test_safe_seed_skips_existing(self):
+        self.db.safe_seed("toys", "name", [
+            {"name": "test_seed", "cost": 1, "date_added": "now"},
+            {"name": "test_seed", "cost": 2, "date_added": "now"},
+        ])
+        self.assertEqual(self._count("test_seed"), 1)
+
+    def test_iterate_batches_and_row_formats(self):
+        for i in range(5):
+            self._insert_toy(f"test_iter_{i}")
+        query = select_query("toys", ("name", "cost"),
+                             where="name LIKE 'test_iter_%'", order_by="name")
+
+        batches = list(self.db.iterate_batches(query, batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(batches[0][0], {"name": "test_iter_0", "cost": 1})
+
+        rows = list(self.db.iterate(query, row_format="namedtuple"))
+        self.assertEqual(rows[4].name, "test_iter_4")
+        self.assertEqual(self.db.fetchone(query, row_format="tuple"), ("test_iter_0", 1))
+
+    def test_select_query_rejects_bad_identifiers(self):
+        with self.assertRaises(DatabaseError):
+            select_query("toys", ("name; DROP TABLE toys",))
+
+
+class TestQueryTiming(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        # SQLite computes each row as it is stepped, so all but the first
+        # row's work happens in the fetch
+        self.db._get_connection().create_function(
+            "slow", 1, lambda value: time.sleep(0.02) or value)
+        self.query = "SELECT slow(value) AS v FROM (SELECT 1 AS value UNION ALL SELECT 2 UNION ALL SELECT 3 " \
+                     "UNION ALL SELECT 4 UNION ALL SELECT 5)"
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def _recorded(self, read):
+        with mock.patch("db.database.query_stats") as stats:
+            stats.active = True
+            read()
+        stats.record.assert_called_once()
+        return stats.record.call_args.args[2]
+
+    def test_fetchall_time_includes_fetch(self):
+        self.assertGreaterEqual(self._recorded(lambda: self.db.fetchall(self.query)), 0.09)
+
+    def test_iterate_time_includes_every_batch(self):
+        self.assertGreaterEqual(
+            self._recorded(lambda: list(self.db.iterate(self.query, batch_size=2))), 0.09)
+
+
+class TestDatabaseSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        self.db.snapshot.max_age = 3600
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def _count_sql(self):
+        return "SELECT COUNT(*) AS n FROM toys WHERE name LIKE 'test_snap_%'"
+
+    def test_analytical_reads_use_snapshot(self):
+        self.db.execute(
+            "INSERT INTO toys (name, cost, date_added) VALUES ('test_snap_a', 1, datetime('now'))")
+        self.assertEqual(self.db.fetchone(self._count_sql(), analytical=True)["n"], 1)
+        self.assertTrue(self.db.snapshot.path.exists())
+
+        # Within the staleness bound the snapshot is not refreshed
+        self.db.execute(
+            "INSERT INTO toys (name, cost, date_added) VALUES ('test_snap_b', 1, datetime('now'))")
+        self.assertEqual(self.db.fetchone(self._count_sql(), analytical=True)["n"], 1)
+        self.assertEqual(self.db.fetchone(self._count_sql())["n"], 2)
+
+        # Once stale, the old copy is served while a new one is taken
+        self.db.snapshot.max_age = 0
+        self.db.snapshot._refreshed_at -= 1
+        self.assertEqual(self.db.fetchone(self._count_sql(), analytical=True)["n"], 1)
+        self.db.snapshot.wait_for_refresh(timeout=5)
+        self.db.snapshot.max_age = 3600
+        self.assertEqual(self.db.fetchone(self._count_sql(), analytical=True)["n"], 2)
+
+    def test_snapshot_is_read_only(self):
+        with self.assertRaises(DatabaseError):
+            self.db.snapshot.execute("DELETE FROM toys")
+
+
+class TestDatabaseBackup(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        self.manager = BackupManager(self.db)
+        self.manager.backup_dir = os.path.join(self.temp_dir.name, "backups")
+        self.manager.keep = 2
+        self.manager.pages_per_step = 4
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def test_backup_while_connected_and_restore(self):
+        self.db.execute(
+            "INSERT INTO bot_stats (stat_date) VALUES ('test_backup')")
+        backup_path = self.manager.create_backup()
+
+        self.db.execute("DELETE FROM bot_stats WHERE stat_date = 'test_backup'")
+        self.manager.restore_backup(self.manager.resolve_backup(os.path.basename(backup_path)))
+
+        row = self.db.fetchone("SELECT 1 FROM bot_stats WHERE stat_date = 'test_backup'")
+        self.assertIsNotNone(row)
+
+    def test_restore_async_migrates_older_backup(self):
+        latest = self.db.fetchone("PRAGMA user_version")["user_version"]
+        backup_path = self.manager.create_backup()
+        conn = sqlite3.connect(backup_path)
+        conn.execute(f"PRAGMA user_version = {latest - 1}")
+        conn.commit()
+        conn.close()
+
+        done = []
+        thread = self.manager.restore_backup_async(
+            self.manager.resolve_backup(os.path.basename(backup_path)),
+            lambda safety_path, error: done.append((safety_path, error)))
+        thread.join(5)
+
+        self.assertEqual(len(done), 1)
+        self.assertIsNotNone(done[0][0])
+        self.assertIsNone(done[0][1])
+        self.assertEqual(self.db.fetchone("PRAGMA user_version")["user_version"], latest)
+
+    def test_rotation(self):
+        for _ in range(4):
+            self.manager.create_backup()
+        self.assertEqual(len(self.manager.list_backups()), 2)
+
+    def test_restore_oldest_backup_at_rotation_limit(self):
+        self.db.execute("INSERT INTO bot_stats (stat_date) VALUES ('oldest')")
+        oldest = self.manager.create_backup()
+        self.db.execute("DELETE FROM bot_stats WHERE stat_date = 'oldest'")
+        self.manager.create_backup()
+
+        self.manager.restore_backup(self.manager.resolve_backup(os.path.basename(oldest)))
+
+        row = self.db.fetchone("SELECT 1 FROM bot_stats WHERE stat_date = 'oldest'")
+        self.assertIsNotNone(row)
+        self.assertEqual(len(self.manager.list_backups()), 2)
+
+    def test_restore_missing_backup_is_not_created(self):
+        missing = os.path.join(self.manager.backup_dir, "db_backup_missing.db")
+        with self.assertRaises(DatabaseError):
+            self.manager._open_backup(missing)
+        self.assertFalse(os.path.exists(missing))
+
+
+class TestAsyncDatabase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+
+    def tearDown(self):
+        self.db.close_async()
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def test_atransaction_commit_and_rollback(self):
+        async def run():
+            async with self.db.atransaction() as tx:
+                await tx.execute("INSERT INTO bot_stats (stat_date) VALUES ('async_a')")
+                row = await tx.fetchone("SELECT COUNT(*) AS n FROM bot_stats WHERE stat_date = 'async_a'")
+                self.assertEqual(row["n"], 1)
+
+            with self.assertRaises(RuntimeError):
+                async with self.db.atransaction() as tx:
+                    await tx.execute("INSERT INTO bot_stats (stat_date) VALUES ('async_b')")
+                    raise RuntimeError("boom")
+
+            rows = await self.db.afetchall(
+                "SELECT stat_date FROM bot_stats WHERE stat_date LIKE 'async_%'")
+            return [r["stat_date"] for r in rows]
+
+        self.assertEqual(asyncio.run(run()), ["async_a"])
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def _index_names(self):
+        rows = self.db.fetchall("SELECT name FROM sqlite_master WHERE type = 'index'")
+        return {row["name"] for row in rows}
+
+    def test_new_database_is_fully_migrated(self):
+        latest = Migrator(self.db, self.db.migrations_dir).discover()[-1][0]
+        self.assertEqual(self.db.fetchone("PRAGMA user_version")["user_version"], latest)
+        self.assertIn("idx_reward_redemptions_user_redeemed", self._index_names())
+        self.assertIn("idx_twitch_bits_bits", self._index_names())
+        self.assertEqual(self.db.migrate(), 0)
+
+    def test_failed_migration_rolls_back(self):
+        migrations_dir = os.path.join(self.temp_dir.name, "migrations")
+        os.makedirs(migrations_dir)
+        with open(os.path.join(migrations_dir, "9998_good.sql"), "w") as f:
+            f.write("CREATE TABLE migration_test (id INTEGER);")
+        with open(os.path.join(migrations_dir, "9999_bad.sql"), "w") as f:
+            f.write("CREATE TABLE migration_test_2 (id INTEGER);\nNOT VALID SQL;")
+
+        with self.assertRaises(DatabaseError):
+            Migrator(self.db, migrations_dir).migrate()
+        self.assertEqual(self.db.fetchone("PRAGMA user_version")["user_version"], 9998)
+        self.assertTrue(self.db.table_exists("migration_test"))
+        self.assertFalse(self.db.table_exists("migration_test_2"))
+
+    def test_split_statements(self):
+        statements = split_statements(
+            "-- comment\nCREATE TABLE a (x TEXT DEFAULT ';');\nINSERT INTO a VALUES ('b'); -- trailing\n")
+        self.assertEqual(len(statements), 2)
+        self.assertIn("';'", statements[0])
+
+
+class TestRedemptionArchive(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        self.archive = RedemptionArchive(self.db)
+        self.archive.retention_days = 30
+
+        self.db.execute(
+            "INSERT INTO users (twitch_user_id, twitch_username, date_added) VALUES ('u1', 'viewer', 'now')")
+        self.db.execute(
+            "INSERT INTO twitch_rewards (reward_id, name, date_added) VALUES ('r1', 'Hydrate', 'now')")
+        for redeemed_at in ("2026-01-05T10:00:00", "2026-01-05T11:00:00",
+                            "2026-02-10T10:00:00", "2026-10-18T10:00:00"):
+            self.db.execute(
+                "INSERT INTO reward_redemptions (reward_id, user_id, redeemed_at) VALUES ('r1', 'u1', ?)",
+                (redeemed_at,))
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def test_run_moves_old_rows_and_rolls_up(self):
+        moved = self.archive.run(now=datetime(2026, 10, 19))
+        self.assertEqual(moved, 3)
+        self.assertEqual(
+            self.archive.archive_tables(),
+            ["reward_redemptions_archive_2026_02", "reward_redemptions_archive_2026_01"])
+        hot = self.db.fetchone("SELECT COUNT(*) AS n FROM reward_redemptions")["n"]
+        self.assertEqual(hot, 1)
+
+        # Running again must not double count
+        self.assertEqual(self.archive.run(now=datetime(2026, 10, 19)), 0)
+        counts = {row["day"]: row["uses"] for row in self.archive.get_daily_counts(reward_id="r1")}
+        self.assertEqual(counts, {"2026-01-05": 2, "2026-02-10": 1, "2026-10-18": 1})
+
+    def test_daily_counts_read_the_snapshot(self):
+        self.assertEqual(len(self.archive.get_daily_counts(reward_id="r1")), 3)
+        self.db.execute(
+            "INSERT INTO reward_redemptions (reward_id, user_id, redeemed_at) VALUES ('r1', 'u1', '2026-10-19T09:00:00')")
+
+        # The snapshot is still fresh, so the report lags the live table
+        self.assertEqual(len(self.archive.get_daily_counts(reward_id="r1")), 3)
+        self.assertEqual(len(self.archive.get_daily_counts(reward_id="r1", analytical=False)), 4)
+
+    def test_user_redemptions_union_archive(self):
+        self.archive.run(now=datetime(2026, 10, 19))
+        redemptions = self.archive.get_user_redemptions("u1", limit=3)
+        self.assertEqual(
+            [r["redeemed_at"] for r in redemptions],
+            ["2026-10-18T10:00:00", "2026-02-10T10:00:00", "2026-01-05T11:00:00"])
+        self.assertEqual(redemptions[-1]["reward_name"], "Hydrate")
+        self.assertEqual(set(redemptions[0]), set(redemptions[-1]))
+
+    def test_archive_keeps_twitch_redemption_id(self):
+        self.db.execute(
+            "UPDATE reward_redemptions SET twitch_redemption_id = 'tw-1' WHERE redeemed_at = '2026-01-05T10:00:00'")
+        self.archive.run(now=datetime(2026, 10, 19))
+        row = self.db.fetchone(
+            "SELECT twitch_redemption_id FROM reward_redemptions_archive_2026_01 WHERE redeemed_at = ?",
+            ("2026-01-05T10:00:00",))
+        self.assertEqual(row["twitch_redemption_id"], "tw-1")
+
+    def test_migration_adds_column_to_existing_archives(self):
+        self.db.execute(
+            "CREATE TABLE reward_redemptions_archive_2025_12 (id INTEGER PRIMARY KEY, reward_id TEXT NOT NULL, "
+            "user_id TEXT NOT NULL, redeemed_at TEXT NOT NULL, status TEXT, user_input TEXT)")
+        self.db.execute("PRAGMA user_version = 7")
+        self.assertGreater(self.db.migrate(), 0)
+        columns = {c["name"] for c in self.db.fetchall("PRAGMA table_info(reward_redemptions_archive_2025_12)")}
+        self.assertIn("twitch_redemption_id", columns)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
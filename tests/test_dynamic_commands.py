@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from commands import dynamic_commands as dynamic_commands_module
+from commands.dynamic_commands import DynamicCommand, format_uptime
+from db.database import Database
+from utils.chatters import ChatterTracker
+from utils.counter_service import CounterService
+from utils.stream_state import StreamState
+
+
+class TestDynamicCommandTemplates(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        self.db.execute(
+            "INSERT INTO users (twitch_user_id, twitch_username, rank, points, date_added, last_seen) VALUES ('42', 'viewer', 'viewer', 350, datetime('now'), datetime('now'))")
+        self.db.execute(
+            "INSERT INTO commands (name, response, total_uses, date_added) VALUES ('testhug', 'x', 4, datetime('now'))")
+        self.counters = CounterService(self.db)
+        for name, value in (("db", self.db), ("counter_service", self.counters)):
+            patcher = mock.patch.object(dynamic_commands_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.user = {"id": "42", "name": "viewer"}
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def render(self, response, args=""):
+        command = DynamicCommand(name="testhug", response=response)
+        return command.template.render(command.template_values(self.user, args))
+
+    def test_plain_template_needs_no_query(self):
+        command = DynamicCommand(name="testhug", response="{user} hugs {target}")
+        self.assertIsNone(command._db_query)
+        self.assertEqual(self.render("{user} hugs {target}", "@friend extra"), "viewer hugs friend")
+        self.assertEqual(self.render("{user} hugs {target}"), "viewer hugs viewer")
+
+    def test_count_is_not_part_of_db_query(self):
+        self.assertIsNone(DynamicCommand(name="testhug", response="hug #{count}")._db_query)
+        rendered = self.render("{user} has {points} points, hug #{count}")
+        self.assertEqual(rendered, "viewer has 350 points, hug #5")
+
+    def test_count_includes_unflushed_uses(self):
+        for _ in range(3):
+            self.counters.increment("commands", "total_uses", "name", "testhug")
+        self.assertEqual(self.render("hug #{count}"), "hug #8")
+        self.counters.flush()
+        self.assertEqual(self.render("hug #{count}"), "hug #8")
+
+    def test_random_chatter_excludes_caller(self):
+        tracker = ChatterTracker()
+        tracker.seen("viewer")
+        tracker.seen("friend")
+        with mock.patch("utils.chatters.chatters", tracker):
+            self.assertEqual(self.render("{user} hugs {random_chatter}"), "viewer hugs friend")
+
+    def test_uptime_reads_cached_stream_state(self):
+        state = StreamState()
+        with mock.patch.object(dynamic_commands_module, "stream_state", state), \
+                mock.patch("utils.twitch_api_client.twitch_api") as twitch_api:
+            self.assertEqual(self.render("up {uptime}"), "up offline")
+            state.started_at = time.time() - (3600 + 5 * 60 + 1)
+            self.assertEqual(self.render("up {uptime}"), "up 1h 5m")
+        twitch_api.get_stream.assert_not_called()
+
+    def test_stream_state_refresh(self):
+        state = StreamState()
+        with mock.patch("utils.stream_state.config.get", return_value="123"), \
+                mock.patch("utils.twitch_api_client.twitch_api") as twitch_api:
+            twitch_api.get_stream.return_value = {"started_at": "2026-10-19T10:00:00Z"}
+            self.assertTrue(state.refresh())
+            self.assertEqual(state.uptime(now=state.started_at + 90), 90)
+            twitch_api.get_stream.return_value = None
+            self.assertFalse(state.refresh())
+            self.assertIsNone(state.uptime())
+
+    def test_format_uptime(self):
+        self.assertEqual(format_uptime(59 * 60), "59m")
+        self.assertEqual(format_uptime(2 * 3600 + 5 * 60 + 30), "2h 5m")
+
+
+if __name__ == '__main__':
+    unittest.main()
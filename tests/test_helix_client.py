@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.errors import NetworkError
+from utils.helix_client import HelixClient, RateLimiter, ResponseCache
+
+
+def response(status, headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    return resp
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_waits_for_reset_when_bucket_empty(self):
+        limiter = RateLimiter(reserve=1)
+        limiter.update({"Ratelimit-Limit": "800", "Ratelimit-Remaining": "2",
+                        "Ratelimit-Reset": str(time.time() + 5)})
+        self.assertEqual(limiter.acquire_delay(), 0.0)
+        self.assertGreater(limiter.acquire_delay(), 4)
+
+
+class TestHelixClient(unittest.TestCase):
+    def setUp(self):
+        self.client = HelixClient(base_url="https://example.invalid/helix")
+        self.client.backoff = 0
+        self.client.max_retries = 2
+        self.session = mock.Mock()
+        self.client._session = self.session
+
+    def test_retries_server_errors(self):
+        self.session.request.side_effect = [response(503), response(200)]
+        self.assertEqual(self.client.request("GET", "users").status_code, 200)
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertEqual(self.session.request.call_args.kwargs["timeout"], self.client.timeout)
+
+    def test_client_errors_are_not_retried(self):
+        self.session.request.return_value = response(400)
+        self.assertEqual(self.client.request("GET", "users").status_code, 400)
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_connection_errors_raise_after_retries(self):
+        self.session.request.side_effect = requests.ConnectionError("down")
+        with self.assertRaises(NetworkError):
+            self.client.request("GET", "users")
+        self.assertEqual(self.session.request.call_count, 3)
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_key_ignores_param_order(self):
+        self.assertEqual(ResponseCache.key("/users", {"a": 1, "b": 2}),
+                         ResponseCache.key("users", [("b", 2), ("a", 1)]))
+
+    def test_only_configured_endpoints_are_cached(self):
+        cache = ResponseCache({"channel_points/custom_rewards": 60})
+        cache.put(cache.key("users"), {"data": []})
+        self.assertEqual(cache.get(cache.key("users")), (None, None))
+
+        key = cache.key("channel_points/custom_rewards", {"broadcaster_id": "1"})
+        cache.put(key, {"data": [1]})
+        body, _ = cache.get(key)
+        body["data"].append(2)
+        # Callers get a copy
+        self.assertEqual(cache.get(key)[0], {"data": [1]})
+
+    def test_stale_entry_offers_etag_until_invalidated(self):
+        cache = ResponseCache({"rewards": 60})
+        key = cache.key("rewards")
+        cache.put(key, {"data": [1]}, etag='"v1"')
+        cache._entries[key]["expires_at"] = 0
+        self.assertEqual(cache.get(key), (None, '"v1"'))
+        self.assertEqual(cache.revalidate(key), {"data": [1]})
+        self.assertEqual(cache.invalidate("rewards"), 1)
+        self.assertEqual(cache.get(key), (None, None))
+
+
+class TestCachedRewards(unittest.TestCase):
+    def setUp(self):
+        from utils.twitch_api_client import TwitchAPIClient
+        self.client = TwitchAPIClient()
+        self.client.tokens = mock.Mock()
+        self.client.tokens.get_token.return_value = "token"
+        self.client.http = mock.Mock()
+
+    def rewards_response(self, status=200, etag=None):
+        resp = mock.Mock(status_code=status, headers={"ETag": etag} if etag else {})
+        resp.json.return_value = {"data": [{"id": "a", "title": "Hydrate"}]}
+        return resp
+
+    def test_repeat_reads_are_served_from_cache(self):
+        self.client.http.request.return_value = self.rewards_response()
+        self.client.get_channel_rewards("1")
+        self.assertEqual(self.client.get_channel_rewards("1"), [{"id": "a", "title": "Hydrate"}])
+        self.assertEqual(self.client.http.request.call_count, 1)
+
+    def test_writes_invalidate_and_stale_reads_revalidate(self):
+        self.client.http.request.return_value = self.rewards_response(etag='"v1"')
+        self.client.get_channel_rewards("1")
+
+        self.client.http.request.return_value = mock.Mock(status_code=204)
+        self.client.delete_custom_reward("1", "a")
+        self.assertEqual(self.client.cache.get(self.client.cache.key(
+            "channel_points/custom_rewards", {"broadcaster_id": "1"})), (None, None))
+
+        self.client.http.request.return_value = self.rewards_response(etag='"v2"')
+        self.client.get_channel_rewards("1")
+        for entry in self.client.cache._entries.values():
+            entry["expires_at"] = 0
+        self.client.http.request.return_value = mock.Mock(status_code=304, headers={})
+        self.assertEqual(self.client.get_channel_rewards("1"), [{"id": "a", "title": "Hydrate"}])
+        self.assertEqual(
+            self.client.http.request.call_args.kwargs["headers"]["If-None-Match"], '"v2"')
+
+
+if __name__ == '__main__':
+    unittest.main()
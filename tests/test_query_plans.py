@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db.database import Database
+from db.instrumentation import normalise_query, redact_params, QueryStats
+from db.query_plan import find_full_scans, get_hot_queries
+
+# Importing the services registers their hot queries
+import utils.user_service  # noqa: F401
+import utils.reward_service  # noqa: F401
+import utils.bits_service  # noqa: F401
+
+
+class TestQueryPlans(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def test_hot_queries_registered(self):
+        self.assertIn("user_by_twitch_id", get_hot_queries())
+        self.assertIn("reward_by_id", get_hot_queries())
+        self.assertIn("user_redemptions", get_hot_queries())
+        self.assertIn("bits_action", get_hot_queries())
+
+    def test_no_full_scans_of_large_tables(self):
+        offenders = find_full_scans(self.db)
+        self.assertEqual(offenders, [], f"Full table scans found: {offenders}")
+
+    def test_detects_full_scan(self):
+        offenders = find_full_scans(self.db, {
+            "by_points": ("SELECT * FROM users WHERE points > ?", (0,))
+        })
+        self.assertEqual(len(offenders), 1)
+        self.assertEqual(offenders[0]["table"], "users")
+
+
+class TestQueryStats(unittest.TestCase):
+    def test_normalise_query(self):
+        self.assertEqual(
+            normalise_query("SELECT *  FROM users\n WHERE name = 'bob' AND id IN (?, ?, ?) LIMIT 10"),
+            "SELECT * FROM users WHERE name = ? AND id IN (?) LIMIT ?")
+
+    def test_redact_params(self):
+        self.assertEqual(redact_params(("secret", 5)), "[<str>, <int>]")
+        self.assertNotIn("secret", redact_params({"token": "secret"}))
+
+    def test_record(self):
+        stats = QueryStats()
+        stats.enabled = True
+        stats.slow_query_ms = 0
+        stats.record("SELECT 1 WHERE x = 1", None, 0.002)
+        stats.record("SELECT 1 WHERE x = 2", None, 0.004)
+        snapshot = stats.snapshot()
+        self.assertEqual(len(snapshot), 1)
+        self.assertEqual(snapshot[0]["count"], 2)
+        self.assertEqual(sum(snapshot[0]["histogram"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
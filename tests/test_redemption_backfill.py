@@ -0,0 +1,152 @@
+import os
+import sys
+import tempfile
+import unittest
+from types import MappingProxyType
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db.database import Database
+from utils import redemption_backfill as backfill_module
+from utils.redemption_backfill import RedemptionBackfill, parse_redeemed_at
+from utils.reward_catalog import RewardRecord
+from utils import channel_points_service as channel_points_module
+from utils.channel_points_service import ChannelPointsService
+from utils.redemption_dedupe import RedemptionDeduplicator
+from utils.reward_service import RewardService
+
+
+def record(reward_id, auto_fulfill=False):
+    return RewardRecord(reward_id, reward_id.title(), "", 100, True, "default",
+                        MappingProxyType({}), None, auto_fulfill)
+
+
+def api_redemption(redemption_id, reward_id, minute):
+    return {"id": redemption_id, "user_id": "42", "user_login": "viewer",
+            "user_name": "Viewer", "user_input": "", "status": "UNFULFILLED",
+            "redeemed_at": f"2024-05-01T12:{minute:02d}:00.123456789Z",
+            "reward": {"id": reward_id, "title": reward_id.title(), "cost": 100, "prompt": ""}}
+
+
+class FakeApi:
+    def __init__(self, redemptions):
+        # Newest first, like sort=NEWEST
+        self.redemptions = redemptions
+        self.fetched = 0
+
+    def iter_redemptions(self, broadcaster_id, reward_id, status="UNFULFILLED", sort="NEWEST"):
+        for redemption in self.redemptions.get(reward_id, []):
+            self.fetched += 1
+            yield redemption
+
+
+class TestRedemptionBackfill(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        self.published = []
+        registry_patcher = mock.patch.object(
+            backfill_module.event_registry, "create_and_publish_event",
+            side_effect=lambda event_type, data: self.published.append(data))
+        registry_patcher.start()
+        self.addCleanup(registry_patcher.stop)
+        catalog_patcher = mock.patch.object(
+            backfill_module.reward_catalog, "all",
+            return_value={"songs": record("songs"), "hydrate": record("hydrate", auto_fulfill=True)})
+        catalog_patcher.start()
+        self.addCleanup(catalog_patcher.stop)
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def make_backfill(self, redemptions):
+        backfill = RedemptionBackfill(api=FakeApi(redemptions), database=self.db)
+        backfill.broadcaster_id = "1"
+        backfill.max_age = 10 ** 10
+        return backfill
+
+    def test_parses_nanosecond_timestamps(self):
+        self.assertAlmostEqual(
+            parse_redeemed_at("2024-05-01T12:00:00.5Z") % 60, 0.5, places=3)
+        self.assertEqual(parse_redeemed_at("2024-05-01T12:00:00Z"),
+                         parse_redeemed_at("2024-05-01T12:00:00.000000000Z"))
+
+    def test_replays_oldest_first_and_records_mark(self):
+        backfill = self.make_backfill({"songs": [
+            api_redemption("c", "songs", 3), api_redemption("b", "songs", 2),
+            api_redemption("a", "songs", 1)]})
+        report = backfill.run()
+
+        self.assertEqual(report.rewards, 1)
+        self.assertEqual(report.published, 3)
+        self.assertEqual([redemption["id"] for redemption in self.published], ["a", "b", "c"])
+        self.assertEqual(backfill.get_marks()["songs"],
+                         parse_redeemed_at("2024-05-01T12:03:00.123456Z"))
+
+    def test_stops_paging_at_high_water_mark(self):
+        self.db.execute(
+            "INSERT INTO redemption_backfill_state (reward_id, last_redeemed_at, updated_at) VALUES (?, ?, ?)",
+            ("songs", parse_redeemed_at("2024-05-01T12:05:00.123456Z"), "now"))
+        backfill = self.make_backfill({"songs": [
+            api_redemption(f"r{minute}", "songs", minute) for minute in range(59, -1, -1)]})
+        report = backfill.run()
+
+        # Only the newer part of the queue is fetched, plus the one that stops paging
+        self.assertEqual(report.published, 54)
+        self.assertEqual(backfill.api.fetched, 55)
+        self.assertEqual(self.published[0]["id"], "r6")
+
+    def test_live_redemption_before_backfill_does_not_hide_downtime(self):
+        self.db.execute(
+            "INSERT INTO twitch_rewards (reward_id, name, date_added) VALUES ('songs', 'Songs', datetime('now'))")
+        backfill = self.make_backfill({"songs": [
+            api_redemption("c", "songs", 3), api_redemption("b", "songs", 2),
+            api_redemption("a", "songs", 1)]})
+
+        # "c" arrives live after the reconnect, stamped with the local clock,
+        # before the backfill job gets to run
+        live = backfill_module.map_api_redemption(api_redemption("c", "songs", 3), "chan")
+        live["timestamp"] = 10 ** 10
+        with mock.patch("utils.reward_service.db", self.db):
+            self.assertTrue(RewardService().record_redemption(live))
+        self.assertEqual(backfill.get_marks(), {})
+
+        report = backfill.run()
+        self.assertEqual([redemption["id"] for redemption in self.published], ["a", "b"])
+        self.assertEqual(report.fetched, 3)
+
+    def test_chat_copy_first_then_eventsub_then_backfill(self):
+        self.db.execute(
+            "INSERT INTO twitch_rewards (reward_id, name, date_added) VALUES ('songs', 'Songs', datetime('now'))")
+        backfill = self.make_backfill({"songs": [api_redemption("c", "songs", 3)]})
+        eventsub = backfill_module.map_api_redemption(api_redemption("c", "songs", 3), "chan")
+        chat = dict(eventsub, message_id="m1")
+        del chat["id"]
+
+        service = ChannelPointsService(mock.Mock())
+        with mock.patch("utils.reward_service.db", self.db), \
+                mock.patch.object(channel_points_module, "redemption_dedupe", RedemptionDeduplicator()), \
+                mock.patch.object(channel_points_module.reward_catalog, "get", return_value=record("songs")):
+            service.handle_redemption(chat)
+            # The EventSub copy is dropped, but its id ends up on the chat copy's row
+            self.assertFalse(service.handle_redemption(eventsub))
+
+        row = self.db.fetchone("SELECT twitch_redemption_id FROM reward_redemptions")
+        self.assertEqual(row["twitch_redemption_id"], "c")
+
+        # Long after the dedupe window, the backfill still knows it was handled
+        report = backfill.run()
+        self.assertEqual((report.fetched, report.published), (1, 0))
+
+    def test_nothing_missed_publishes_nothing(self):
+        backfill = self.make_backfill({})
+        report = backfill.run()
+        self.assertEqual((report.fetched, report.published), (0, 0))
+        self.assertEqual(self.published, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
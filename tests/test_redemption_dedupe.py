@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.redemption_dedupe import RedemptionDeduplicator
+
+
+def redemption(**extra):
+    data = {"user": {"id": "42"}, "reward": {"id": "hydrate"}, "timestamp": 1000.0}
+    data.update(extra)
+    return data
+
+
+class TestRedemptionDedupe(unittest.TestCase):
+    def setUp(self):
+        self.dedupe = RedemptionDeduplicator()
+
+    def test_redelivered_id_is_dropped(self):
+        self.assertTrue(self.dedupe.accept(redemption(id="r1"), now=1000.0))
+        self.assertFalse(self.dedupe.accept(redemption(id="r1"), now=1001.0))
+
+    def test_chat_and_eventsub_copies_pair_up(self):
+        self.assertTrue(self.dedupe.accept(redemption(message_id="m1"), now=1000.0))
+        self.assertFalse(self.dedupe.accept(
+            redemption(id="r1", timestamp=1005.5), now=1005.5))
+        # A second, real redemption in the same bucket still goes through
+        self.assertTrue(self.dedupe.accept(
+            redemption(id="r2", timestamp=1006.0), now=1006.0))
+
+    def test_dropped_copy_returns_the_one_it_paired_with(self):
+        chat = redemption(message_id="m1")
+        self.assertTrue(self.dedupe.admit(chat, now=1000.0).accepted)
+        admission = self.dedupe.admit(redemption(id="r1", timestamp=1001.0), now=1001.0)
+        self.assertFalse(admission.accepted)
+        self.assertIs(admission.paired, chat)
+
+    def test_window_expires(self):
+        self.dedupe.window = 10
+        self.assertTrue(self.dedupe.accept(redemption(id="r1"), now=1000.0))
+        self.assertTrue(self.dedupe.accept(redemption(id="r1"), now=1011.0))
+
+    def test_bounded(self):
+        self.dedupe.max_entries = 4
+        for i in range(20):
+            self.dedupe.accept(redemption(id=f"r{i}", timestamp=1000.0 + i * 60), now=1000.0)
+        self.assertLessEqual(len(self.dedupe._seen), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.redemption_status_queue import RedemptionStatusQueue
+
+
+class FakeApi:
+    def __init__(self):
+        self.calls = []
+
+    def update_redemption_statuses(self, broadcaster_id, reward_id, redemption_ids, status):
+        self.calls.append((reward_id, status, list(redemption_ids)))
+        # Pretend Twitch already resolved "gone"
+        return {redemption_id: redemption_id != "gone" for redemption_id in redemption_ids}
+
+    def iter_redemptions(self, broadcaster_id, reward_id, status="UNFULFILLED", sort="NEWEST"):
+        for i in range(150):
+            yield {"id": f"q{i}", "status": status}
+
+
+class TestRedemptionStatusQueue(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeApi()
+        self.queue = RedemptionStatusQueue(api=self.api)
+        self.queue.flush_interval = 60
+        # Drive flushes by hand
+        self.queue._ensure_started = mock.Mock()
+
+    def test_groups_by_reward_and_status(self):
+        self.queue.enqueue("songs", "a")
+        self.queue.enqueue("songs", "b")
+        self.queue.enqueue("songs", "c", "CANCELED")
+        self.queue.enqueue("hydrate", "d")
+        results = self.queue.flush()
+
+        self.assertEqual(len(self.api.calls), 3)
+        self.assertEqual(results, {"a": True, "b": True, "c": True, "d": True})
+        self.assertEqual(self.queue.pending_count(), 0)
+
+    def test_queue_unfulfilled_clears_a_reward_in_batches(self):
+        self.assertEqual(self.queue.queue_unfulfilled("songs", "canceled"), 150)
+        results = self.queue.flush()
+        self.assertEqual(len(results), 150)
+        self.assertEqual(self.queue.sent_requests, -(-150 // self.queue.batch_size))
+        self.assertEqual({status for _, status, _ in self.api.calls}, {"CANCELED"})
+
+    def test_full_batches_are_due_immediately(self):
+        self.queue.enqueue_many("songs", [f"r{i}" for i in range(120)])
+        with self.queue._condition:
+            due = self.queue._take_due()
+        self.assertEqual(sum(len(entries) for _, _, entries in due), 100)
+        self.assertEqual(self.queue.pending_count(), 20)
+
+    def test_per_id_outcomes_reach_callbacks(self):
+        outcomes = {}
+        callback = lambda redemption_id, ok: outcomes.__setitem__(redemption_id, ok)
+        self.queue.enqueue("songs", "ok", callback=callback)
+        self.queue.enqueue("songs", "gone", callback=callback)
+        self.queue.flush()
+        self.assertEqual(outcomes, {"ok": True, "gone": False})
+
+
+class TestBatchedStatusUpdate(unittest.TestCase):
+    def test_three_hundred_ids_take_six_requests(self):
+        from utils.twitch_api_client import TwitchAPIClient
+
+        client = TwitchAPIClient()
+        client.tokens = mock.Mock()
+        client.tokens.get_token.return_value = "token"
+        response = mock.Mock(status_code=200)
+        response.json.side_effect = lambda: {"data": [
+            {"id": value} for key, value in client.http.request.call_args.kwargs["params"] if key == "id"]}
+        client.http = mock.Mock()
+        client.http.request.return_value = response
+
+        results = client.update_redemption_statuses("1", "songs", [f"r{i}" for i in range(300)], "FULFILLED")
+        self.assertEqual(client.http.request.call_count, 6)
+        self.assertTrue(all(results.values()))
+        self.assertEqual(len(results), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db.database import Database
+from utils.reward_catalog import RewardCatalog
+
+
+class TestRewardCatalog(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        self.db.execute(
+            "INSERT INTO twitch_rewards (reward_id, name, cost, handler_config, date_added) VALUES (?, ?, ?, ?, datetime('now'))",
+            ("test_reward", "Hydrate", 100, '{"message_template": "hi"}'))
+        self.catalog = RewardCatalog(self.db)
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def test_load_parses_handler_config(self):
+        record = self.catalog.get("test_reward")
+        self.assertEqual(record.name, "Hydrate")
+        self.assertEqual(record.handler_config["message_template"], "hi")
+        self.assertEqual(record.handler_type, "default")
+        with self.assertRaises(TypeError):
+            record.handler_config["message_template"] = "changed"
+
+    def test_refresh_swaps_map(self):
+        before = self.catalog.all()
+        self.db.execute(
+            "UPDATE twitch_rewards SET name = 'Stretch' WHERE reward_id = 'test_reward'")
+        self.catalog.refresh("test_reward")
+
+        self.assertEqual(self.catalog.get("test_reward").name, "Stretch")
+        # Readers holding the old map keep a consistent view
+        self.assertEqual(before["test_reward"].name, "Hydrate")
+
+    def test_remove(self):
+        self.catalog.load()
+        self.db.execute("DELETE FROM twitch_rewards WHERE reward_id = 'test_reward'")
+        self.catalog.refresh("test_reward")
+        self.assertIsNone(self.catalog.get("test_reward"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import reward_config as reward_config_module
+from config.reward_config import RewardConfigWatcher, apply_reward_config, save_reward_config
+from core.errors import DatabaseError
+from db.database import Database
+from utils.reward_catalog import RewardCatalog
+
+
+class TestRewardConfig(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        self.db.execute_many(
+            "INSERT INTO twitch_rewards (reward_id, name, cost, date_added) VALUES (?, ?, ?, datetime('now'))",
+            [("test_a", "Hydrate", 100), ("test_b", "Stretch", 200)])
+        self.catalog = RewardCatalog(self.db)
+        self.path = os.path.join(self.temp_dir.name, "rewards.json")
+
+        for name, value in (("db", self.db), ("reward_catalog", self.catalog),
+                            ("get_config_path", lambda: self.path)):
+            patcher = mock.patch.object(reward_config_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.watcher = RewardConfigWatcher()
+        watcher_patcher = mock.patch.object(reward_config_module, "reward_config_watcher", self.watcher)
+        watcher_patcher.start()
+        self.addCleanup(watcher_patcher.stop)
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def write_config(self, data):
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        # Make sure the poll sees a new signature even within one mtime tick
+        self.watcher._stat = None
+
+    def test_applies_only_changed_rewards(self):
+        report = apply_reward_config({"rewards": [
+            {"name": "Hydrate", "cost": 100},
+            {"name": "Stretch", "cost": 250, "handler_type": "message",
+             "handler_config": {"template": "Stretch, {username}!"}},
+            {"name": "Brand New", "cost": 10}]})
+
+        self.assertEqual(report.rewards, ["test_b"])
+        self.assertEqual(report.unknown, ["Brand New"])
+        record = self.catalog.get("test_b")
+        self.assertEqual(record.cost, 250)
+        self.assertEqual(record.handler.handler_type, "message")
+
+        # Same config again is a no-op
+        self.assertFalse(apply_reward_config({"rewards": [{"name": "Stretch", "cost": 250}]}).changed)
+
+    def test_invalid_handler_config_is_skipped(self):
+        report = apply_reward_config({"rewards": [
+            {"name": "Hydrate", "handler_type": "points", "handler_config": {}}]})
+        self.assertEqual(report.invalid, ["Hydrate"])
+        self.assertEqual(self.catalog.get("test_a").handler_type, "default")
+
+    def test_watcher_applies_edits_and_ignores_bad_json(self):
+        self.write_config({"rewards": [{"name": "Hydrate", "cost": 150}]})
+        self.assertEqual(self.watcher.check().rewards, ["test_a"])
+        self.assertIsNone(self.watcher.check())
+
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.watcher._stat = None
+        self.assertIsNone(self.watcher.check())
+        self.assertEqual(self.catalog.get("test_a").cost, 150)
+
+    def test_watcher_rejects_non_object_and_retries_failed_apply(self):
+        self.write_config([{"name": "Hydrate", "cost": 150}])
+        self.assertIsNone(self.watcher.check())
+        self.assertEqual(self.catalog.get("test_a").cost, 100)
+
+        self.write_config({"rewards": [{"name": "Hydrate", "cost": 175}]})
+        with mock.patch.object(reward_config_module, "apply_reward_config",
+                               side_effect=DatabaseError("database is locked")), \
+                mock.patch.object(reward_config_module, "handle_error"):
+            self.assertIsNone(self.watcher.check())
+        # Same file, next poll: applied now
+        self.assertEqual(self.watcher.check().rewards, ["test_a"])
+        self.assertEqual(self.catalog.get("test_a").cost, 175)
+
+    def test_save_merges_into_file_and_is_not_reapplied(self):
+        self.write_config({"rewards": [
+            {"name": "Hydrate", "cost": 1, "note": "keep me"},
+            {"name": "Planned", "cost": 5}]})
+
+        self.assertTrue(save_reward_config())
+        with open(self.path) as f:
+            saved = json.load(f)
+        by_name = {reward["name"]: reward for reward in saved["rewards"]}
+        self.assertEqual(by_name["Hydrate"]["cost"], 100)
+        self.assertEqual(by_name["Hydrate"]["note"], "keep me")
+        self.assertIn("Planned", by_name)
+        self.assertIn("Stretch", by_name)
+
+        # Our own write doesn't come back through the watcher
+        self.assertIsNone(self.watcher.check())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.errors import ValidationError
+from db.database import Database
+from reward_handlers.registry import HandlerTypeRegistry, handler_type_registry
+from utils import channel_points_service as channel_points_module
+from utils.channel_points_service import ChannelPointsService
+from utils.redemption_dedupe import Admission
+from utils.reward_catalog import RewardCatalog, RewardRecord
+from utils.templates import compile_template
+
+
+def redemption(user_input="hello"):
+    return {"id": "r1", "user": {"id": "42", "name": "viewer", "display_name": "Viewer"},
+            "channel": "chan", "reward": {"id": "test_reward", "title": "Hydrate", "cost": 100},
+            "input": user_input}
+
+
+class TestTemplates(unittest.TestCase):
+    def test_compiles_segments_once(self):
+        template = compile_template("Hi {username}, you said {input}!")
+        self.assertIs(template, compile_template("Hi {username}, you said {input}!"))
+        self.assertEqual(template.variables, {"username", "input"})
+        self.assertEqual(template.render({"username": "viewer", "input": "hey"}),
+                         "Hi viewer, you said hey!")
+
+    def test_unknown_variables_are_left_alone(self):
+        self.assertEqual(compile_template("{a} {b}").render({"a": 1}), "1 {b}")
+
+
+class TestHandlerTypeRegistry(unittest.TestCase):
+    def test_discovers_builtin_types(self):
+        for handler_type in ("message", "action_sequence", "command", "points", "obs", "custom"):
+            self.assertTrue(handler_type_registry.has_type(handler_type), handler_type)
+
+    def test_passthrough_and_invalid_config(self):
+        self.assertIsNone(handler_type_registry.compile("r", "default", {}))
+        with self.assertRaises(ValidationError):
+            handler_type_registry.compile("r", "teleport", {})
+        with self.assertRaises(ValidationError):
+            handler_type_registry.compile("r", "points", {"amount": "lots"})
+
+    def test_message_handler_renders_precompiled_template(self):
+        handler = handler_type_registry.compile(
+            "test_reward", "message", {"template": "{display_name} redeemed {reward}: {input}"})
+        handler.event_bus = mock.Mock()
+        self.assertTrue(handler(redemption()))
+        handler.event_bus.publish.assert_called_once_with(
+            "send_twitch_message", {"channel": "chan", "content": "Viewer redeemed Hydrate: hello"})
+
+    def test_concurrent_callers_wait_for_discovery(self):
+        registry = HandlerTypeRegistry()
+        self.assertTrue(handler_type_registry.has_type("message"))
+
+        def slow_discovery():
+            time.sleep(0.05)
+            registry.register_type(handler_type_registry.types["message"])
+
+        results = []
+        with mock.patch("reward_handlers.discover_handler_types", side_effect=slow_discovery) as discover:
+            threads = [threading.Thread(target=lambda: results.append(registry.has_type("message")))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results, [True] * 4)
+        discover.assert_called_once()
+
+    def test_latency_classes(self):
+        self.assertEqual(handler_type_registry.compile(
+            "r", "action_sequence", {"action_sequence_id": 3}).latency, "inline")
+        self.assertEqual(handler_type_registry.compile(
+            "r", "obs", {"request": "SetCurrentProgramScene", "data": {"sceneName": "BRB"}}).latency,
+            "background")
+
+
+class TestCatalogCompilesHandlers(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        self.db.execute_many(
+            "INSERT INTO twitch_rewards (reward_id, name, cost, handler_type, handler_config, date_added) VALUES (?, ?, 100, ?, ?, datetime('now'))",
+            [("test_msg", "Hydrate", "message", '{"template": "Drink up {username}"}'),
+             ("test_bad", "Broken", "message", '{}'),
+             ("test_plain", "Plain", "default", None)])
+        self.catalog = RewardCatalog(self.db)
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def test_handlers_are_compiled_at_load(self):
+        self.catalog.load()
+        self.assertEqual(self.catalog.get("test_msg").handler.handler_type, "message")
+        # Bad config doesn't stop the reward loading, it just has no handler
+        self.assertIsNone(self.catalog.get("test_bad").handler)
+        self.assertIsNone(self.catalog.get("test_plain").handler)
+
+
+class TestRedemptionSettlement(unittest.TestCase):
+    def setUp(self):
+        self.service = ChannelPointsService(mock.Mock())
+        self.queue = mock.Mock()
+        patcher = mock.patch("utils.redemption_status_queue.redemption_status_queue", self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self, auto_fulfill, **handler_config):
+        handler_config["template"] = "Drink up {username}"
+        handler = handler_type_registry.compile("test_reward", "message", handler_config)
+        return RewardRecord("test_reward", "Hydrate", "", 100, True, "message",
+                            handler_config, None, auto_fulfill, handler)
+
+    def handle(self, record):
+        with mock.patch.object(channel_points_module.reward_catalog, "get", return_value=record), \
+                mock.patch.object(channel_points_module.redemption_dedupe, "admit", return_value=Admission(True)), \
+                mock.patch("utils.reward_service.reward_service.record_redemption"), \
+                mock.patch.object(record.handler, "event_bus"):
+            return self.service.handle_redemption(redemption())
+
+    def test_opted_in_reward_is_fulfilled_through_status_queue(self):
+        self.assertTrue(self.handle(self.record(auto_fulfill=False, fulfill_on_success=True)))
+        self.queue.enqueue.assert_called_once_with("test_reward", "r1", "FULFILLED")
+
+    def test_manual_queue_is_left_to_the_streamer(self):
+        self.assertTrue(self.handle(self.record(auto_fulfill=False)))
+        self.queue.enqueue.assert_not_called()
+
+    def test_auto_fulfilled_reward_is_left_alone(self):
+        self.assertTrue(self.handle(self.record(auto_fulfill=True)))
+        self.queue.enqueue.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db.database import Database
+from utils import reward_sync as reward_sync_module
+from utils.reward_sync import RewardSynchronizer
+
+
+def api_reward(reward_id, title, cost):
+    return {"id": reward_id, "title": title, "cost": cost, "prompt": "",
+            "is_enabled": True, "background_color": "#FFFFFF"}
+
+
+class TestRewardSync(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.temp_dir.name, "bot.db"))
+        patcher = mock.patch.object(reward_sync_module, "db", self.db)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        catalog_patcher = mock.patch.object(reward_sync_module.reward_catalog, "load")
+        catalog_patcher.start()
+        self.addCleanup(catalog_patcher.stop)
+        self.sync = RewardSynchronizer()
+
+    def tearDown(self):
+        self.db.close_all()
+        self.temp_dir.cleanup()
+
+    def test_diff_applies_only_changes(self):
+        report = self.sync.apply_rewards([
+            api_reward("test_a", "Hydrate", 100),
+            api_reward("test_b", "Stretch", 200)])
+        self.assertEqual(sorted(report.added), ["test_a", "test_b"])
+
+        self.db.execute(
+            "UPDATE twitch_rewards SET handler_type = 'custom' WHERE reward_id = 'test_a'")
+        report = self.sync.apply_rewards([
+            api_reward("test_a", "Hydrate", 100),
+            api_reward("test_b", "Stretch", 250)])
+        self.assertEqual(report.updated, ["test_b"])
+        self.assertEqual(report.unchanged, 1)
+        self.assertFalse(report.added or report.deleted)
+
+        row = self.db.fetchone(
+            "SELECT cost, handler_type FROM twitch_rewards WHERE reward_id = 'test_b'")
+        self.assertEqual(row["cost"], 250)
+        # Local handler settings survive sync
+        self.assertEqual(self.db.fetchone(
+            "SELECT handler_type FROM twitch_rewards WHERE reward_id = 'test_a'")["handler_type"], "custom")
+
+    def test_removed_rewards_are_soft_deleted(self):
+        self.sync.apply_rewards([
+            api_reward("test_a", "Hydrate", 100),
+            api_reward("test_b", "Stretch", 200)])
+        self.db.execute(
+            "UPDATE twitch_rewards SET handler_type = 'custom' WHERE reward_id = 'test_b'")
+        self.db.execute(
+            "INSERT INTO users (twitch_user_id, twitch_username, rank, points, date_added, last_seen) VALUES ('42', 'viewer', 'viewer', 0, datetime('now'), datetime('now'))")
+        self.db.execute(
+            "INSERT INTO reward_redemptions (reward_id, user_id, redeemed_at) VALUES ('test_b', '42', datetime('now'))")
+
+        report = self.sync.apply_rewards([api_reward("test_a", "Hydrate", 100)])
+        self.assertEqual(report.deleted, ["test_b"])
+        row = self.db.fetchone(
+            "SELECT is_enabled, removed_at, handler_type FROM twitch_rewards WHERE reward_id = 'test_b'")
+        self.assertEqual(row["is_enabled"], 0)
+        self.assertIsNotNone(row["removed_at"])
+        self.assertEqual(row["handler_type"], "custom")
+        self.assertIsNotNone(self.db.fetchone(
+            "SELECT 1 FROM reward_redemptions WHERE reward_id = 'test_b'"))
+
+        # Not removed again, and restored with its settings if it comes back
+        self.assertFalse(self.sync.apply_rewards([api_reward("test_a", "Hydrate", 100)]).changed)
+        report = self.sync.apply_rewards([
+            api_reward("test_a", "Hydrate", 100), api_reward("test_b", "Stretch", 200)])
+        self.assertEqual(report.updated, ["test_b"])
+        row = self.db.fetchone(
+            "SELECT is_enabled, removed_at, handler_type FROM twitch_rewards WHERE reward_id = 'test_b'")
+        self.assertEqual((row["is_enabled"], row["removed_at"], row["handler_type"]), (1, None, "custom"))
+
+    def test_unchanged_sync_writes_nothing(self):
+        rewards = [api_reward("test_a", "Hydrate", 100)]
+        self.sync.apply_rewards(rewards)
+        with mock.patch.object(self.db, "transaction") as transaction:
+            report = self.sync.apply_rewards(rewards)
+        self.assertFalse(report.changed)
+        transaction.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
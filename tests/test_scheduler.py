@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.errors import ValidationError
+from utils.scheduler import Scheduler, CronSchedule
+
+
+class TestCronSchedule(unittest.TestCase):
+    def test_next_after(self):
+        cron = CronSchedule("30 4 * * *")
+        self.assertEqual(cron.next_after(datetime(2024, 1, 1, 5, 0)),
+                         datetime(2024, 1, 2, 4, 30))
+
+    def test_steps_ranges_and_weekdays(self):
+        cron = CronSchedule("*/15 9-17 * * 1-5")
+        # Saturday evening rolls over to Monday morning
+        self.assertEqual(cron.next_after(datetime(2024, 6, 1, 18, 0)),
+                         datetime(2024, 6, 3, 9, 0))
+        self.assertEqual(cron.next_after(datetime(2024, 6, 3, 9, 1)),
+                         datetime(2024, 6, 3, 9, 15))
+
+    def test_invalid(self):
+        with self.assertRaises(ValidationError):
+            CronSchedule("61 * * * *")
+        with self.assertRaises(ValidationError):
+            CronSchedule("* * *")
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler(workers=2)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_interval_job_runs_and_records_metrics(self):
+        ran = threading.Event()
+        self.scheduler.add_interval_job("test_job", ran.set, 60, run_immediately=True)
+        self.assertTrue(ran.wait(2))
+
+        deadline = time.time() + 2
+        while self.scheduler.get_job("test_job").runs == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        metrics = self.scheduler.metrics()[0]
+        self.assertEqual(metrics["runs"], 1)
+        self.assertEqual(metrics["failures"], 0)
+
+    def test_overlapping_run_is_skipped(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(2)
+
+        self.scheduler.add_interval_job("test_slow", slow, 60, run_immediately=True)
+        self.assertTrue(started.wait(2))
+        self.assertFalse(self.scheduler.run_now("test_slow"))
+        self.assertEqual(self.scheduler.get_job("test_slow").skipped, 1)
+        release.set()
+
+    def test_shutdown_cancels_pending_jobs(self):
+        ran = threading.Event()
+        self.scheduler.add_interval_job("test_later", ran.set, 0.2)
+        self.scheduler.shutdown()
+        self.assertFalse(ran.wait(0.4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import threading
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.errors import BetsyError
+from utils.startup import StartupGraph
+
+
+class TestStartupGraph(unittest.TestCase):
+    def test_dependencies_run_first(self):
+        calls = []
+        graph = StartupGraph()
+        graph.add_phase("connect", lambda: calls.append("connect"), depends_on=["wiring"])
+        graph.add_phase("wiring", lambda: calls.append("wiring"))
+        graph.run()
+        self.assertEqual(calls, ["wiring", "connect"])
+
+    def test_background_does_not_block_foreground(self):
+        release = threading.Event()
+        graph = StartupGraph()
+        graph.add_phase("slow_sync", lambda: release.wait(2), background=True)
+        graph.add_phase("chat", lambda: None)
+        graph.run()
+
+        self.assertEqual(graph.phases["chat"].status, "ok")
+        self.assertFalse(graph.phases["slow_sync"].done.is_set())
+        release.set()
+        self.assertTrue(graph.wait(2))
+        self.assertEqual({entry["status"] for entry in graph.report()}, {"ok"})
+
+    def test_failed_dependency_skips_dependents(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        graph = StartupGraph()
+        graph.add_phase("rewards", fail)
+        graph.add_phase("reward_sync", lambda: None, depends_on=["rewards"], background=True)
+        graph.run()
+        self.assertTrue(graph.wait(2))
+        self.assertEqual(graph.phases["rewards"].status, "failed")
+        self.assertEqual(graph.phases["reward_sync"].status, "skipped")
+
+    def test_critical_failure_aborts(self):
+        graph = StartupGraph()
+        graph.add_phase("connect", lambda: 1 / 0, critical=True)
+        with self.assertRaises(BetsyError):
+            graph.run()
+
+    def test_cycle_detected(self):
+        graph = StartupGraph()
+        graph.add_phase("a", lambda: None, depends_on=["b"])
+        graph.add_phase("b", lambda: None, depends_on=["a"])
+        with self.assertRaises(BetsyError):
+            graph.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import twitch_auth
+from utils.twitch_auth import TokenManager, OAuthToken
+
+
+def json_response(status, body):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = __import__("json").dumps(body).encode()
+    return resp
+
+
+class TestTokenManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = TokenManager()
+        self.manager.client_id = "client"
+        self.manager.client_secret = "secret"
+        self.manager.tokens = {"broadcaster": OAuthToken("broadcaster", "abc", "refresh-me")}
+        patcher = mock.patch.object(twitch_auth, "helix_client")
+        self.http = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_validates_once_and_caches_scopes(self):
+        self.http.request.return_value = json_response(200, {
+            "scopes": ["channel:read:redemptions"], "login": "betsy",
+            "user_id": "1", "expires_in": 3600})
+
+        self.assertEqual(self.manager.get_token(), "abc")
+        self.assertTrue(self.manager.has_scopes(["channel:read:redemptions"]))
+        self.assertFalse(self.manager.has_scopes(["channel:manage:redemptions"]))
+        self.assertEqual(self.http.request.call_count, 1)
+
+    def test_refreshes_before_expiry(self):
+        refreshed = []
+        self.manager.on_refresh(lambda name, token: refreshed.append((name, token)))
+        self.http.request.side_effect = [
+            json_response(200, {"scopes": [], "expires_in": 60}),
+            json_response(200, {"access_token": "new", "refresh_token": "r2", "expires_in": 14000}),
+        ]
+
+        self.assertEqual(self.manager.get_token(), "new")
+        self.assertEqual(refreshed, [("broadcaster", "new")])
+        self.assertGreater(self.manager.tokens["broadcaster"].expires_in(), 13000)
+
+    def test_chat_refresh_reconnects_chat(self):
+        from publishers.twitch_pub import twitch_pub
+
+        self.assertIn(twitch_pub._on_token_refresh, twitch_auth.token_manager._listeners)
+        with mock.patch.object(twitch_pub, "_reconnect") as reconnect, \
+                mock.patch.object(twitch_pub, "bot", object()), \
+                mock.patch.object(twitch_pub, "enabled", True), \
+                mock.patch("publishers.twitch_pub.threading.Thread") as thread:
+            twitch_pub._on_token_refresh("broadcaster", "new")
+            thread.assert_not_called()
+            twitch_pub._on_token_refresh("chat", "new")
+        thread.assert_called_once()
+        self.assertIs(thread.call_args.kwargs["target"], reconnect)
+
+    def test_maintain_revalidates_hourly(self):
+        token = self.manager.tokens["broadcaster"]
+        token.validated_at = time.time() - 2 * 60 * 60
+        token.expires_at = time.time() + 10000
+        self.http.request.return_value = json_response(200, {"scopes": [], "expires_in": 10000})
+
+        self.manager.maintain()
+        self.assertEqual(self.http.request.call_count, 1)
+        self.assertAlmostEqual(token.validated_at, time.time(), delta=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.user_resolver import UserResolver
+
+
+class FakeApi:
+    def __init__(self):
+        self.calls = []
+
+    def get_users(self, ids=None, logins=None):
+        self.calls.append((list(ids or []), list(logins or [])))
+        users = [{"id": user_id, "login": f"user{user_id}", "display_name": f"User{user_id}"}
+                 for user_id in ids or [] if user_id != "0"]
+        users.extend({"id": login[4:], "login": login, "display_name": login.title()}
+                     for login in logins or [] if login != "ghost")
+        return users
+
+
+class TestUserResolver(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeApi()
+        self.resolver = UserResolver(api=self.api)
+        self.resolver.window = 0
+
+    def test_batches_one_request_per_hundred(self):
+        users = self.resolver.get_by_logins([f"user{i}" for i in range(250)])
+        self.assertEqual(len(self.api.calls), 3)
+        self.assertEqual(users["user7"]["id"], "7")
+
+        # Both directions are cached now
+        self.assertEqual(self.resolver.get_by_id("7")["name"], "user7")
+        self.assertEqual(self.resolver.get_by_login("@User7")["id"], "7")
+        self.assertEqual(len(self.api.calls), 3)
+
+    def test_missing_users_are_remembered(self):
+        self.assertIsNone(self.resolver.get_by_login("ghost"))
+        self.assertIsNone(self.resolver.get_by_login("ghost"))
+        self.assertEqual(len(self.api.calls), 1)
+
+    def test_event_users_prime_the_cache(self):
+        self.resolver.remember({"id": "9", "name": "Viewer", "display_name": "Viewer"})
+        self.assertEqual(self.resolver.get_by_login("viewer")["id"], "9")
+        self.assertEqual(self.api.calls, [])
+
+    def test_concurrent_lookups_share_a_request(self):
+        self.resolver.window = 0.1
+        results = {}
+
+        def lookup(login):
+            results[login] = self.resolver.get_by_login(login)
+
+        threads = [threading.Thread(target=lookup, args=(f"user{i}",)) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.api.calls), 1)
+        self.assertEqual(sorted(self.api.calls[0][1]), [f"user{i}" for i in range(5)])
+        self.assertTrue(all(results.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
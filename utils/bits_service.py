@@ -0,0 +1,26 @@
+from typing import Dict, Any, Optional
+
+from core.logging import get_logger
+from db.database import db
+from db.query_plan import register_hot_query
+
+logger = get_logger("bits_service")
+
+BITS_ACTION_QUERY = register_hot_query(
+    "bits_action", "SELECT action_sequence_id FROM twitch_bits WHERE bits = ?", (100,))
+
+
+def get_bits_action(bits_used: int) -> Optional[Dict[str, Any]]:
+    try:
+        return db.fetchone(BITS_ACTION_QUERY, (bits_used,))
+    except Exception as e:
+        logger.error(f"Error checking bits actions: {e}")
+        return None
+
+
+async def aget_bits_action(bits_used: int) -> Optional[Dict[str, Any]]:
+    try:
+        return await db.afetchone(BITS_ACTION_QUERY, (bits_used,))
+    except Exception as e:
+        logger.error(f"Error checking bits actions: {e}")
+        return None
@@ -1,10 +1,16 @@
-from typing import Dict, Any, Optional, List
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
 
+from core.config import config
 from core.logging import get_logger
 from core.errors import handle_error, TwitchError
-from db.database import db
 from event_bus.bus import event_bus
+from reward_handlers.base import BACKGROUND
+from utils.reward_catalog import reward_catalog
+from utils.redemption_dedupe import redemption_dedupe
 
 logger = get_logger("channel_points_service")
 
@@ -13,6 +19,9 @@ class ChannelPointsService:
     def __init__(self, event_bus):
         self.event_bus = event_bus
         self._registered_handlers = {}
+        self.workers = config.get_int('REWARD_HANDLER_WORKERS', 2)
+        self._executor = None
+        self._executor_lock = threading.Lock()
 
     def register_handler(self, reward_id: str, handler_func):
         self._registered_handlers[reward_id] = handler_func
@@ -28,15 +37,24 @@ class ChannelPointsService:
             reward_title = reward.get("title", "Unknown Reward")
             user_input = redemption_data.get("input", "")
 
+            # Chat tag + EventSub copies and reconnect redeliveries stop here
+            admission = redemption_dedupe.admit(redemption_data)
+            if not admission.accepted:
+                logger.info(
+                    f"Dropped duplicate redemption: {username} redeemed '{reward_title}' (ID: {reward_id})")
+                if admission.paired is not None and redemption_data.get("id"):
+                    self._adopt_twitch_id(admission.paired, redemption_data["id"])
+                return False
+
             logger.info(
                 f"Processing redemption: {username} redeemed '{reward_title}' (ID: {reward_id})")
 
-            # Check if the reward exists in our database
+            # Catalog lookup is in memory; only unknown rewards touch the DB
             from utils.reward_service import reward_service
-            reward_in_db = reward_service.get_reward(reward_id)
+            catalog_reward = reward_catalog.get(reward_id)
 
             # If reward doesn't exist in DB, register it first
-            if not reward_in_db:
+            if not catalog_reward:
                 logger.info(
                     f"Registering unknown reward: {reward_title} (ID: {reward_id})")
                 reward_data = {
@@ -48,6 +66,7 @@ class ChannelPointsService:
                     "handler_type": "default"
                 }
                 reward_service.register_reward(reward_data)
+                catalog_reward = reward_catalog.get(reward_id)
 
             # Now record the redemption (should work since reward exists)
             reward_service.record_redemption(redemption_data)
@@ -55,10 +74,16 @@ class ChannelPointsService:
             # Check for registered handler
             if reward_id in self._registered_handlers:
                 logger.info(f"Found custom handler for reward ID: {reward_id}")
-                return self._registered_handlers[reward_id](redemption_data)
+                return self._settle(catalog_reward, redemption_data,
+                                    self._registered_handlers[reward_id](redemption_data))
 
-            # Check for action sequence in database
-            action_sequence_id = self._get_action_sequence_id(reward_id)
+            # Handler compiled from handler_type/handler_config at catalog load
+            handler = catalog_reward.handler if catalog_reward else None
+            if handler is not None:
+                return self._run_handler(handler, redemption_data, catalog_reward)
+
+            # Check for action sequence on the catalog record
+            action_sequence_id = catalog_reward.action_sequence_id if catalog_reward else None
             if action_sequence_id:
                 logger.info(
                     f"Found action sequence {action_sequence_id} for reward {reward_title}")
@@ -74,7 +99,7 @@ class ChannelPointsService:
                         "user_input": user_input
                     }
                 })
-                return True
+                return self._settle(catalog_reward, redemption_data, True)
 
             logger.info(f"No handler found for reward ID: {reward_id}")
             return False
@@ -83,20 +108,70 @@ class ChannelPointsService:
             handle_error(e, {"redemption_data": redemption_data})
             return False
 
-    def _get_action_sequence_id(self, reward_id: str) -> Optional[int]:
+    def _adopt_twitch_id(self, accepted: Dict[str, Any], twitch_redemption_id: str) -> None:
+        """
+        The chat copy was handled and the EventSub copy dropped; the chat copy
+        has no Twitch id, so take it from the dropped one. Without it the row
+        can't be matched by the backfill and the status can't be updated.
+        """
+        if accepted.get("id"):
+            return
+        # Picked up by record_redemption/_settle if they haven't run yet
+        accepted["id"] = twitch_redemption_id
+
+        record_id = accepted.get("record_id")
+        if record_id is not None:
+            from utils.reward_service import reward_service
+            reward_service.attach_twitch_id(record_id, twitch_redemption_id)
+        if accepted.get("handled"):
+            reward_id = accepted.get("reward", {}).get("id", "")
+            self._settle(reward_catalog.get(reward_id), accepted, True)
+
+    def _settle(self, catalog_reward, redemption_data: Dict[str, Any], handled: bool) -> bool:
+        """
+        Marks a handled redemption FULFILLED when its reward opts in with
+        handler_config "fulfill_on_success". Other queued rewards stay in the
+        streamer's manual queue to be fulfilled or refunded by hand or in
+        bulk (!reward-queue). Updates go through the batching status queue.
+        """
+        redemption_data["handled"] = handled
+        redemption_id = redemption_data.get("id")
+        if (handled and redemption_id and catalog_reward and not catalog_reward.auto_fulfill
+                and catalog_reward.handler_config.get("fulfill_on_success")):
+            from utils.redemption_status_queue import redemption_status_queue
+            redemption_status_queue.enqueue(catalog_reward.reward_id, redemption_id, "FULFILLED")
+        return handled
+
+    def _run_handler(self, handler: Callable[[Dict[str, Any]], bool],
+                     redemption_data: Dict[str, Any], catalog_reward=None) -> bool:
+        if getattr(handler, "latency", None) != BACKGROUND:
+            return self._settle(catalog_reward, redemption_data, handler(redemption_data))
+
+        # Slow handlers (DB, commands, OBS) don't hold up the event thread
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="RewardHandler")
+            self._executor.submit(self._run_background, handler, redemption_data, catalog_reward)
+        return True
+
+    def _run_background(self, handler, redemption_data: Dict[str, Any], catalog_reward=None) -> None:
         try:
-            reward_action = db.fetchone(
-                "SELECT action_sequence_id FROM twitch_rewards WHERE reward_id = ?",
-                (reward_id,)
-            )
+            if not self._settle(catalog_reward, redemption_data, handler(redemption_data)):
+                logger.warning(f"{handler!r} did not handle redemption")
+        except Exception as e:
+            handle_error(e, {"context": "reward_handler", "handler": repr(handler)})
 
-            if reward_action and reward_action.get('action_sequence_id'):
-                return reward_action['action_sequence_id']
-            return None
+    def shutdown(self) -> None:
+        """Waits for background handlers still running."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
 
-        except Exception as e:
-            logger.error(f"Error getting action sequence ID: {e}")
-            return None
+    def _get_action_sequence_id(self, reward_id: str) -> Optional[int]:
+        record = reward_catalog.get(reward_id)
+        return record.action_sequence_id if record else None
 
 
 # Singleton instance
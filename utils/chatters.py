@@ -0,0 +1,53 @@
+import random
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Optional, Iterable
+
+from core.config import config
+
+
+class ChatterTracker:
+    """
+    Who has spoken recently, oldest first. Updating on every message is an
+    O(1) move-to-end; expired names are trimmed from the front on read.
+    """
+
+    def __init__(self):
+        self.window = config.get_int('CHATTER_ACTIVE_MINUTES', 10) * 60
+        self.max_entries = config.get_int('CHATTER_MAX_ENTRIES', 5000)
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, name: Optional[str]) -> None:
+        if not name or name == "unknown":
+            return
+        with self._lock:
+            self._seen[name.lower()] = time.monotonic()
+            self._seen.move_to_end(name.lower())
+            if len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+
+    def _trim(self) -> None:
+        """Caller holds the lock."""
+        cutoff = time.monotonic() - self.window
+        while self._seen:
+            name, last_seen = next(iter(self._seen.items()))
+            if last_seen >= cutoff:
+                break
+            self._seen.popitem(last=False)
+
+    def active(self):
+        with self._lock:
+            self._trim()
+            return list(self._seen)
+
+    def random(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        excluded = {name.lower() for name in exclude if name}
+        candidates = [name for name in self.active() if name not in excluded]
+        return random.choice(candidates) if candidates else None
+
+
+# Singleton instance
+chatters = ChatterTracker()
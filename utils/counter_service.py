@@ -0,0 +1,119 @@
+import re
+import threading
+
+from collections import defaultdict
+from typing import Any, Dict, Tuple
+
+from core.config import config
+from core.errors import DatabaseError, handle_error
+from core.logging import get_logger
+from db.database import db
+
+logger = get_logger("counter_service")
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# (table, counter column, key column)
+Counter = Tuple[str, str, str]
+
+
+class CounterService:
+    """
+    Usage counters aggregated in memory per (table, column, key) and written
+    in one transaction per flush, so a burst of increments costs one UPDATE
+    per distinct key rather than one per use. Reads add whatever is still
+    pending to the stored value.
+    """
+
+    def __init__(self, database=db):
+        self.db = database
+        self.interval = config.get_float('COUNTER_FLUSH_SECONDS', 5.0)
+        self._pending: Dict[Counter, Dict[Any, int]] = defaultdict(dict)
+        self._in_flight: Dict[Counter, Dict[Any, int]] = {}
+        self._lock = threading.Lock()
+        # Held from swap to commit so readers never see a batch twice or not at all
+        self._flush_lock = threading.Lock()
+
+    @staticmethod
+    def _check(counter: Counter) -> Counter:
+        for name in counter:
+            if not _IDENTIFIER.match(name):
+                raise DatabaseError(f"Invalid identifier in counter: {name}")
+        return counter
+
+    def increment(self, table: str, column: str, key_column: str, key: Any, amount: int = 1) -> None:
+        counter = self._check((table, column, key_column))
+        with self._lock:
+            values = self._pending[counter]
+            values[key] = values.get(key, 0) + amount
+
+    def pending(self, table: str, column: str, key_column: str, key: Any) -> int:
+        """Increments not yet committed, including a flush in progress."""
+        counter = (table, column, key_column)
+        with self._lock:
+            return (self._pending.get(counter, {}).get(key, 0)
+                    + self._in_flight.get(counter, {}).get(key, 0))
+
+    def get(self, table: str, column: str, key_column: str, key: Any) -> int:
+        """Persisted value plus pending increments; 0 for a missing row."""
+        table, column, key_column = self._check((table, column, key_column))
+        with self._flush_lock:
+            row = self.db.fetchone(
+                f"SELECT {column} FROM {table} WHERE {key_column} = ?", (key,))
+            stored = (row[column] or 0) if row else 0
+            return stored + self.pending(table, column, key_column, key)
+
+    def flush(self) -> int:
+        """Writes pending increments; returns the number of rows touched."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = dict(self._pending), defaultdict(dict)
+                self._in_flight = batch
+
+            rows = sum(len(values) for values in batch.values())
+            try:
+                with self.db.transaction():
+                    for (table, column, key_column), values in batch.items():
+                        self.db.execute_many(
+                            f"UPDATE {table} SET {column} = {column} + ? WHERE {key_column} = ?",
+                            [(amount, key) for key, amount in values.items()])
+            except Exception as e:
+                # Put the batch back so the next flush retries it
+                with self._lock:
+                    for counter, values in batch.items():
+                        target = self._pending[counter]
+                        for key, amount in values.items():
+                            target[key] = target.get(key, 0) + amount
+                    self._in_flight = {}
+                handle_error(e, {"context": "counter_flush", "rows": rows})
+                return 0
+
+            with self._lock:
+                self._in_flight = {}
+        logger.debug(f"Flushed {rows} usage counters")
+        return rows
+
+    def discard(self) -> int:
+        """Drops increments not yet written, e.g. after a restore replaced the rows they belong to."""
+        with self._flush_lock:
+            with self._lock:
+                rows = sum(len(values) for values in self._pending.values())
+                self._pending = defaultdict(dict)
+        if rows:
+            logger.info(f"Discarded {rows} pending usage counters")
+        return rows
+
+    def start(self) -> None:
+        from utils.scheduler import scheduler
+        scheduler.add_interval_job("counter_flush", self.flush, self.interval)
+
+    def stop(self) -> None:
+        from utils.scheduler import scheduler
+        scheduler.remove_job("counter_flush")
+        self.flush()
+
+
+# Singleton instance
+counter_service = CounterService()
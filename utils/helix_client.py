@@ -0,0 +1,246 @@
+import copy
+import random
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, List, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.config import config
+from core.logging import get_logger
+from core.errors import NetworkError
+
+logger = get_logger("helix_client")
+
+HELIX_URL = "https://api.twitch.tv/helix"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Dict, or a list of pairs for repeated keys (id=...&id=...)
+Params = Optional[Union[Dict[str, Any], List[Tuple[str, Any]]]]
+
+
+class RateLimiter:
+    """
+    Tracks Helix's Ratelimit-Remaining/Ratelimit-Reset headers. Each request
+    takes a slot locally before it is sent, so concurrent callers don't all
+    spend the last point in the bucket at once.
+    """
+
+    def __init__(self, reserve: int = 1):
+        self.reserve = reserve
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire_delay(self) -> float:
+        """Takes a slot and returns how long to wait before sending."""
+        with self._lock:
+            now = time.time()
+            if self.remaining is None or now >= self.reset_at:
+                # Unknown or refilled bucket; the response will tell us
+                if self.remaining is not None and now >= self.reset_at:
+                    self.remaining = self.limit
+                return 0.0
+            if self.remaining > self.reserve:
+                self.remaining -= 1
+                return 0.0
+            return self.reset_at - now
+
+    def update(self, headers) -> None:
+        try:
+            remaining = headers.get("Ratelimit-Remaining")
+            reset = headers.get("Ratelimit-Reset")
+            limit = headers.get("Ratelimit-Limit")
+        except AttributeError:
+            return
+
+        with self._lock:
+            if limit is not None:
+                self.limit = int(limit)
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if reset is not None:
+                self.reset_at = float(reset)
+
+    def retry_after(self, headers) -> Optional[float]:
+        """Seconds until the bucket refills, from a 429 response."""
+        reset = headers.get("Ratelimit-Reset")
+        if reset is None:
+            return None
+        return max(0.0, float(reset) - time.time())
+
+
+class ResponseCache:
+    """
+    Cache of parsed Helix GET bodies keyed by path and params. Fresh entries
+    are served without a request; stale ones that carried an ETag are
+    revalidated with If-None-Match, so an unchanged resource costs a 304
+    instead of a full body. Least recently used entries are dropped past
+    max_entries.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 256):
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries: "OrderedDict[Tuple[str, Tuple], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path: str, params: Params = None) -> Tuple[str, Tuple]:
+        items = params.items() if isinstance(params, dict) else (params or ())
+        return path.strip("/"), tuple(sorted((str(k), str(v)) for k, v in items))
+
+    def ttl_for(self, path: str) -> Optional[float]:
+        return self.ttls.get(path.strip("/"))
+
+    def get(self, key: Tuple[str, Tuple]) -> Tuple[Optional[Any], Optional[str]]:
+        """Returns (body if still fresh, ETag to revalidate with)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            if time.monotonic() < entry["expires_at"]:
+                self.hits += 1
+                return copy.deepcopy(entry["body"]), None
+            self.misses += 1
+            return None, entry["etag"]
+
+    def put(self, key: Tuple[str, Tuple], body: Any, etag: Optional[str] = None) -> None:
+        ttl = self.ttl_for(key[0])
+        if not ttl:
+            return
+        with self._lock:
+            self._entries[key] = {"body": copy.deepcopy(body), "etag": etag,
+                                  "expires_at": time.monotonic() + ttl}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def revalidate(self, key: Tuple[str, Tuple]) -> Optional[Any]:
+        """Marks a stale entry fresh again after a 304 and returns its body."""
+        ttl = self.ttl_for(key[0])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not ttl:
+                return None
+            entry["expires_at"] = time.monotonic() + ttl
+            self.revalidated += 1
+            return copy.deepcopy(entry["body"])
+
+    def invalidate(self, path: str) -> int:
+        """Drops every entry for path, whatever its params."""
+        path = path.strip("/")
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == path]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class HelixClient:
+    """
+    Pooled HTTP client for the Twitch API. Requests go through one
+    keep-alive session, carry a timeout, wait out the rate limit when the
+    bucket is empty and retry 429/5xx/connection errors with jittered
+    exponential backoff.
+    """
+
+    def __init__(self, base_url: str = HELIX_URL):
+        self.base_url = base_url
+        self.timeout = (config.get_float('TWITCH_API_CONNECT_TIMEOUT', 3.05),
+                        config.get_float('TWITCH_API_TIMEOUT', 10.0))
+        self.max_retries = config.get_int('TWITCH_API_MAX_RETRIES', 3)
+        self.backoff = config.get_float('TWITCH_API_BACKOFF_SECONDS', 0.5)
+        self.max_backoff = config.get_float('TWITCH_API_MAX_BACKOFF_SECONDS', 30.0)
+        self.pool_size = config.get_int('TWITCH_API_POOL_SIZE', 10)
+        self.limiter = RateLimiter()
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def _url(self, path: str) -> str:
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _backoff_delay(self, attempt: int, status: Optional[int], headers) -> float:
+        if status == 429 and headers is not None:
+            retry_after = self.limiter.retry_after(headers)
+            if retry_after is not None:
+                return min(retry_after + random.uniform(0, 0.25), self.max_backoff)
+        # Full jitter so retrying callers don't line up
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def request(self, method: str, path: str, params: Params = None,
+                json: Any = None, headers: Optional[Dict[str, str]] = None,
+                rate_limited: bool = True) -> requests.Response:
+        url = self._url(path)
+        attempt = 0
+        while True:
+            if rate_limited:
+                delay = self.limiter.acquire_delay()
+                if delay > 0:
+                    logger.warning(f"Helix rate limit reached, waiting {delay:.1f}s")
+                    time.sleep(delay)
+
+            status = None
+            response_headers = None
+            try:
+                response = self.session.request(
+                    method, url, params=params, json=json, headers=headers, timeout=self.timeout)
+                if rate_limited:
+                    self.limiter.update(response.headers)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                status = response.status_code
+                response_headers = response.headers
+                failure = f"HTTP {status}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                failure = str(e)
+
+            if attempt >= self.max_retries:
+                if status is not None:
+                    # Let the caller read the error body
+                    return response
+                raise NetworkError(f"{method} {url} failed after {attempt + 1} attempts: {failure}")
+
+            delay = self._backoff_delay(attempt, status, response_headers)
+            logger.warning(
+                f"{method} {url} failed ({failure}), retrying in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session:
+                self._session.close()
+                self._session = None
+
+
+# Singleton instance
+helix_client = HelixClient()
@@ -0,0 +1,186 @@
+import time
+
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, NamedTuple, Set
+
+from core.config import config
+from core.logging import get_logger
+from core.errors import handle_error, NetworkError
+from db.database import db, select_query
+from event_bus.registry import event_registry
+from utils.reward_catalog import reward_catalog
+from utils.twitch_api_client import twitch_api
+
+logger = get_logger("redemption_backfill")
+
+BACKFILL_STATE_QUERY = select_query(
+    "redemption_backfill_state", ("reward_id", "last_redeemed_at"))
+# Only ever written from Helix redeemed_at, so the mark and the timestamps it
+# is compared against come from the same clock
+BACKFILL_MARK_QUERY = """
+    INSERT INTO redemption_backfill_state (reward_id, last_redeemed_at, updated_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(reward_id) DO UPDATE SET
+        last_redeemed_at = MAX(last_redeemed_at, excluded.last_redeemed_at),
+        updated_at = excluded.updated_at
+"""
+
+
+class BackfillReport(NamedTuple):
+    rewards: int
+    fetched: int
+    published: int
+    failed: int = 0
+
+    def summary(self) -> str:
+        return (f"{self.published} redemptions replayed from {self.rewards} rewards "
+                f"({self.fetched} fetched, {self.failed} failed)")
+
+
+def parse_redeemed_at(value: str) -> float:
+    """Helix RFC 3339 timestamp (up to nanoseconds, 'Z' suffix) to epoch seconds."""
+    value = value.rstrip("Z")
+    if "." in value:
+        whole, fraction = value.split(".", 1)
+        value = f"{whole}.{fraction[:6]}"
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
+
+def map_api_redemption(api_redemption: Dict[str, Any], channel: Optional[str]) -> Dict[str, Any]:
+    """Maps a Helix redemption onto the redemption event shape."""
+    reward = api_redemption.get("reward", {})
+    return {
+        "id": api_redemption["id"],
+        "user": {
+            "id": api_redemption.get("user_id", "unknown"),
+            "name": api_redemption.get("user_login", "unknown"),
+            "display_name": api_redemption.get("user_name", "unknown")
+        },
+        "channel": api_redemption.get("broadcaster_login") or channel or "unknown",
+        "reward": {
+            "id": reward.get("id", "unknown"),
+            "title": reward.get("title", "Unknown Reward"),
+            "cost": reward.get("cost", 0),
+            "prompt": reward.get("prompt", "")
+        },
+        "input": api_redemption.get("user_input", ""),
+        "status": "fulfilled",
+        "timestamp": parse_redeemed_at(api_redemption["redeemed_at"])
+    }
+
+
+class RedemptionBackfill:
+    """
+    Replays redemptions made while the bot was offline. Each queued reward
+    is paged newest first and paging stops at the reward's high-water mark,
+    so a reconnect only fetches what was missed. The mark is owned by the
+    backfill and only advanced from Helix timestamps; redemptions already
+    recorded live are recognised by their Twitch id and not replayed.
+    """
+
+    def __init__(self, api=twitch_api, database=db):
+        self.api = api
+        self.db = database
+        self.broadcaster_id = config.get('CHANNEL_ID')
+        self.channel = config.get('CHANNEL')
+        # How far back to look for a reward with no high-water mark yet
+        self.max_age = config.get_int('REDEMPTION_BACKFILL_MAX_AGE_MINUTES', 60) * 60
+
+    def get_marks(self) -> Dict[str, float]:
+        return {row["reward_id"]: row["last_redeemed_at"]
+                for row in self.db.iterate(BACKFILL_STATE_QUERY)}
+
+    def recorded_ids(self, redemption_ids: List[str], chunk_size: int = 500) -> Set[str]:
+        """Which of these Twitch redemption ids were already recorded."""
+        recorded = set()
+        for start in range(0, len(redemption_ids), chunk_size):
+            chunk = redemption_ids[start:start + chunk_size]
+            placeholders = ", ".join("?" * len(chunk))
+            recorded.update(row["twitch_redemption_id"] for row in self.db.iterate(
+                f"SELECT twitch_redemption_id FROM reward_redemptions WHERE twitch_redemption_id IN ({placeholders})",
+                tuple(chunk)))
+        return recorded
+
+    def fetch_missed(self, reward_id: str, since: float) -> List[Dict[str, Any]]:
+        """Unfulfilled redemptions of a reward newer than since, oldest first."""
+        missed = []
+        for api_redemption in self.api.iter_redemptions(
+                self.broadcaster_id, reward_id, status="UNFULFILLED", sort="NEWEST"):
+            try:
+                redemption = map_api_redemption(api_redemption, self.channel)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Skipping malformed redemption from API: {e}")
+                continue
+            if redemption["timestamp"] <= since:
+                break
+            missed.append(redemption)
+        missed.reverse()
+        return missed
+
+    def run(self) -> BackfillReport:
+        if not self.broadcaster_id:
+            logger.error("Cannot backfill redemptions: CHANNEL_ID not configured")
+            return BackfillReport(0, 0, 0)
+
+        marks = self.get_marks()
+        default_since = time.time() - self.max_age
+        rewards = fetched = published = failed = 0
+
+        for reward_id, record in list(reward_catalog.all().items()):
+            # Skip-queue rewards are fulfilled on redemption; nothing to find
+            if record.auto_fulfill:
+                continue
+
+            rewards += 1
+            try:
+                missed = self.fetch_missed(reward_id, marks.get(reward_id, default_since))
+            except NetworkError as e:
+                # Rewards created outside this client ID can't be read back
+                failed += 1
+                logger.warning(f"Could not backfill reward {record.name} ({reward_id}): {e}")
+                continue
+
+            fetched += len(missed)
+            recorded = self.recorded_ids([redemption["id"] for redemption in missed])
+            for redemption in missed:
+                if redemption["id"] in recorded:
+                    continue
+                try:
+                    event_registry.create_and_publish_event(
+                        "twitch_channel_point_redemption", redemption)
+                    published += 1
+                except Exception as e:
+                    failed += 1
+                    handle_error(e, {"context": "redemption_backfill",
+                                 "redemption_id": redemption["id"]})
+
+            if missed:
+                # Advance the mark even if a handler dropped the redemption,
+                # so it isn't replayed on every reconnect
+                self.db.execute(BACKFILL_MARK_QUERY, (
+                    reward_id, missed[-1]["timestamp"], datetime.now().isoformat()))
+
+        report = BackfillReport(rewards, fetched, published, failed)
+        if fetched or failed:
+            logger.info(f"Redemption backfill: {report.summary()}")
+        else:
+            logger.debug(f"Redemption backfill: nothing missed across {rewards} rewards")
+        return report
+
+    def start(self, interval_minutes: int = 15) -> None:
+        """
+        Runs now, after every chat reconnect and every interval_minutes as a
+        safety net for EventSub notifications lost without a disconnect.
+        """
+        from utils.scheduler import scheduler
+        from event_bus.bus import event_bus
+
+        scheduler.add_interval_job(
+            "redemption_backfill", self.run, max(1, interval_minutes) * 60,
+            jitter=30, run_immediately=True)
+        event_bus.subscribe(
+            "twitch_ready", lambda _: scheduler.run_now("redemption_backfill"))
+
+
+# Singleton instance
+redemption_backfill = RedemptionBackfill()
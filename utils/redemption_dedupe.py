@@ -0,0 +1,111 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, NamedTuple
+
+from core.config import config
+from core.logging import get_logger
+
+logger = get_logger("redemption_dedupe")
+
+
+class Admission(NamedTuple):
+    accepted: bool
+    # For a dropped copy that paired with an accepted one from the other
+    # source: that accepted copy's data, so the survivor can adopt whatever
+    # only the dropped copy carried (the Twitch redemption id)
+    paired: Optional[Dict[str, Any]] = None
+
+
+class RedemptionDeduplicator:
+    """
+    Drops repeat deliveries of one redemption before any work is done.
+
+    Deliveries carrying an id (EventSub redemption id, chat message id) are
+    deduplicated on that id. The chat tag and EventSub copies of one
+    redemption share no id, so they are paired up through a
+    user+reward+time bucket: each copy from one source cancels one unmatched
+    copy from the other, and admit() hands back the copy it cancelled.
+    """
+
+    def __init__(self):
+        self.window = config.get_int('REDEMPTION_DEDUPE_WINDOW_SECONDS', 300)
+        self.bucket_seconds = config.get_int(
+            'REDEMPTION_DEDUPE_BUCKET_SECONDS', 5)
+        self.max_entries = config.get_int(
+            'REDEMPTION_DEDUPE_MAX_ENTRIES', 10000)
+        # key -> expiry, oldest first so expiry pops from the front
+        self._seen = OrderedDict()
+        # bucket key -> {"chat": [unmatched accepted chat copies], "eventsub": [...]}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def _evict(self, now: float) -> None:
+        while self._seen:
+            expires = next(iter(self._seen.values()))
+            if expires > now and len(self._seen) <= self.max_entries:
+                break
+            self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        key, _ = self._seen.popitem(last=False)
+        self._buckets.pop(key, None)
+
+    def _bucket_keys(self, data: Dict[str, Any], timestamp: float) -> List[str]:
+        user_id = data.get("user", {}).get("id", "")
+        reward_id = data.get("reward", {}).get("id", "")
+        bucket = int(timestamp // self.bucket_seconds)
+        # Copies straddling a bucket boundary land in a neighbour
+        return [f"bucket:{user_id}:{reward_id}:{b}" for b in (bucket, bucket - 1, bucket + 1)]
+
+    def _mark(self, key: str, now: float) -> None:
+        self._seen[key] = now + self.window
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_entries:
+            self._pop_oldest()
+
+    def accept(self, data: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """Returns False when data is a duplicate that should be dropped."""
+        return self.admit(data, now).accepted
+
+    def admit(self, data: Dict[str, Any], now: Optional[float] = None) -> Admission:
+        now = time.time() if now is None else now
+        redemption_id = data.get("id")
+        message_id = data.get("message_id")
+        source = "eventsub" if redemption_id else "chat"
+        other = "chat" if redemption_id else "eventsub"
+        delivery_id = f"redemption:{redemption_id}" if redemption_id else (
+            f"message:{message_id}" if message_id else None)
+
+        with self._lock:
+            self._evict(now)
+
+            if delivery_id and delivery_id in self._seen:
+                self.dropped += 1
+                return Admission(False)
+            if delivery_id:
+                self._mark(delivery_id, now)
+
+            bucket_keys = self._bucket_keys(data, data.get("timestamp") or now)
+            for key in bucket_keys:
+                copies = self._buckets.get(key)
+                if copies and copies[other]:
+                    self.dropped += 1
+                    return Admission(False, copies[other].pop(0))
+
+            key = bucket_keys[0]
+            copies = self._buckets.setdefault(key, {"chat": [], "eventsub": []})
+            copies[source].append(data)
+            self._mark(key, now)
+            return Admission(True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seen.clear()
+            self._buckets.clear()
+
+
+# Singleton instance
+redemption_dedupe = RedemptionDeduplicator()
@@ -0,0 +1,169 @@
+import threading
+import time
+
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+from core.config import config
+from core.logging import get_logger
+from core.errors import handle_error, ValidationError
+from utils.twitch_api_client import twitch_api, REDEMPTION_BATCH_SIZE
+
+logger = get_logger("redemption_status_queue")
+
+VALID_STATUSES = ("FULFILLED", "CANCELED")
+
+StatusCallback = Callable[[str, bool], None]
+
+
+class RedemptionStatusQueue:
+    """
+    Collects redemption status changes per (reward, status) and sends them
+    as batched PATCHes: a group is flushed as soon as it holds a full batch,
+    otherwise once its oldest entry has waited flush_interval seconds.
+    """
+
+    def __init__(self, api=twitch_api):
+        self.api = api
+        self.broadcaster_id = config.get('CHANNEL_ID')
+        self.flush_interval = config.get_float('REDEMPTION_STATUS_FLUSH_SECONDS', 2.0)
+        self.batch_size = REDEMPTION_BATCH_SIZE
+        # (reward_id, status) -> {"ids": {redemption_id: callback}, "since": first enqueue}
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self.sent_requests = 0
+
+    def enqueue(self, reward_id: str, redemption_id: str, status: str = "FULFILLED",
+                callback: Optional[StatusCallback] = None) -> None:
+        status = status.upper()
+        if status not in VALID_STATUSES:
+            raise ValidationError(f"Invalid redemption status: {status}")
+
+        with self._condition:
+            group = self._pending.setdefault(
+                (reward_id, status), {"ids": {}, "since": time.monotonic()})
+            group["ids"][redemption_id] = callback
+            self._condition.notify()
+        self._ensure_started()
+
+    def enqueue_many(self, reward_id: str, redemption_ids: List[str], status: str = "FULFILLED",
+                     callback: Optional[StatusCallback] = None) -> None:
+        for redemption_id in redemption_ids:
+            self.enqueue(reward_id, redemption_id, status, callback)
+
+    def queue_unfulfilled(self, reward_id: str, status: str = "FULFILLED",
+                          callback: Optional[StatusCallback] = None) -> int:
+        """
+        Queues every UNFULFILLED redemption of a reward for status, e.g. to
+        clear a manual queue after the stream. Returns how many were queued.
+        """
+        status = status.upper()
+        if status not in VALID_STATUSES:
+            raise ValidationError(f"Invalid redemption status: {status}")
+
+        redemption_ids = [redemption["id"] for redemption in self.api.iter_redemptions(
+            self.broadcaster_id, reward_id, status="UNFULFILLED", sort="OLDEST")
+            if redemption.get("id")]
+        self.enqueue_many(reward_id, redemption_ids, status, callback)
+        return len(redemption_ids)
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return sum(len(group["ids"]) for group in self._pending.values())
+
+    def _take_due(self, force: bool = False) -> List[Tuple[str, str, Dict[str, Optional[StatusCallback]]]]:
+        """Pops the groups that should be sent now (caller holds the lock)."""
+        now = time.monotonic()
+        due = []
+        for key, group in list(self._pending.items()):
+            ids = group["ids"]
+            full = len(ids) >= self.batch_size
+            if force or full or now - group["since"] >= self.flush_interval:
+                if full and not force:
+                    # Send whole batches only; the remainder keeps waiting
+                    batch_count = len(ids) - len(ids) % self.batch_size
+                    taken = dict(list(ids.items())[:batch_count])
+                    for redemption_id in taken:
+                        del ids[redemption_id]
+                    if not ids:
+                        del self._pending[key]
+                else:
+                    taken = ids
+                    del self._pending[key]
+                due.append((key[0], key[1], taken))
+        return due
+
+    def _send(self, due) -> Dict[str, bool]:
+        results = {}
+        for reward_id, status, entries in due:
+            ids = list(entries)
+            outcomes = self.api.update_redemption_statuses(
+                self.broadcaster_id, reward_id, ids, status)
+            self.sent_requests += (len(ids) + self.batch_size - 1) // self.batch_size
+            failed = [redemption_id for redemption_id, ok in outcomes.items() if not ok]
+            logger.info(
+                f"Set {status} on {len(ids) - len(failed)}/{len(ids)} redemptions of reward {reward_id}")
+            if failed:
+                logger.warning(f"Status update failed for redemptions: {', '.join(failed[:10])}"
+                               + (" ..." if len(failed) > 10 else ""))
+
+            for redemption_id, callback in entries.items():
+                ok = outcomes.get(redemption_id, False)
+                results[redemption_id] = ok
+                if callback:
+                    try:
+                        callback(redemption_id, ok)
+                    except Exception as e:
+                        handle_error(e, {"context": "redemption_status_callback",
+                                     "redemption_id": redemption_id})
+        return results
+
+    def flush(self) -> Dict[str, bool]:
+        """Sends everything pending now; returns the outcome per redemption id."""
+        with self._condition:
+            due = self._take_due(force=True)
+        return self._send(due)
+
+    def _ensure_started(self) -> None:
+        with self._condition:
+            if self._thread or self._stopping:
+                return
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name="RedemptionStatusQueue")
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                due = self._take_due()
+                if not due:
+                    if self._pending:
+                        oldest = min(group["since"] for group in self._pending.values())
+                        timeout = max(0.0, oldest + self.flush_interval - time.monotonic())
+                    else:
+                        timeout = None
+                    self._condition.wait(timeout)
+                    continue
+            try:
+                self._send(due)
+            except Exception as e:
+                handle_error(e, {"context": "redemption_status_flush"})
+
+    def stop(self) -> Dict[str, bool]:
+        """Stops the worker and sends anything still pending."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread:
+            thread.join(timeout=5)
+        with self._condition:
+            self._thread = None
+        return self.flush()
+
+
+# Singleton instance
+redemption_status_queue = RedemptionStatusQueue()
@@ -0,0 +1,143 @@
+import json
+import threading
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Mapping, Callable
+
+from core.logging import get_logger
+from core.errors import handle_error, ValidationError
+from db.database import db, select_query
+from reward_handlers.registry import handler_type_registry
+
+logger = get_logger("reward_catalog")
+
+CATALOG_COLUMNS = ("reward_id", "name", "description", "cost", "is_enabled",
+                   "handler_type", "handler_config", "action_sequence_id", "auto_fulfill")
+# Rewards removed on Twitch stay in the table for their history only
+CATALOG_QUERY = select_query("twitch_rewards", CATALOG_COLUMNS, where="removed_at IS NULL")
+CATALOG_ENTRY_QUERY = select_query(
+    "twitch_rewards", CATALOG_COLUMNS, where="reward_id = ? AND removed_at IS NULL")
+
+
+@dataclass(frozen=True)
+class RewardRecord:
+    reward_id: str
+    name: str
+    description: str
+    cost: int
+    is_enabled: bool
+    handler_type: str
+    handler_config: Mapping[str, Any]
+    action_sequence_id: Optional[int]
+    auto_fulfill: bool
+    # Compiled once from handler_type/handler_config; None means the reward
+    # only triggers its action sequence
+    handler: Optional[Callable[[Dict[str, Any]], bool]] = field(
+        default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "RewardRecord":
+        handler_config = {}
+        if row.get("handler_config"):
+            try:
+                handler_config = json.loads(row["handler_config"])
+            except (TypeError, ValueError):
+                logger.warning(
+                    f"Invalid handler_config for reward {row['reward_id']}")
+
+        handler_type = row.get("handler_type") or "default"
+        handler = None
+        try:
+            handler = handler_type_registry.compile(
+                row["reward_id"], handler_type, handler_config)
+        except ValidationError as e:
+            logger.warning(
+                f"Handler for reward {row['reward_id']} not loaded: {e.message}")
+
+        return cls(
+            reward_id=row["reward_id"],
+            name=row["name"],
+            description=row.get("description") or "",
+            cost=row.get("cost") or 0,
+            is_enabled=bool(row["is_enabled"]) if row.get("is_enabled") is not None else True,
+            handler_type=handler_type,
+            handler_config=MappingProxyType(handler_config),
+            action_sequence_id=row.get("action_sequence_id"),
+            auto_fulfill=bool(row["auto_fulfill"]) if row.get("auto_fulfill") is not None else True,
+            handler=handler
+        )
+
+
+class RewardCatalog:
+    """
+    Immutable reward_id -> RewardRecord map. Readers never lock: every change
+    builds a new map and swaps the reference in one assignment.
+    """
+
+    def __init__(self, database=db):
+        self.db = database
+        self._rewards: Mapping[str, RewardRecord] = MappingProxyType({})
+        self._write_lock = threading.Lock()
+        self.loaded = False
+
+    def load(self) -> int:
+        try:
+            rewards = {row["reward_id"]: RewardRecord.from_row(row)
+                       for row in self.db.iterate(CATALOG_QUERY)}
+            with self._write_lock:
+                self._rewards = MappingProxyType(rewards)
+                self.loaded = True
+            logger.info(f"Loaded {len(rewards)} rewards into catalog")
+            return len(rewards)
+        except Exception as e:
+            handle_error(e, {"context": "reward_catalog_load"})
+            return 0
+
+    def refresh(self, reward_id: str) -> Optional[RewardRecord]:
+        """Re-reads one reward after a write and swaps in an updated map."""
+        try:
+            row = self.db.fetchone(CATALOG_ENTRY_QUERY, (reward_id,))
+        except Exception as e:
+            handle_error(e, {"context": "reward_catalog_refresh",
+                         "reward_id": reward_id})
+            return None
+
+        if row is None:
+            self.remove(reward_id)
+            return None
+
+        record = RewardRecord.from_row(row)
+        with self._write_lock:
+            rewards = dict(self._rewards)
+            rewards[reward_id] = record
+            self._rewards = MappingProxyType(rewards)
+        return record
+
+    def remove(self, reward_id: str) -> None:
+        with self._write_lock:
+            if reward_id not in self._rewards:
+                return
+            rewards = dict(self._rewards)
+            del rewards[reward_id]
+            self._rewards = MappingProxyType(rewards)
+
+    def get(self, reward_id: str) -> Optional[RewardRecord]:
+        if not self.loaded:
+            self.load()
+        return self._rewards.get(reward_id)
+
+    def all(self) -> Mapping[str, RewardRecord]:
+        if not self.loaded:
+            self.load()
+        return self._rewards
+
+    def __len__(self) -> int:
+        return len(self._rewards)
+
+    def __contains__(self, reward_id: str) -> bool:
+        return self.get(reward_id) is not None
+
+
+# Singleton instance
+reward_catalog = RewardCatalog()
@@ -5,12 +5,21 @@ from datetime import datetime
 
 from core.logging import get_logger
 from core.errors import handle_error, ValidationError, TwitchError
+from db.archive import user_redemptions_query
 from db.database import db
-from event_bus.bus import event_bus
+from db.query_plan import register_hot_query
 from utils.channel_points_service import channel_points_service
+from utils.counter_service import counter_service
+from utils.reward_catalog import reward_catalog
+from reward_handlers.registry import handler_type_registry
 
 logger = get_logger("reward_service")
 
+REWARD_BY_ID_QUERY = register_hot_query(
+    "reward_by_id", "SELECT * FROM twitch_rewards WHERE reward_id = ?", ("0",))
+USER_REDEMPTIONS_QUERY = register_hot_query(
+    "user_redemptions", user_redemptions_query("reward_redemptions"), ("0", 10))
+
 
 class RewardService:
     def __init__(self):
@@ -30,18 +39,25 @@ class RewardService:
 
     def get_all_rewards(self) -> List[Dict[str, Any]]:
         try:
-            return db.fetchall("SELECT * FROM twitch_rewards ORDER BY cost ASC")
+            return db.fetchall("SELECT * FROM twitch_rewards WHERE removed_at IS NULL ORDER BY cost ASC")
         except Exception as e:
             handle_error(e, {"context": "get_all_rewards"})
             return []
 
     def get_reward(self, reward_id: str) -> Optional[Dict[str, Any]]:
         try:
-            return db.fetchone("SELECT * FROM twitch_rewards WHERE reward_id = ?", (reward_id,))
+            return db.fetchone(REWARD_BY_ID_QUERY, (reward_id,))
         except Exception as e:
             handle_error(e, {"context": "get_reward", "reward_id": reward_id})
             return None
 
+    async def aget_reward(self, reward_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await db.afetchone(REWARD_BY_ID_QUERY, (reward_id,))
+        except Exception as e:
+            handle_error(e, {"context": "aget_reward", "reward_id": reward_id})
+            return None
+
     def register_reward(self, reward_data: Dict[str, Any]) -> bool:
         try:
             required_fields = ["reward_id", "name", "cost"]
@@ -56,20 +72,22 @@ class RewardService:
 
             if existing:
                 # Update existing reward
+                # Existing rewards are dict rows; only write columns that changed
                 fields = []
                 values = []
                 for key, value in reward_data.items():
-                    if key != "reward_id" and hasattr(existing, key):
+                    if key != "reward_id" and key in existing and existing[key] != value:
                         fields.append(f"{key} = ?")
                         values.append(value)
 
-                values.append(current_time)
-                values.append(reward_id)
+                if fields:
+                    values.append(current_time)
+                    values.append(reward_id)
 
-                query = f"UPDATE twitch_rewards SET {', '.join(fields)}, last_updated = ? WHERE reward_id = ?"
-                db.execute(query, values)
-                logger.info(
-                    f"Updated reward {reward_data['name']} (ID: {reward_id})")
+                    query = f"UPDATE twitch_rewards SET {', '.join(fields)}, last_updated = ? WHERE reward_id = ?"
+                    db.execute(query, values)
+                    logger.info(
+                        f"Updated reward {reward_data['name']} (ID: {reward_id})")
             else:
                 # Insert new reward
                 reward_data["date_added"] = current_time
@@ -89,6 +107,7 @@ class RewardService:
                     self.register_handler(
                         reward_id, reward_data["handler_type"], reward_data.get("handler_config"))
 
+            reward_catalog.refresh(reward_id)
             return True
         except Exception as e:
             handle_error(e, {"context": "register_reward",
@@ -129,6 +148,7 @@ class RewardService:
                     self.register_handler(
                         reward_id, update_data["handler_type"], update_data.get("handler_config"))
 
+            reward_catalog.refresh(reward_id)
             return True
         except Exception as e:
             handle_error(e, {"context": "update_reward",
@@ -151,6 +171,7 @@ class RewardService:
             if reward_id in channel_points_service._registered_handlers:
                 del channel_points_service._registered_handlers[reward_id]
 
+            reward_catalog.remove(reward_id)
             return True
         except Exception as e:
             handle_error(
@@ -158,77 +179,38 @@ class RewardService:
             return False
 
     def register_handler(self, reward_id: str, handler_type: str, handler_config: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Checks that handler_type/handler_config compile. The catalog builds
+        the handler itself when the reward is (re)loaded.
+        """
         try:
-            if handler_type == "default":
-                # Use default handler (just triggers the action sequence)
-                if reward_id in channel_points_service._registered_handlers:
-                    del channel_points_service._registered_handlers[reward_id]
-                return True
+            # A handler registered in code takes precedence; drop it so the
+            # configured one is used
+            channel_points_service._registered_handlers.pop(reward_id, None)
 
-            if handler_type == "custom" and handler_config:
-                # Parse the handler configuration
-                config = handler_config if isinstance(
-                    handler_config, dict) else json.loads(handler_config)
-
-                # Create a custom handler function
-                def custom_handler(redemption_data):
-                    try:
-                        # Extract data from redemption
-                        user = redemption_data.get("user", {})
-                        username = user.get("name", "unknown")
-                        user_input = redemption_data.get("input", "")
-                        reward = redemption_data.get("reward", {})
-                        reward_title = reward.get("title", "Unknown Reward")
-
-                        # Process based on config
-                        if "message_template" in config:
-                            message = config["message_template"]
-                            message = message.replace("{username}", username)
-                            message = message.replace("{input}", user_input)
-                            message = message.replace("{reward}", reward_title)
-
-                            # Send message to chat
-                            channel = redemption_data.get("channel", "")
-                            if channel:
-                                event_bus.publish("send_twitch_message", {
-                                    "channel": channel,
-                                    "content": message
-                                })
-
-                        # Trigger action sequence if configured
-                        if "action_sequence_id" in config:
-                            event_bus.publish("trigger_action_sequence", {
-                                "action_sequence_id": config["action_sequence_id"],
-                                "source": "channel_point",
-                                "user": username,
-                                "data": {
-                                    "reward_title": reward_title,
-                                    "reward_id": reward_id,
-                                    "user_input": user_input
-                                }
-                            })
-
-                        return True
-                    except Exception as e:
-                        logger.error(
-                            f"Error in custom handler for {reward_id}: {e}")
-                        return False
-
-                # Register the custom handler
-                channel_points_service.register_handler(
-                    reward_id, custom_handler)
-                logger.info(
-                    f"Registered custom handler for reward ID: {reward_id}")
-                return True
-
-            # For other handler types, we'd have a similar approach
-            logger.warning(f"Unsupported handler type: {handler_type}")
+            if handler_config and not isinstance(handler_config, dict):
+                handler_config = json.loads(handler_config)
+            handler_type_registry.compile(reward_id, handler_type, handler_config or {})
+            return True
+        except ValidationError as e:
+            logger.warning(f"Invalid handler for reward {reward_id}: {e.message}")
             return False
         except Exception as e:
             handle_error(e, {"context": "register_handler",
                          "reward_id": reward_id, "handler_type": handler_type})
             return False
 
+    def attach_twitch_id(self, record_id: int, twitch_redemption_id: str) -> bool:
+        """Sets the Twitch id on a redemption recorded from a copy without one."""
+        try:
+            db.execute(
+                "UPDATE reward_redemptions SET twitch_redemption_id = ? WHERE id = ? AND twitch_redemption_id IS NULL",
+                (twitch_redemption_id, record_id))
+            return True
+        except Exception as e:
+            handle_error(e, {"context": "attach_twitch_id", "record_id": record_id})
+            return False
+
     def record_redemption(self, redemption_data: Dict[str, Any]) -> bool:
         try:
             user = redemption_data.get("user", {})
@@ -246,31 +228,30 @@ class RewardService:
 
             current_time = datetime.now().isoformat()
 
-            # Check if the user exists in our database
-            user_exists = db.fetchone(
-                "SELECT 1 FROM users WHERE twitch_user_id = ?", (user_id,))
-
-            # If user doesn't exist, create them
-            if not user_exists:
-                logger.info(
-                    f"Creating new user record for {username} (ID: {user_id})")
-                db.execute(
-                    "INSERT INTO users (twitch_user_id, twitch_username, rank, points, date_added, last_seen) VALUES (?, ?, ?, ?, ?, ?)",
-                    (user_id, username, "viewer", 0, current_time, current_time)
-                )
-
-            # Now record the redemption
             try:
-                db.execute(
-                    "INSERT INTO reward_redemptions (reward_id, user_id, redeemed_at, user_input) VALUES (?, ?, ?, ?)",
-                    (reward_id, user_id, current_time, user_input)
-                )
-
-                db.execute(
-                    "UPDATE twitch_rewards SET total_uses = total_uses + 1 WHERE reward_id = ?",
-                    (reward_id,)
-                )
-
+                # User upsert, redemption row and counter bump are one unit
+                with db.transaction():
+                    # Check if the user exists in our database
+                    user_exists = db.fetchone(
+                        "SELECT 1 FROM users WHERE twitch_user_id = ?", (user_id,))
+
+                    # If user doesn't exist, create them
+                    if not user_exists:
+                        logger.info(
+                            f"Creating new user record for {username} (ID: {user_id})")
+                        db.execute(
+                            "INSERT INTO users (twitch_user_id, twitch_username, rank, points, date_added, last_seen) VALUES (?, ?, ?, ?, ?, ?)",
+                            (user_id, username, "viewer", 0, current_time, current_time)
+                        )
+
+                    cursor = db.execute(
+                        "INSERT INTO reward_redemptions (reward_id, user_id, redeemed_at, user_input, twitch_redemption_id) VALUES (?, ?, ?, ?, ?)",
+                        (reward_id, user_id, current_time, user_input, redemption_data.get("id"))
+                    )
+                    # Lets a Twitch id that turns up later be attached to this row
+                    redemption_data["record_id"] = cursor.lastrowid
+
+                counter_service.increment("twitch_rewards", "total_uses", "reward_id", reward_id)
                 logger.info(
                     f"Recorded redemption of {reward_title} by {username}")
                 return True
@@ -285,17 +266,8 @@ class RewardService:
 
     def get_user_redemptions(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         try:
-            return db.fetchall(
-                """
-                SELECT r.*, t.name as reward_name, t.cost 
-                FROM reward_redemptions r
-                JOIN twitch_rewards t ON r.reward_id = t.reward_id
-                WHERE r.user_id = ?
-                ORDER BY r.redeemed_at DESC
-                LIMIT ?
-                """,
-                (user_id, limit)
-            )
+            from db.archive import redemption_archive
+            return redemption_archive.get_user_redemptions(user_id, limit)
         except Exception as e:
             handle_error(
                 e, {"context": "get_user_redemptions", "user_id": user_id})
@@ -1,16 +1,62 @@
+import hashlib
+import json
 import time
 
-from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, NamedTuple
 
 from core.logging import get_logger
 from core.errors import handle_error, TwitchError
 from core.config import config
-from db.database import db
-from utils.reward_service import reward_service
+from db.database import db, select_query
+from utils.reward_catalog import reward_catalog
+from utils.channel_points_service import channel_points_service
 from utils.twitch_api_client import twitch_api
 
 logger = get_logger("reward_sync")
 
+# Columns owned by Twitch; handler_type/handler_config/action_sequence_id are
+# local and never touched by sync
+SYNCED_COLUMNS = ("name", "description", "cost", "is_enabled", "background_color",
+                  "is_user_input_required", "user_input_prompt", "auto_fulfill")
+SYNC_STATE_QUERY = select_query("twitch_rewards", ("reward_id", "sync_hash"))
+
+
+class SyncReport(NamedTuple):
+    added: List[str]
+    updated: List[str]
+    deleted: List[str]
+    unchanged: int
+    failed: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.deleted)
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.updated)} updated, "
+                f"{len(self.deleted)} removed, {self.unchanged} unchanged, {self.failed} failed")
+
+
+def map_api_reward(api_reward: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps a Helix custom reward onto the synced twitch_rewards columns."""
+    return {
+        "name": api_reward["title"],
+        "description": api_reward.get("prompt", ""),
+        "cost": api_reward["cost"],
+        "is_enabled": int(bool(api_reward.get("is_enabled", True))),
+        "background_color": api_reward.get("background_color", ""),
+        "is_user_input_required": int(bool(api_reward.get("is_user_input_required", False))),
+        "user_input_prompt": api_reward.get("user_input_prompt", ""),
+        "auto_fulfill": int(bool(api_reward.get("is_auto_fulfilled", True)))
+    }
+
+
+def content_hash(reward_data: Dict[str, Any]) -> str:
+    payload = json.dumps([reward_data[column] for column in SYNCED_COLUMNS],
+                         separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
 
 class RewardSynchronizer:
     def __init__(self):
@@ -18,14 +64,14 @@ class RewardSynchronizer:
         if not self.broadcaster_id:
             logger.warning("CHANNEL_ID not configured in config")
 
-    def sync_all_rewards(self) -> Tuple[int, int, int]:
+    def sync_all_rewards(self) -> SyncReport:
         """
-        Fetches all rewards from Twitch API and synchronizes them with the database.
-        Returns a tuple of (added, updated, failed) counts.
+        Fetches all rewards from Twitch API and applies only the differences
+        to the database, in one transaction.
         """
         if not self.broadcaster_id:
             logger.error("Cannot sync rewards: CHANNEL_ID not configured")
-            return (0, 0, 0)
+            return SyncReport([], [], [], 0)
 
         try:
             # Get rewards from Twitch API
@@ -33,77 +79,96 @@ class RewardSynchronizer:
             if not api_rewards:
                 logger.warning(
                     "No rewards found via Twitch API or failed to fetch")
-                return (0, 0, 0)
-
-            # Get existing rewards from our database
-            db_rewards = reward_service.get_all_rewards()
-            db_rewards_dict = {r['reward_id']: r for r in db_rewards}
-
-            added = 0
-            updated = 0
-            failed = 0
-
-            # Process each reward from the API
-            for api_reward in api_rewards:
-                reward_id = api_reward["id"]
-
-                # Map API reward to our database format
-                db_reward_data = {
-                    "reward_id": reward_id,
-                    "name": api_reward["title"],
-                    "description": api_reward.get("prompt", ""),
-                    "cost": api_reward["cost"],
-                    "is_enabled": api_reward.get("is_enabled", True),
-                    "background_color": api_reward.get("background_color", ""),
-                    "is_user_input_required": api_reward.get("is_user_input_required", False),
-                    "user_input_prompt": api_reward.get("user_input_prompt", ""),
-                    "auto_fulfill": api_reward.get("is_auto_fulfilled", True)
-                }
-
-                # If exists in DB, preserve handler_type and config
-                if reward_id in db_rewards_dict:
-                    existing = db_rewards_dict[reward_id]
-                    db_reward_data["handler_type"] = existing.get(
-                        "handler_type", "default")
-                    db_reward_data["handler_config"] = existing.get(
-                        "handler_config")
-                    db_reward_data["action_sequence_id"] = existing.get(
-                        "action_sequence_id")
-                else:
-                    db_reward_data["handler_type"] = "default"
-
-                # Save to database
-                if reward_service.register_reward(db_reward_data):
-                    if reward_id in db_rewards_dict:
-                        updated += 1
-                        logger.info(
-                            f"Updated reward: {db_reward_data['name']} (ID: {reward_id})")
-                    else:
-                        added += 1
-                        logger.info(
-                            f"Added new reward: {db_reward_data['name']} (ID: {reward_id})")
-                else:
-                    failed += 1
-                    logger.error(
-                        f"Failed to save reward: {db_reward_data['name']} (ID: {reward_id})")
-
-            return (added, updated, failed)
+                return SyncReport([], [], [], 0)
 
+            return self.apply_rewards(api_rewards)
         except Exception as e:
             handle_error(e, {"context": "sync_all_rewards"})
-            return (0, 0, 0)
+            return SyncReport([], [], [], 0, failed=1)
+
+    def apply_rewards(self, api_rewards: List[Dict[str, Any]]) -> SyncReport:
+        # One read of what we last synced, keyed by reward_id
+        known = {row["reward_id"]: row["sync_hash"]
+                 for row in db.iterate(SYNC_STATE_QUERY)}
+
+        inserts = []
+        updates = []
+        added = []
+        updated = []
+        failed = 0
+        current_time = datetime.now().isoformat()
+
+        for api_reward in api_rewards:
+            try:
+                reward_id = api_reward["id"]
+                reward_data = map_api_reward(api_reward)
+            except KeyError as e:
+                failed += 1
+                logger.error(f"Skipping malformed reward from API: missing {e}")
+                continue
+
+            sync_hash = content_hash(reward_data)
+            values = [reward_data[column] for column in SYNCED_COLUMNS]
+
+            if reward_id not in known:
+                inserts.append([reward_id, *values, sync_hash, current_time, current_time])
+                added.append(reward_id)
+            elif known[reward_id] != sync_hash:
+                updates.append([*values, sync_hash, current_time, reward_id])
+                updated.append(reward_id)
+
+        # Only rows that came from a previous sync are ours to remove; local
+        # rows without a hash (including ones already removed) are left alone
+        api_ids = {api_reward.get("id") for api_reward in api_rewards}
+        deleted = [reward_id for reward_id, sync_hash in known.items()
+                   if sync_hash and reward_id not in api_ids]
+
+        report = SyncReport(added, updated, deleted,
+                            len(api_rewards) - len(added) - len(updated) - failed, failed)
+        if not report.changed:
+            logger.info(f"Rewards already in sync ({report.unchanged} unchanged)")
+            return report
+
+        with db.transaction():
+            if inserts:
+                columns = ", ".join(("reward_id", *SYNCED_COLUMNS, "sync_hash",
+                                     "date_added", "last_updated"))
+                placeholders = ", ".join("?" * (len(SYNCED_COLUMNS) + 4))
+                db.execute_many(
+                    f"INSERT INTO twitch_rewards ({columns}) VALUES ({placeholders})", inserts)
+            if updates:
+                assignments = ", ".join(f"{column} = ?" for column in SYNCED_COLUMNS)
+                db.execute_many(
+                    f"UPDATE twitch_rewards SET {assignments}, sync_hash = ?, last_updated = ?, "
+                    f"removed_at = NULL WHERE reward_id = ?",
+                    updates)
+            if deleted:
+                # Soft delete: a hard DELETE would cascade to the reward's
+                # redemptions and lose its local handler settings. Clearing
+                # sync_hash lets the reward come back through the update path
+                db.execute_many(
+                    "UPDATE twitch_rewards SET is_enabled = 0, removed_at = ?, sync_hash = NULL, "
+                    "last_updated = ? WHERE reward_id = ?",
+                    [(current_time, current_time, reward_id) for reward_id in deleted])
+
+        for reward_id in deleted:
+            channel_points_service._registered_handlers.pop(reward_id, None)
+
+        reward_catalog.load()
+        logger.info(f"Rewards sync applied: {report.summary()}")
+        return report
 
     def setup_auto_sync(self, interval_minutes: int = 60) -> None:
         """
-        Sets up automatic synchronization of rewards at specified intervals.
-        This would typically be called when the bot starts.
+        Schedules sync_all_rewards every interval_minutes on the shared
+        scheduler.
         """
         if interval_minutes < 5:
             interval_minutes = 5  # Minimum 5 minutes to avoid rate limiting
 
-        # This would be implemented with threading or scheduling
-        # For now just log the intent
-        logger.info(f"Would set up auto-sync every {interval_minutes} minutes")
+        from utils.scheduler import scheduler
+        scheduler.add_interval_job(
+            "reward_sync", self.sync_all_rewards, interval_minutes * 60, jitter=60)
 
 
 # Singleton instance
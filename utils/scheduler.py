@@ -0,0 +1,319 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Callable, List, Set
+
+from core.config import config
+from core.logging import get_logger
+from core.errors import handle_error, ValidationError
+
+logger = get_logger("scheduler")
+
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),
+)
+
+
+def _parse_cron_field(spec: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in spec.split(","):
+        step = 1
+        if "/" in part:
+            part, step_spec = part.split("/", 1)
+            step = int(step_spec)
+            if step <= 0:
+                raise ValueError(f"Invalid step: {step_spec}")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_spec, end_spec = part.split("-", 1)
+            start, end = int(start_spec), int(end_spec)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"Value out of range {low}-{high}: {part}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    Five-field cron expression (minute hour day month weekday) with *, lists,
+    ranges and steps. Weekday 0 is Sunday, as in crontab.
+    """
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != len(CRON_FIELDS):
+            raise ValidationError(
+                f"Cron expression needs {len(CRON_FIELDS)} fields: {expression}")
+        try:
+            fields = [_parse_cron_field(part, low, high)
+                      for part, (_, low, high) in zip(parts, CRON_FIELDS)]
+        except ValueError as e:
+            raise ValidationError(f"Invalid cron expression '{expression}': {e}")
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = fields
+        # Like crontab: when both day fields are restricted either may match
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Skip whole months/days/hours that cannot match; bounded to five years
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(
+                    year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(
+                    hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValidationError(f"Cron expression never fires: {self.expression}")
+
+
+class Job:
+    def __init__(self, name: str, func: Callable[[], Any], interval: Optional[float] = None,
+                 cron: Optional[str] = None, jitter: float = 0.0):
+        if (interval is None) == (cron is None):
+            raise ValidationError(f"Job {name} needs exactly one of interval or cron")
+        if interval is not None and interval <= 0:
+            raise ValidationError(f"Job {name} interval must be positive")
+
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.cron = CronSchedule(cron) if cron else None
+        self.jitter = max(0.0, jitter)
+        self.next_run = 0.0
+        self.running = False
+        self.cancelled = False
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_started_at = None
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_error = None
+
+    def schedule_next(self, now: float) -> float:
+        if self.cron:
+            next_run = self.cron.next_after(
+                datetime.fromtimestamp(now)).timestamp()
+        else:
+            next_run = now + self.interval
+        if self.jitter:
+            # Spread jobs that share an interval so they don't fire together
+            next_run += random.uniform(0, self.jitter)
+        self.next_run = next_run
+        return next_run
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "schedule": self.cron.expression if self.cron else f"every {self.interval:g}s",
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped_overlaps": self.skipped,
+            "running": self.running,
+            "next_run": datetime.fromtimestamp(self.next_run).isoformat() if self.next_run else None,
+            "last_started_at": self.last_started_at,
+            "last_duration_ms": round(self.last_duration * 1000, 2),
+            "avg_duration_ms": round(self.total_duration / self.runs * 1000, 2) if self.runs else 0.0,
+            "max_duration_ms": round(self.max_duration * 1000, 2),
+            "last_error": self.last_error
+        }
+
+
+class Scheduler:
+    """
+    Runs periodic maintenance off the hot path. A single dispatcher thread
+    waits for the next due job and hands it to a small worker pool; a job
+    that is still running when it comes due again is skipped, not stacked.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or config.get_int('SCHEDULER_WORKERS', 2)
+        self._jobs: Dict[str, Job] = {}
+        self._queue: List = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = None
+        self._thread = None
+        self._stopping = False
+
+    def add_interval_job(self, name: str, func: Callable[[], Any], seconds: float,
+                         jitter: float = 0.0, run_immediately: bool = False) -> Job:
+        job = Job(name, func, interval=seconds, jitter=jitter)
+        return self._add(job, time.time() if run_immediately else None)
+
+    def add_cron_job(self, name: str, func: Callable[[], Any], expression: str,
+                     jitter: float = 0.0) -> Job:
+        return self._add(Job(name, func, cron=expression, jitter=jitter))
+
+    def _add(self, job: Job, first_run: Optional[float] = None) -> Job:
+        with self._condition:
+            if job.name in self._jobs:
+                self._jobs[job.name].cancelled = True
+            if first_run is None:
+                job.schedule_next(time.time())
+            else:
+                job.next_run = first_run
+            self._jobs[job.name] = job
+            heapq.heappush(self._queue, (job.next_run, next(self._counter), job))
+            self._condition.notify()
+        self._ensure_started()
+        logger.info(f"Scheduled job {job.name} ({job.metrics()['schedule']})")
+        return job
+
+    def remove_job(self, name: str) -> bool:
+        with self._condition:
+            job = self._jobs.pop(name, None)
+            if not job:
+                return False
+            # Lazily dropped from the heap when it comes up
+            job.cancelled = True
+            self._condition.notify()
+        return True
+
+    def get_job(self, name: str) -> Optional[Job]:
+        return self._jobs.get(name)
+
+    def run_now(self, name: str) -> bool:
+        job = self._jobs.get(name)
+        if not job:
+            return False
+        self._ensure_started()
+        return self._submit(job)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        return [job.metrics() for job in list(self._jobs.values())]
+
+    def _ensure_started(self) -> None:
+        with self._condition:
+            if self._thread or self._stopping:
+                return
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="SchedulerWorker")
+            self._thread = threading.Thread(
+                target=self._dispatch, daemon=True, name="SchedulerDispatcher")
+            self._thread.start()
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+
+                next_run, _, job = self._queue[0]
+                if job.cancelled:
+                    heapq.heappop(self._queue)
+                    continue
+
+                delay = next_run - time.time()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+                heapq.heappop(self._queue)
+                job.schedule_next(time.time())
+                heapq.heappush(self._queue, (job.next_run, next(self._counter), job))
+
+            self._submit(job)
+
+    def _submit(self, job: Job) -> bool:
+        with self._condition:
+            if self._stopping or not self._executor:
+                return False
+            if job.running:
+                job.skipped += 1
+                logger.warning(f"Job {job.name} still running, skipping this run")
+                return False
+            job.running = True
+            try:
+                self._executor.submit(self._run, job)
+            except RuntimeError:
+                # Executor shut down between the check and the submit
+                job.running = False
+                return False
+        return True
+
+    def _run(self, job: Job) -> None:
+        job.last_started_at = datetime.now().isoformat()
+        started = time.perf_counter()
+        try:
+            job.func()
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            handle_error(e, {"context": "scheduled_job", "job": job.name})
+        finally:
+            elapsed = time.perf_counter() - started
+            job.runs += 1
+            job.last_duration = elapsed
+            job.total_duration += elapsed
+            job.max_duration = max(job.max_duration, elapsed)
+            job.running = False
+            logger.debug(f"Job {job.name} finished in {elapsed * 1000:.0f}ms")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops dispatching, drops queued runs and lets running jobs finish."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            executor = self._executor
+            thread = self._thread
+
+        if thread:
+            thread.join(timeout=5)
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+        for job in self.metrics():
+            if job["runs"]:
+                logger.info(
+                    f"Job {job['name']}: {job['runs']} runs, {job['failures']} failures, "
+                    f"{job['skipped_overlaps']} skipped, avg {job['avg_duration_ms']}ms, "
+                    f"max {job['max_duration_ms']}ms")
+
+        with self._condition:
+            self._executor = None
+            self._thread = None
+
+
+# Singleton instance
+scheduler = Scheduler()
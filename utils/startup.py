@@ -0,0 +1,152 @@
+import threading
+import time
+
+from typing import Dict, Any, Callable, List, Optional, Sequence
+
+from core.logging import get_logger
+from core.errors import handle_error, BetsyError
+
+logger = get_logger("startup")
+
+
+class StartupPhase:
+    def __init__(self, name: str, func: Callable[[], Any], depends_on: Sequence[str] = (),
+                 background: bool = False, critical: bool = False):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.background = background
+        self.critical = critical
+        self.status = "pending"
+        self.started_at = None
+        self.elapsed = 0.0
+        self.error = None
+        self.done = threading.Event()
+
+
+class StartupGraph:
+    """
+    Startup as a dependency graph. Foreground phases run in order on the
+    calling thread (the critical path to chat); background phases each get a
+    thread and start as soon as their dependencies finish. A phase whose
+    dependency failed is skipped, and a failed critical foreground phase
+    aborts startup. The timing report is logged once every phase has
+    finished.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, StartupPhase] = {}
+        self._started = None
+        self._report_logged = threading.Lock()
+
+    def add_phase(self, name: str, func: Callable[[], Any], depends_on: Sequence[str] = (),
+                  background: bool = False, critical: bool = False) -> StartupPhase:
+        if name in self.phases:
+            raise BetsyError(f"Duplicate startup phase: {name}")
+        phase = StartupPhase(name, func, depends_on, background, critical)
+        self.phases[name] = phase
+        return phase
+
+    def _order(self) -> List[StartupPhase]:
+        ordered = []
+        state = {}
+
+        def visit(name: str, path: List[str]):
+            if name not in self.phases:
+                raise BetsyError(
+                    f"Startup phase {path[-1]} depends on unknown phase {name}")
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise BetsyError(
+                    f"Startup phase cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dependency in self.phases[name].depends_on:
+                visit(dependency, path + [name])
+            state[name] = "done"
+            ordered.append(self.phases[name])
+
+        for name in self.phases:
+            visit(name, [name])
+        return ordered
+
+    def _run_phase(self, phase: StartupPhase) -> None:
+        try:
+            for dependency in phase.depends_on:
+                self.phases[dependency].done.wait()
+            failed = [dependency for dependency in phase.depends_on
+                      if self.phases[dependency].status != "ok"]
+            if failed:
+                phase.status = "skipped"
+                logger.warning(
+                    f"Skipping startup phase {phase.name}: {', '.join(failed)} did not complete")
+                return
+
+            phase.started_at = time.perf_counter() - self._started
+            started = time.perf_counter()
+            try:
+                phase.func()
+                phase.status = "ok"
+            except Exception as e:
+                phase.status = "failed"
+                phase.error = str(e)
+                handle_error(e, {"context": "startup_phase", "phase": phase.name})
+            finally:
+                phase.elapsed = time.perf_counter() - started
+        finally:
+            phase.done.set()
+            self._maybe_log_report()
+
+    def run(self) -> None:
+        """Runs the foreground path and returns; background phases keep going."""
+        self._started = time.perf_counter()
+        ordered = self._order()
+
+        for phase in ordered:
+            if phase.background:
+                threading.Thread(target=self._run_phase, args=(phase,), daemon=True,
+                                 name=f"Startup-{phase.name}").start()
+
+        for phase in ordered:
+            if not phase.background:
+                self._run_phase(phase)
+                if phase.critical and phase.status != "ok":
+                    raise BetsyError(
+                        f"Startup phase {phase.name} {phase.status}: {phase.error}")
+
+        logger.info(
+            f"Startup critical path done in {(time.perf_counter() - self._started) * 1000:.0f}ms")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for phase in self.phases.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not phase.done.wait(remaining):
+                return False
+        return True
+
+    def report(self) -> List[Dict[str, Any]]:
+        return [{
+            "phase": phase.name,
+            "background": phase.background,
+            "status": phase.status,
+            "started_ms": round(phase.started_at * 1000, 1) if phase.started_at is not None else None,
+            "elapsed_ms": round(phase.elapsed * 1000, 1),
+            "error": phase.error
+        } for phase in self.phases.values()]
+
+    def _maybe_log_report(self) -> None:
+        if not all(phase.done.is_set() for phase in self.phases.values()):
+            return
+        # Only the last phase to finish logs it
+        if not self._report_logged.acquire(blocking=False):
+            return
+
+        total_ms = (time.perf_counter() - self._started) * 1000
+        lines = [f"Startup finished in {total_ms:.0f}ms:"]
+        for entry in self.report():
+            started = f"+{entry['started_ms']:.0f}ms" if entry["started_ms"] is not None else "-"
+            kind = "bg" if entry["background"] else "fg"
+            lines.append(
+                f"  {entry['phase']:<20} {kind} {entry['status']:<8} start {started:>8}  took {entry['elapsed_ms']:.0f}ms")
+        logger.info("\n".join(lines))
@@ -0,0 +1,65 @@
+import time
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.config import config
+from core.errors import handle_error
+from core.logging import get_logger
+
+logger = get_logger("stream_state")
+
+
+class StreamState:
+    """
+    Whether the channel is live and since when, refreshed from Helix by a
+    scheduler job so chat commands like {uptime} never wait on the network.
+    """
+
+    def __init__(self):
+        self.interval = config.get_int('STREAM_STATE_REFRESH_SECONDS', 60)
+        # Epoch seconds the current stream started; None while offline
+        self.started_at: Optional[float] = None
+        self.updated_at: Optional[float] = None
+
+    def refresh(self) -> bool:
+        """Re-reads the stream from Helix; returns whether the channel is live."""
+        broadcaster_id = config.get('CHANNEL_ID')
+        if not broadcaster_id:
+            return False
+
+        try:
+            from utils.twitch_api_client import twitch_api
+            stream = twitch_api.get_stream(broadcaster_id)
+            started_at = None
+            if stream and stream.get("started_at"):
+                started_at = datetime.strptime(
+                    stream["started_at"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+        except Exception as e:
+            handle_error(e, {"context": "stream_state_refresh"})
+            return self.started_at is not None
+
+        if (started_at is None) != (self.started_at is None):
+            logger.info("Stream is live" if started_at else "Stream is offline")
+        self.started_at = started_at
+        self.updated_at = time.time()
+        return started_at is not None
+
+    def uptime(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since the stream started, or None when offline."""
+        started_at = self.started_at
+        if started_at is None:
+            return None
+        return max(0.0, (now or time.time()) - started_at)
+
+    def start(self) -> None:
+        if self.interval <= 0:
+            return
+
+        from utils.scheduler import scheduler
+        scheduler.add_interval_job(
+            "stream_state", self.refresh, self.interval, run_immediately=True)
+
+
+# Singleton instance
+stream_state = StreamState()
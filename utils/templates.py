@@ -0,0 +1,44 @@
+import re
+
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional, Tuple
+
+VARIABLE = re.compile(r"\{(\w+)\}")
+
+
+class Template:
+    """
+    A response template split once into (literal, variable) segments, so
+    rendering is a single join instead of one str.replace per variable.
+    Variables with no value are left in the output as written.
+    """
+
+    __slots__ = ("source", "segments", "variables")
+
+    def __init__(self, source: str):
+        self.source = source
+        segments: List[Tuple[str, Optional[str]]] = []
+        position = 0
+        for match in VARIABLE.finditer(source):
+            segments.append((source[position:match.start()], match.group(1)))
+            position = match.end()
+        segments.append((source[position:], None))
+        self.segments = tuple(segments)
+        self.variables = frozenset(name for _, name in segments if name)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        parts = []
+        for literal, name in self.segments:
+            parts.append(literal)
+            if name is not None:
+                value = values.get(name)
+                parts.append(f"{{{name}}}" if value is None else str(value))
+        return "".join(parts)
+
+    def __repr__(self) -> str:
+        return f"Template({self.source!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_template(source: str) -> Template:
+    return Template(source)
@@ -1,89 +1,103 @@
-import requests
 import time
-import json
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 from datetime import datetime
 
 from core.logging import get_logger
 from core.errors import handle_error, TwitchError, NetworkError
 from core.config import config
+from utils.helix_client import helix_client, ResponseCache, Params
+from utils.twitch_auth import token_manager
 
 logger = get_logger("twitch_api")
 
 
+# Helix accepts at most this many redemption ids per status update
+REDEMPTION_BATCH_SIZE = 50
+# ...and at most this many ids + logins per Get Users request
+USERS_BATCH_SIZE = 100
+
+REWARDS_PATH = "channel_points/custom_rewards"
+STREAMS_PATH = "streams"
+
+REQUIRED_SCOPES = [
+    "channel:read:redemptions",
+    "channel:manage:redemptions"
+]
+
+
 class TwitchAPIClient:
     def __init__(self):
         self.client_id = config.get('CLIENT_ID')
-        self.broadcaster_token = config.get('BROADCASTER_TOKEN')
-        self.token_expires_at = 0
+        self.http = helix_client
+        self.tokens = token_manager
+        # GET responses worth caching, by endpoint; 0 disables an endpoint
+        self.cache = ResponseCache({
+            REWARDS_PATH: config.get_int('TWITCH_API_CACHE_REWARDS_SECONDS', 300),
+            STREAMS_PATH: config.get_int('TWITCH_API_CACHE_STREAMS_SECONDS', 60),
+        }, max_entries=config.get_int('TWITCH_API_CACHE_MAX_ENTRIES', 256))
+
+    @property
+    def broadcaster_token(self) -> Optional[str]:
+        # Validated once and refreshed by the token manager, not per call
+        return self.tokens.get_token("broadcaster")
 
     def _validate_token_scope(self):
         try:
-            # Partially mask token
-            logger.info(
-                f"Validating token: Client ID = {self.client_id}, Token = {self.broadcaster_token[:10]}...")
-
             if not self.broadcaster_token:
                 logger.error("No broadcaster token provided")
                 return False
-
-            response = requests.get(
-                "https://id.twitch.tv/oauth2/validate",
-                headers={"Authorization": f"OAuth {self.broadcaster_token}"}
-            )
-
-            logger.info(
-                f"Token validation response status: {response.status_code}")
-
-            if response.status_code == 200:
-                token_info = response.json()
-
-                # Log full token information for debugging
-                logger.debug(
-                    f"Full token info: {json.dumps(token_info, indent=2)}")
-
-                logger.info(f"Token scopes: {token_info.get('scopes', [])}")
-
-                required_scopes = [
-                    "channel:read:redemptions",
-                    "channel:manage:redemptions"
-                ]
-
-                # Check for missing scopes
-                missing_scopes = [
-                    scope for scope in required_scopes
-                    if scope not in token_info.get('scopes', [])
-                ]
-
-                if missing_scopes:
-                    logger.error(f"Missing required scopes: {missing_scopes}")
-                    return False
-
-                logger.info("Token validation successful")
-                return True
-            else:
-                logger.error(
-                    f"Token validation failed: Status {response.status_code}, Response: {response.text}")
-                return False
-        except requests.RequestException as e:
-            logger.error(f"Network error during token validation: {e}")
-            return False
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse token validation response: {e}")
-            return False
+            return self.tokens.has_scopes(REQUIRED_SCOPES, "broadcaster")
         except Exception as e:
             logger.error(f"Unexpected error during token validation: {e}")
             return False
 
-    def get_channel_rewards(self, broadcaster_id: str) -> List[Dict[str, Any]]:
+    def _check_auth(self, response) -> None:
+        if response.status_code == 401:
+            # Revalidate (and refresh if possible) before the next call
+            self.tokens.invalidate("broadcaster")
+
+    def _cached_get(self, path: str, params: Params, headers: Dict[str, str],
+                    use_cache: bool = True) -> Any:
+        """
+        GET through the response cache. Returns the parsed body; raises
+        TwitchError on anything but 200 (or 304 for a cached ETag).
+        """
+        key = self.cache.key(path, params)
+        etag = None
+        if use_cache:
+            body, etag = self.cache.get(key)
+            if body is not None:
+                return body
+            if etag:
+                headers = dict(headers, **{"If-None-Match": etag})
+
+        response = self.http.request("GET", path, headers=headers, params=params)
+        self._check_auth(response)
+
+        if response.status_code == 304 and etag:
+            body = self.cache.revalidate(key)
+            if body is not None:
+                return body
+            # Evicted meanwhile; fetch it in full
+            return self._cached_get(path, params, {k: v for k, v in headers.items()
+                                                   if k != "If-None-Match"}, use_cache=False)
+
+        if response.status_code != 200:
+            raise TwitchError(f"GET {path} failed: {response.text}",
+                              {"status_code": response.status_code})
+
+        body = response.json()
+        self.cache.put(key, body, response.headers.get("ETag"))
+        return body
+
+    def get_channel_rewards(self, broadcaster_id: str, use_cache: bool = True) -> List[Dict[str, Any]]:
         try:
 
             if not self._validate_token_scope():
                 raise TwitchError(
                     "Insufficient token scopes (required = channel:read:redemptions, channel:manage:redemptions)")
 
-            url = f"https://api.twitch.tv/helix/channel_points/custom_rewards"
             headers = {
                 "Client-ID": self.client_id,
                 "Authorization": f"Bearer {self.broadcaster_token}"
@@ -92,13 +106,7 @@ class TwitchAPIClient:
                 "broadcaster_id": broadcaster_id
             }
 
-            response = requests.get(url, headers=headers, params=params)
-
-            if response.status_code != 200:
-                raise TwitchError(
-                    f"Failed to get channel rewards: {response.text}")
-
-            data = response.json()
+            data = self._cached_get(REWARDS_PATH, params, headers, use_cache)
             return data.get("data", [])
         except Exception as e:
             handle_error(TwitchError(
@@ -108,7 +116,7 @@ class TwitchAPIClient:
     def create_custom_reward(self, broadcaster_id: str, reward_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
 
-            url = f"https://api.twitch.tv/helix/channel_points/custom_rewards"
+            url = REWARDS_PATH
             headers = {
                 "Client-ID": self.client_id,
                 "Authorization": f"Bearer {self.broadcaster_token}",
@@ -159,8 +167,10 @@ class TwitchAPIClient:
             if "auto_fulfill" in reward_data:
                 twitch_reward_data["is_auto_fulfilled"] = reward_data["auto_fulfill"]
 
-            response = requests.post(
-                url, headers=headers, params=params, json=twitch_reward_data)
+            response = self.http.request(
+                "POST", url, headers=headers, params=params, json=twitch_reward_data)
+            self._check_auth(response)
+            self.cache.invalidate(REWARDS_PATH)
 
             if response.status_code != 200:
                 raise TwitchError(
@@ -179,7 +189,7 @@ class TwitchAPIClient:
     def update_custom_reward(self, broadcaster_id: str, reward_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
 
-            url = f"https://api.twitch.tv/helix/channel_points/custom_rewards"
+            url = REWARDS_PATH
             headers = {
                 "Client-ID": self.client_id,
                 "Authorization": f"Bearer {self.broadcaster_token}",
@@ -235,8 +245,10 @@ class TwitchAPIClient:
             if "auto_fulfill" in update_data:
                 twitch_update_data["is_auto_fulfilled"] = update_data["auto_fulfill"]
 
-            response = requests.patch(
-                url, headers=headers, params=params, json=twitch_update_data)
+            response = self.http.request(
+                "PATCH", url, headers=headers, params=params, json=twitch_update_data)
+            self._check_auth(response)
+            self.cache.invalidate(REWARDS_PATH)
 
             if response.status_code != 200:
                 raise TwitchError(
@@ -255,7 +267,7 @@ class TwitchAPIClient:
     def delete_custom_reward(self, broadcaster_id: str, reward_id: str) -> bool:
         try:
 
-            url = f"https://api.twitch.tv/helix/channel_points/custom_rewards"
+            url = REWARDS_PATH
             headers = {
                 "Client-ID": self.client_id,
                 "Authorization": f"Bearer {self.broadcaster_token}"
@@ -265,7 +277,10 @@ class TwitchAPIClient:
                 "id": reward_id
             }
 
-            response = requests.delete(url, headers=headers, params=params)
+            response = self.http.request(
+                "DELETE", url, headers=headers, params=params)
+            self._check_auth(response)
+            self.cache.invalidate(REWARDS_PATH)
 
             if response.status_code != 204:
                 raise TwitchError(
@@ -277,37 +292,128 @@ class TwitchAPIClient:
                 f"Failed to delete custom reward: {str(e)}"))
             return False
 
-    def update_redemption_status(self, broadcaster_id: str, reward_id: str, redemption_id: str, status: str) -> bool:
-        try:
-
-            url = f"https://api.twitch.tv/helix/channel_points/custom_rewards/redemptions"
+    def iter_redemptions(self, broadcaster_id: str, reward_id: str, status: str = "UNFULFILLED",
+                         sort: str = "NEWEST", page_size: int = REDEMPTION_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Pages through a reward's redemptions with Helix's cursor. Pages are
+        fetched lazily, so a caller that stops early stops fetching.
+        """
+        cursor = None
+        while True:
             headers = {
                 "Client-ID": self.client_id,
-                "Authorization": f"Bearer {self.broadcaster_token}",
-                "Content-Type": "application/json"
+                "Authorization": f"Bearer {self.broadcaster_token}"
             }
             params = {
                 "broadcaster_id": broadcaster_id,
                 "reward_id": reward_id,
-                "id": redemption_id
+                "status": status,
+                "sort": sort,
+                "first": page_size
             }
+            if cursor:
+                params["after"] = cursor
 
-            data = {
-                "status": status  # "FULFILLED" or "CANCELED"
-            }
-
-            response = requests.patch(
-                url, headers=headers, params=params, json=data)
+            response = self.http.request(
+                "GET", "channel_points/custom_rewards/redemptions", headers=headers, params=params)
+            self._check_auth(response)
 
             if response.status_code != 200:
                 raise TwitchError(
-                    f"Failed to update redemption status: {response.text}")
-
-            return True
+                    f"Failed to get redemptions for reward {reward_id}: {response.text}",
+                    {"status_code": response.status_code})
+
+            body = response.json()
+            yield from body.get("data", [])
+
+            cursor = body.get("pagination", {}).get("cursor")
+            if not cursor or not body.get("data"):
+                return
+
+    def get_users(self, ids: Optional[List[str]] = None,
+                  logins: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        One Get Users request for up to USERS_BATCH_SIZE ids and logins
+        combined. Unknown or banned users are simply absent from the result.
+        """
+        params = [("id", user_id) for user_id in ids or []]
+        params.extend(("login", login) for login in logins or [])
+        if not params:
+            return []
+        if len(params) > USERS_BATCH_SIZE:
+            raise TwitchError(
+                f"Get Users takes at most {USERS_BATCH_SIZE} ids and logins, got {len(params)}")
+
+        headers = {
+            "Client-ID": self.client_id,
+            "Authorization": f"Bearer {self.broadcaster_token}"
+        }
+        response = self.http.request("GET", "users", headers=headers, params=params)
+        self._check_auth(response)
+
+        if response.status_code != 200:
+            raise TwitchError(f"Failed to get users: {response.text}",
+                              {"status_code": response.status_code})
+        return response.json().get("data", [])
+
+    def get_stream(self, broadcaster_id: str) -> Optional[Dict[str, Any]]:
+        """The live stream for a broadcaster, or None when offline."""
+        try:
+            headers = {
+                "Client-ID": self.client_id,
+                "Authorization": f"Bearer {self.broadcaster_token}"
+            }
+            data = self._cached_get(STREAMS_PATH, {"user_id": broadcaster_id}, headers)
+            streams = data.get("data", [])
+            return streams[0] if streams else None
         except Exception as e:
-            handle_error(TwitchError(
-                f"Failed to update redemption status: {str(e)}"))
-            return False
+            handle_error(TwitchError(f"Failed to get stream: {str(e)}"))
+            return None
+
+    def update_redemption_status(self, broadcaster_id: str, reward_id: str, redemption_id: str, status: str) -> bool:
+        return self.update_redemption_statuses(
+            broadcaster_id, reward_id, [redemption_id], status).get(redemption_id, False)
+
+    def update_redemption_statuses(self, broadcaster_id: str, reward_id: str, redemption_ids: List[str],
+                                   status: str) -> Dict[str, bool]:
+        """
+        Sets status ("FULFILLED" or "CANCELED") on redemptions of one reward,
+        REDEMPTION_BATCH_SIZE ids per PATCH. Returns the outcome per id; an id
+        missing from Twitch's response (already resolved, wrong reward) is
+        reported as failed.
+        """
+        results = {redemption_id: False for redemption_id in redemption_ids}
+        unique_ids = list(results)
+
+        for start in range(0, len(unique_ids), REDEMPTION_BATCH_SIZE):
+            batch = unique_ids[start:start + REDEMPTION_BATCH_SIZE]
+            try:
+                url = "channel_points/custom_rewards/redemptions"
+                headers = {
+                    "Client-ID": self.client_id,
+                    "Authorization": f"Bearer {self.broadcaster_token}",
+                    "Content-Type": "application/json"
+                }
+                # Repeated id= parameters, one per redemption
+                params = [("broadcaster_id", broadcaster_id), ("reward_id", reward_id)]
+                params.extend(("id", redemption_id) for redemption_id in batch)
+
+                response = self.http.request(
+                    "PATCH", url, headers=headers, params=params, json={"status": status})
+                self._check_auth(response)
+
+                if response.status_code != 200:
+                    raise TwitchError(
+                        f"Failed to update redemption status: {response.text}")
+
+                for redemption in response.json().get("data", []):
+                    if redemption.get("id") in results:
+                        results[redemption["id"]] = True
+            except Exception as e:
+                handle_error(TwitchError(
+                    f"Failed to update redemption status: {str(e)}"), {"reward_id": reward_id, "count": len(batch)})
+
+        return results
 
 
 # Singleton instance
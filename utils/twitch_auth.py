@@ -0,0 +1,219 @@
+import threading
+import time
+
+from typing import Dict, Any, Optional, List, Callable, Iterable
+
+from core.config import config
+from core.logging import get_logger
+from core.errors import handle_error, AuthenticationError, NetworkError
+from utils.helix_client import helix_client
+
+logger = get_logger("twitch_auth")
+
+VALIDATE_URL = "https://id.twitch.tv/oauth2/validate"
+TOKEN_URL = "https://id.twitch.tv/oauth2/token"
+
+
+class OAuthToken:
+    def __init__(self, name: str, access_token: Optional[str], refresh_token: Optional[str] = None):
+        self.name = name
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.scopes: List[str] = []
+        self.login = None
+        self.user_id = None
+        self.expires_at = None
+        self.validated_at = 0.0
+        self.failed_at = 0.0
+        self.lock = threading.RLock()
+
+    def expires_in(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.time()
+
+
+class TokenManager:
+    """
+    Owns the broadcaster (Helix) and chat (IRC) tokens. Tokens are validated
+    once and the scopes/expiry cached, refreshed before they expire when a
+    refresh token is configured, and revalidated hourly as Twitch requires.
+    Callers ask for a token instead of validating it themselves.
+    """
+
+    def __init__(self):
+        self.client_id = config.get('CLIENT_ID')
+        self.client_secret = config.get('CLIENT_SECRET')
+        self.refresh_margin = config.get_int('TWITCH_TOKEN_REFRESH_MARGIN_SECONDS', 300)
+        self.validate_interval = config.get_int('TWITCH_TOKEN_VALIDATE_MINUTES', 60) * 60
+        self.tokens: Dict[str, OAuthToken] = {
+            "broadcaster": OAuthToken("broadcaster", config.get('BROADCASTER_TOKEN'),
+                                      config.get('BROADCASTER_REFRESH_TOKEN')),
+            "chat": OAuthToken("chat", self._strip_prefix(config.get('TMI_TOKEN')),
+                               config.get('TMI_REFRESH_TOKEN')),
+        }
+        self._listeners: List[Callable[[str, str], None]] = []
+
+    @staticmethod
+    def _strip_prefix(token: Optional[str]) -> Optional[str]:
+        if token and token.startswith("oauth:"):
+            return token[len("oauth:"):]
+        return token
+
+    def _token(self, name: str) -> OAuthToken:
+        if name not in self.tokens:
+            raise AuthenticationError(f"Unknown token: {name}")
+        return self.tokens[name]
+
+    def on_refresh(self, callback: Callable[[str, str], None]) -> None:
+        """callback(name, access_token) runs after a token is refreshed."""
+        self._listeners.append(callback)
+
+    def get_token(self, name: str = "broadcaster") -> Optional[str]:
+        token = self._token(name)
+        if not token.access_token:
+            return None
+
+        with token.lock:
+            # After a failed attempt, wait a minute rather than retrying per call
+            if not token.validated_at and time.time() - token.failed_at > 60:
+                self._validate_safely(token)
+            remaining = token.expires_in()
+            if remaining is not None and remaining < self.refresh_margin and token.refresh_token:
+                self._refresh_safely(token)
+            return token.access_token
+
+    def peek_token(self, name: str) -> Optional[str]:
+        """Current access token without validating it (no network)."""
+        return self._token(name).access_token
+
+    def get_scopes(self, name: str = "broadcaster") -> List[str]:
+        self.get_token(name)
+        return list(self._token(name).scopes)
+
+    def has_scopes(self, required: Iterable[str], name: str = "broadcaster") -> bool:
+        scopes = set(self.get_scopes(name))
+        missing = [scope for scope in required if scope not in scopes]
+        if missing:
+            logger.error(f"{name} token is missing required scopes: {missing}")
+            return False
+        return True
+
+    def get_user_id(self, name: str = "broadcaster") -> Optional[str]:
+        self.get_token(name)
+        return self._token(name).user_id
+
+    def validate(self, name: str = "broadcaster") -> bool:
+        token = self._token(name)
+        if not token.access_token:
+            return False
+
+        with token.lock:
+            response = helix_client.request(
+                "GET", VALIDATE_URL,
+                headers={"Authorization": f"OAuth {token.access_token}"},
+                rate_limited=False)
+
+            if response.status_code == 401:
+                logger.warning(f"{name} token is no longer valid")
+                token.validated_at = 0.0
+                if token.refresh_token:
+                    return self.refresh(name)
+                raise AuthenticationError(f"Twitch rejected the {name} token")
+
+            if response.status_code != 200:
+                raise AuthenticationError(
+                    f"Token validation failed for {name}: HTTP {response.status_code}")
+
+            info = response.json()
+            token.scopes = info.get("scopes", [])
+            token.login = info.get("login")
+            token.user_id = info.get("user_id")
+            expires_in = info.get("expires_in")
+            # 0 means the token does not expire
+            token.expires_at = time.time() + expires_in if expires_in else None
+            token.validated_at = time.time()
+            logger.info(
+                f"Validated {name} token for {token.login or 'app'} (scopes: {', '.join(token.scopes) or 'none'})")
+            return True
+
+    def refresh(self, name: str = "broadcaster") -> bool:
+        token = self._token(name)
+        if not token.refresh_token or not self.client_id or not self.client_secret:
+            raise AuthenticationError(
+                f"Cannot refresh {name} token: refresh token, CLIENT_ID and CLIENT_SECRET are required")
+
+        with token.lock:
+            response = helix_client.request(
+                "POST", TOKEN_URL,
+                params={
+                    "grant_type": "refresh_token",
+                    "refresh_token": token.refresh_token,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret
+                },
+                rate_limited=False)
+
+            if response.status_code != 200:
+                raise AuthenticationError(
+                    f"Token refresh failed for {name}: HTTP {response.status_code}")
+
+            data = response.json()
+            token.access_token = data["access_token"]
+            token.refresh_token = data.get("refresh_token", token.refresh_token)
+            if data.get("scope"):
+                token.scopes = data["scope"]
+            expires_in = data.get("expires_in")
+            token.expires_at = time.time() + expires_in if expires_in else None
+            token.validated_at = time.time()
+            logger.info(f"Refreshed {name} token")
+
+        for listener in list(self._listeners):
+            try:
+                listener(name, token.access_token)
+            except Exception as e:
+                handle_error(e, {"context": "token_refresh_listener", "token": name})
+        return True
+
+    def _validate_safely(self, token: OAuthToken) -> None:
+        try:
+            self.validate(token.name)
+        except (AuthenticationError, NetworkError) as e:
+            # Keep using the configured token; the API call will tell us
+            token.failed_at = time.time()
+            handle_error(e, {"context": "token_validate", "token": token.name})
+
+    def _refresh_safely(self, token: OAuthToken) -> None:
+        try:
+            self.refresh(token.name)
+        except (AuthenticationError, NetworkError, KeyError) as e:
+            handle_error(e, {"context": "token_refresh", "token": token.name})
+
+    def maintain(self) -> None:
+        """Hourly revalidation and proactive refresh; run on the scheduler."""
+        now = time.time()
+        for token in self.tokens.values():
+            if not token.access_token:
+                continue
+            with token.lock:
+                remaining = token.expires_in()
+                if remaining is not None and remaining < self.refresh_margin and token.refresh_token:
+                    self._refresh_safely(token)
+                elif now - token.validated_at >= self.validate_interval:
+                    self._validate_safely(token)
+
+    def invalidate(self, name: str = "broadcaster") -> None:
+        """Marks a token for revalidation, e.g. after a 401 from Helix."""
+        self._token(name).validated_at = 0.0
+
+    def start(self) -> None:
+        from utils.scheduler import scheduler
+        # Frequent cheap checks so a refresh lands inside the margin; the
+        # network call only happens when a token is due
+        scheduler.add_interval_job(
+            "twitch_token_maintenance", self.maintain,
+            max(60, min(self.refresh_margin // 2, self.validate_interval)), jitter=5)
+
+
+# Singleton instance
+token_manager = TokenManager()
@@ -0,0 +1,161 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterable, List, Tuple
+
+from core.config import config
+from core.logging import get_logger
+from core.errors import handle_error
+from utils.twitch_api_client import twitch_api, USERS_BATCH_SIZE
+
+logger = get_logger("user_resolver")
+
+User = Dict[str, str]
+
+
+def normalise_login(login: str) -> str:
+    return login.strip().lstrip("@").lower()
+
+
+class _Batch:
+    def __init__(self):
+        self.ids = set()
+        self.logins = set()
+        self.done = threading.Event()
+
+
+class UserResolver:
+    """
+    Login <-> id resolution backed by Helix Get Users. Lookups that miss the
+    cache within the same short window are collected into one batch and
+    sent USERS_BATCH_SIZE at a time, so resolving n users costs at most
+    ceil(n / 100) requests. Results are cached with a TTL, and users that
+    don't exist are remembered briefly so they aren't asked for again.
+    """
+
+    def __init__(self, api=twitch_api):
+        self.api = api
+        self.ttl = config.get_int('USER_RESOLVER_TTL_SECONDS', 600)
+        self.missing_ttl = config.get_int('USER_RESOLVER_MISSING_TTL_SECONDS', 60)
+        self.window = config.get_int('USER_RESOLVER_WINDOW_MS', 25) / 1000
+        self.max_entries = config.get_int('USER_RESOLVER_MAX_ENTRIES', 5000)
+        self.timeout = config.get_float('TWITCH_API_TIMEOUT', 10.0) * 2
+        # ("id" | "login", key) -> (user or None, expires_at)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[Optional[User], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._batch: Optional[_Batch] = None
+        self.requests = 0
+
+    def _store(self, kind: str, key: str, user: Optional[User], ttl: float) -> None:
+        """Caller holds the lock."""
+        self._cache[(kind, key)] = (user, time.monotonic() + ttl)
+        self._cache.move_to_end((kind, key))
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def remember(self, user: Dict[str, Any]) -> None:
+        """Primes the cache from user data an event already carried."""
+        user_id = user.get("id")
+        login = user.get("name")
+        if not user_id or not login or user_id == "unknown" or login == "unknown":
+            return
+        entry = {"id": str(user_id), "name": normalise_login(login),
+                 "display_name": user.get("display_name") or login}
+        with self._lock:
+            self._store("id", entry["id"], entry, self.ttl)
+            self._store("login", entry["name"], entry, self.ttl)
+
+    def _cached(self, kind: str, key: str) -> Tuple[bool, Optional[User]]:
+        """Caller holds the lock."""
+        entry = self._cache.get((kind, key))
+        if entry is None:
+            return False, None
+        user, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[(kind, key)]
+            return False, None
+        self._cache.move_to_end((kind, key))
+        return True, user
+
+    def _fetch(self, batch: _Batch) -> None:
+        wanted = [("id", user_id) for user_id in batch.ids]
+        wanted.extend(("login", login) for login in batch.logins)
+
+        for start in range(0, len(wanted), USERS_BATCH_SIZE):
+            chunk = wanted[start:start + USERS_BATCH_SIZE]
+            try:
+                users = self.api.get_users(
+                    ids=[key for kind, key in chunk if kind == "id"],
+                    logins=[key for kind, key in chunk if kind == "login"])
+                self.requests += 1
+            except Exception as e:
+                # Not cached as missing; the next lookup retries
+                handle_error(e, {"context": "user_resolver", "count": len(chunk)})
+                continue
+
+            with self._lock:
+                found = set()
+                for api_user in users:
+                    entry = {"id": api_user["id"], "name": api_user["login"],
+                             "display_name": api_user.get("display_name") or api_user["login"]}
+                    self._store("id", entry["id"], entry, self.ttl)
+                    self._store("login", entry["name"], entry, self.ttl)
+                    found.update((("id", entry["id"]), ("login", entry["name"])))
+                for kind, key in chunk:
+                    if (kind, key) not in found:
+                        self._store(kind, key, None, self.missing_ttl)
+
+    def _resolve(self, kind: str, keys: List[str]) -> Dict[str, Optional[User]]:
+        results = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                hit, user = self._cached(kind, key)
+                if hit:
+                    results[key] = user
+                else:
+                    missing.append(key)
+            if not missing:
+                return results
+
+            batch = self._batch
+            leader = batch is None
+            if leader:
+                batch = self._batch = _Batch()
+            (batch.ids if kind == "id" else batch.logins).update(missing)
+
+        if leader:
+            try:
+                # Let concurrent lookups join this request
+                if self.window > 0:
+                    time.sleep(self.window)
+                with self._lock:
+                    self._batch = None
+                self._fetch(batch)
+            finally:
+                batch.done.set()
+        elif not batch.done.wait(self.timeout):
+            logger.warning(f"Timed out waiting for user lookup of {len(missing)} {kind}s")
+
+        with self._lock:
+            for key in missing:
+                results[key] = self._cached(kind, key)[1]
+        return results
+
+    def get_by_ids(self, user_ids: Iterable[str]) -> Dict[str, Optional[User]]:
+        return self._resolve("id", list(dict.fromkeys(str(user_id) for user_id in user_ids if user_id)))
+
+    def get_by_logins(self, logins: Iterable[str]) -> Dict[str, Optional[User]]:
+        return self._resolve("login", list(dict.fromkeys(
+            normalise_login(login) for login in logins if login and normalise_login(login))))
+
+    def get_by_id(self, user_id: str) -> Optional[User]:
+        return self.get_by_ids([user_id]).get(str(user_id))
+
+    def get_by_login(self, login: str) -> Optional[User]:
+        return self.get_by_logins([login]).get(normalise_login(login))
+
+
+# Singleton instance
+user_resolver = UserResolver()
@@ -1,36 +1,104 @@
 from db.database import db
+from db.query_plan import register_hot_query
 from core.logging import get_logger
+from utils.user_resolver import user_resolver, normalise_login
 
 logger = get_logger("user_service")
 
+USER_BY_TWITCH_ID_QUERY = register_hot_query(
+    "user_by_twitch_id", "SELECT * FROM users WHERE twitch_user_id = ?", ("0",))
+
 
 def get_user_from_db(twitch_user_id):
     try:
-        user = db.fetchone(
-            "SELECT * FROM users WHERE twitch_user_id = ?",
-            (twitch_user_id,)
-        )
+        user = db.fetchone(USER_BY_TWITCH_ID_QUERY, (twitch_user_id,))
         return user
     except Exception as e:
         logger.error(f"Error fetching user from database: {e}")
         return None
 
 
+async def aget_user_from_db(twitch_user_id):
+    try:
+        return await db.afetchone(USER_BY_TWITCH_ID_QUERY, (twitch_user_id,))
+    except Exception as e:
+        logger.error(f"Error fetching user from database: {e}")
+        return None
+
+
+def _merge_db_user(user_data, db_user):
+    # Create a new dict to avoid modifying the original
+    enriched_data = dict(user_data)
+
+    # Add the is_bot_admin flag based on DB rank
+    enriched_data["is_bot_admin"] = db_user.get("rank") == "bot_admin"
+
+    # Add any other relevant fields from DB
+    enriched_data["db_rank"] = db_user.get("rank")
+    enriched_data["db_points"] = db_user.get("points", 0)
+
+    return enriched_data
+
+
 def enrich_user_data(user_data):
     if not user_data or "id" not in user_data:
         return user_data
 
+    # Chatters are resolved for free; later @mentions of them cost nothing
+    user_resolver.remember(user_data)
+
     db_user = get_user_from_db(user_data["id"])
     if db_user:
-        # Create a new dict to avoid modifying the original
-        enriched_data = dict(user_data)
+        return _merge_db_user(user_data, db_user)
+    return user_data
 
-        # Add the is_bot_admin flag based on DB rank
-        enriched_data["is_bot_admin"] = db_user.get("rank") == "bot_admin"
 
-        # Add any other relevant fields from DB
-        enriched_data["db_rank"] = db_user.get("rank")
-        enriched_data["db_points"] = db_user.get("points", 0)
+async def aenrich_user_data(user_data):
+    if not user_data or "id" not in user_data:
+        return user_data
 
-        return enriched_data
+    user_resolver.remember(user_data)
+
+    db_user = await aget_user_from_db(user_data["id"])
+    if db_user:
+        return _merge_db_user(user_data, db_user)
     return user_data
+
+
+def get_user_id(login):
+    user = user_resolver.get_by_login(login)
+    return user["id"] if user else None
+
+
+def get_login(twitch_user_id):
+    user = user_resolver.get_by_id(twitch_user_id)
+    return user["name"] if user else None
+
+
+def resolve_users(logins):
+    """Login -> user for every login, one Helix request per 100 unknown users."""
+    return user_resolver.get_by_logins(logins)
+
+
+def complete_users(users):
+    """
+    Fills in id, name and display_name on event user dicts that are missing
+    any of them, resolving all of them together.
+    """
+    incomplete = [user for user in users
+                  if any(not user.get(field) or user.get(field) == "unknown"
+                         for field in ("id", "name", "display_name"))]
+    if not incomplete:
+        return users
+
+    by_id = user_resolver.get_by_ids(
+        [user["id"] for user in incomplete if user.get("id") not in (None, "", "unknown")])
+    by_login = user_resolver.get_by_logins(
+        [user["name"] for user in incomplete
+         if user.get("id") in (None, "", "unknown") and user.get("name") not in (None, "", "unknown")])
+
+    for user in incomplete:
+        resolved = by_id.get(str(user.get("id"))) or by_login.get(normalise_login(user.get("name") or ""))
+        if resolved:
+            user.update(resolved)
+    return users